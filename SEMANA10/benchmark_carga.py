@@ -0,0 +1,65 @@
+# ==========================================================
+# BENCHMARK DE CARGA - SEMANA 10
+# Compara la carga de inventario.txt con búsqueda lineal de IDs
+# (versión anterior, O(N²)) contra el índice id -> Producto (O(N)).
+# Uso: python benchmark_carga.py
+# ==========================================================
+
+import os
+import tempfile
+import time
+
+from main import Inventario, Producto
+
+
+def carga_lineal(ruta: str):
+    """Reproduce la carga anterior: id_existe recorría toda la lista en cada línea."""
+    productos = []
+    with open(ruta, "r", encoding="utf-8") as f:
+        for linea in f:
+            if linea.strip() == "":
+                continue
+            prod = Producto.desde_linea(linea)
+            existe = False
+            for p in productos:
+                if p.get_id() == prod.get_id():
+                    existe = True
+                    break
+            if not existe:
+                productos.append(prod)
+    return productos
+
+
+def crear_archivo(ruta: str, n: int):
+    with open(ruta, "w", encoding="utf-8") as f:
+        for i in range(n):
+            f.write(Producto(f"P{i}", f"Producto {i}", i % 100, 1.5).to_linea() + "\n")
+
+
+def medir(funcion) -> float:
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+
+def main():
+    tamanos = [1_000, 2_000, 4_000, 8_000]
+
+    print(f"{'N':>8} | {'lineal (s)':>11} | {'µs/prod':>8} | {'índice (s)':>11} | {'µs/prod':>8}")
+    print("-" * 58)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        for n in tamanos:
+            ruta = os.path.join(carpeta, f"inventario_{n}.txt")
+            crear_archivo(ruta, n)
+
+            t_lineal = medir(lambda: carga_lineal(ruta))
+            t_indice = medir(lambda: Inventario(ruta, usar_diario=False))
+
+            # Con O(N²) el costo por producto crece con N; con O(N) se mantiene estable
+            print(f"{n:>8} | {t_lineal:>11.4f} | {t_lineal / n * 1e6:>8.2f} | "
+                  f"{t_indice:>11.4f} | {t_indice / n * 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@
 # - Carga automática al iniciar
 # - Manejo robusto de excepciones (FileNotFoundError, PermissionError, etc.)
 # - Notificaciones claras al usuario en consola
+# - Diario de cambios (inventario.txt.log) para no reescribir
+#   todo el archivo en cada operación
 # ==========================================================
 
 import os
@@ -13,6 +15,9 @@ import os
 # Clase Producto
 # -------------------------------
 class Producto:
+    # __slots__ evita el __dict__ por instancia (menos memoria con muchos productos)
+    __slots__ = ("__id", "__nombre", "__cantidad", "__precio")
+
     def __init__(self, id_producto: str, nombre: str, cantidad: int, precio: float):
         self.__id = id_producto
         self.__nombre = nombre
@@ -77,9 +82,19 @@ class Producto:
 # Clase Inventario
 # -------------------------------
 class Inventario:
-    def __init__(self, ruta_archivo: str = "inventario.txt"):
-        self.__productos = []
+    # Tamaño (en bytes) a partir del cual el diario se compacta en el archivo principal
+    LIMITE_DIARIO = 1024 * 1024
+
+    def __init__(self, ruta_archivo: str = "inventario.txt", usar_diario: bool = True,
+                 limite_diario: int = LIMITE_DIARIO):
+        self.__productos = []        # lista en orden de inserción (None = hueco de un eliminado)
+        self.__indice = {}           # id -> Producto
+        self.__posiciones = {}       # id -> posición en self.__productos
+        self.__huecos = 0
         self.__ruta = ruta_archivo
+        self.__ruta_diario = ruta_archivo + ".log"
+        self.__usar_diario = usar_diario
+        self.__limite_diario = limite_diario
 
         # Carga automática al iniciar (requisito)
         ok, msg = self.cargar_desde_archivo()
@@ -87,23 +102,49 @@ class Inventario:
 
     # ---- Utilidades ----
     def id_existe(self, id_producto: str) -> bool:
-        for p in self.__productos:
-            if p.get_id() == id_producto:
-                return True
-        return False
+        return id_producto in self.__indice
 
     def obtener_por_id(self, id_producto: str):
-        for p in self.__productos:
-            if p.get_id() == id_producto:
-                return p
-        return None
+        return self.__indice.get(id_producto)
 
     def mostrar_todos(self):
-        return self.__productos
+        return [p for p in self.__productos if p is not None]
 
     def buscar_por_nombre(self, texto: str):
         texto = texto.strip().lower()
-        return [p for p in self.__productos if texto in p.get_nombre().lower()]
+        return [p for p in self.__productos if p is not None and texto in p.get_nombre().lower()]
+
+    # ---- Índice en memoria ----
+    def __vaciar(self):
+        self.__productos = []
+        self.__indice = {}
+        self.__posiciones = {}
+        self.__huecos = 0
+
+    def __agregar_en_memoria(self, producto: Producto):
+        """Agrega el producto a la lista y a los índices (O(1))."""
+        pid = producto.get_id()
+        self.__posiciones[pid] = len(self.__productos)
+        self.__productos.append(producto)
+        self.__indice[pid] = producto
+
+    def __quitar_en_memoria(self, id_producto: str) -> bool:
+        """
+        Quita el producto en O(1): deja un hueco (None) en su posición para no
+        desplazar la lista. Cuando los huecos son más de la mitad, se compacta.
+        """
+        pos = self.__posiciones.pop(id_producto, None)
+        if pos is None:
+            return False
+        del self.__indice[id_producto]
+        self.__productos[pos] = None
+        self.__huecos += 1
+
+        if self.__huecos * 2 > len(self.__productos):
+            self.__productos = [p for p in self.__productos if p is not None]
+            self.__posiciones = {p.get_id(): i for i, p in enumerate(self.__productos)}
+            self.__huecos = 0
+        return True
 
     # -------------------------------
     # Persistencia en archivo
@@ -134,7 +175,7 @@ class Inventario:
             return False, msg
 
         try:
-            self.__productos = []
+            self.__vaciar()
             corruptas = 0
 
             with open(self.__ruta, "r", encoding="utf-8") as f:
@@ -144,10 +185,15 @@ class Inventario:
                     try:
                         prod = Producto.desde_linea(linea)
                         if not self.id_existe(prod.get_id()):
-                            self.__productos.append(prod)
+                            self.__agregar_en_memoria(prod)
                     except ValueError:
                         corruptas += 1
 
+            if self.__usar_diario:
+                corruptas += self.__reproducir_diario()
+                if self.tamano_diario() > self.__limite_diario:
+                    self.compactar()
+
             if corruptas > 0:
                 return True, f"Inventario cargado con advertencia: {corruptas} línea(s) corrupta(s) ignoradas."
             return True, "Inventario cargado correctamente desde archivo."
@@ -159,6 +205,107 @@ class Inventario:
         except OSError as e:
             return False, f"OSError: Error del sistema al leer el archivo. {e}"
 
+    def __reproducir_diario(self) -> int:
+        """
+        Aplica sobre la memoria los registros del diario (en orden).
+        Devuelve cuántos registros corruptos se ignoraron
+        (por ejemplo, una última línea a medio escribir).
+        """
+        if not os.path.exists(self.__ruta_diario):
+            return 0
+
+        corruptos = 0
+        with open(self.__ruta_diario, "r", encoding="utf-8") as f:
+            for linea in f:
+                if linea.strip() == "":
+                    continue
+                try:
+                    self.__aplicar_registro(linea)
+                except ValueError:
+                    corruptos += 1
+        return corruptos
+
+    def __aplicar_registro(self, linea: str):
+        """
+        Registros del diario:
+          A|id|nombre|cantidad|precio  -> añadir
+          U|id|cantidad|precio         -> actualizar
+          D|id                         -> eliminar
+        Los registros se pueden volver a aplicar sin problema
+        (sirve si se cae el programa en medio de una compactación).
+        """
+        tipo, _, resto = linea.strip().partition("|")
+
+        if tipo == "A":
+            prod = Producto.desde_linea(resto)
+            if not self.id_existe(prod.get_id()):
+                self.__agregar_en_memoria(prod)
+        elif tipo == "U":
+            partes = resto.split("|")
+            if len(partes) != 3:
+                raise ValueError("Registro de actualización inválido.")
+            cantidad = int(partes[1].strip())
+            precio = float(partes[2].strip())
+            if cantidad < 0 or precio < 0:
+                raise ValueError("Cantidad o precio negativos.")
+            p = self.obtener_por_id(partes[0].strip())
+            if p is not None:
+                p.set_cantidad(cantidad)
+                p.set_precio(precio)
+        elif tipo == "D":
+            self.__quitar_en_memoria(resto.strip())
+        else:
+            raise ValueError("Tipo de registro desconocido.")
+
+    def __escribir_diario(self, registro: str):
+        """
+        Agrega un registro al final del diario y fuerza su escritura a disco (fsync).
+        Si el diario supera el límite, lo compacta en inventario.txt.
+        """
+        try:
+            with open(self.__ruta_diario, "a", encoding="utf-8") as f:
+                f.write(registro + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except PermissionError:
+            return False, "PermissionError: No hay permisos para escribir en el diario."
+        except OSError as e:
+            return False, f"OSError: Error del sistema al escribir el diario. {e}"
+
+        if self.tamano_diario() > self.__limite_diario:
+            return self.compactar()
+        return True, "Cambio registrado en el diario."
+
+    def tamano_diario(self) -> int:
+        try:
+            return os.path.getsize(self.__ruta_diario)
+        except OSError:
+            return 0
+
+    def compactar(self):
+        """
+        Vuelca el inventario completo en inventario.txt y vacía el diario.
+        Primero se escribe el archivo y luego se vacía el diario: si algo falla
+        en medio, al cargar se vuelve a aplicar el diario sin perder datos.
+        """
+        ok, msg = self.guardar_en_archivo()
+        if not ok:
+            return False, msg
+        try:
+            with open(self.__ruta_diario, "w", encoding="utf-8"):
+                pass
+            return True, "Diario compactado en el archivo del inventario."
+        except PermissionError:
+            return False, "PermissionError: No hay permisos para vaciar el diario."
+        except OSError as e:
+            return False, f"OSError: Error del sistema al vaciar el diario. {e}"
+
+    def __persistir(self, registro: str):
+        """Guarda un cambio: en el diario si está activo, si no reescribe el archivo."""
+        if self.__usar_diario:
+            return self.__escribir_diario(registro)
+        return self.guardar_en_archivo()
+
     def guardar_en_archivo(self):
         """
         Guarda TODO el inventario en inventario.txt.
@@ -173,7 +320,10 @@ class Inventario:
         try:
             with open(temp, "w", encoding="utf-8") as f:
                 for p in self.__productos:
-                    f.write(p.to_linea() + "\n")
+                    if p is not None:
+                        f.write(p.to_linea() + "\n")
+                f.flush()
+                os.fsync(f.fileno())
 
             os.replace(temp, self.__ruta)
             return True, "Archivo actualizado correctamente."
@@ -197,24 +347,21 @@ class Inventario:
         if self.id_existe(producto.get_id()):
             return False, "Ese ID ya existe. No se agregó el producto."
 
-        self.__productos.append(producto)
+        self.__agregar_en_memoria(producto)
 
-        ok_arch, msg_arch = self.guardar_en_archivo()
+        ok_arch, msg_arch = self.__persistir("A|" + producto.to_linea())
         if ok_arch:
             return True, "Producto agregado y guardado en inventario.txt correctamente."
         return False, f"Producto agregado en memoria, pero falló el guardado en archivo. Detalle: {msg_arch}"
 
     def eliminar_por_id(self, id_producto: str):
-        for i, p in enumerate(self.__productos):
-            if p.get_id() == id_producto:
-                self.__productos.pop(i)
-
-                ok_arch, msg_arch = self.guardar_en_archivo()
-                if ok_arch:
-                    return True, "Producto eliminado y archivo actualizado correctamente."
-                return False, f"Producto eliminado en memoria, pero falló la actualización del archivo. Detalle: {msg_arch}"
+        if not self.__quitar_en_memoria(id_producto):
+            return False, "No se encontró un producto con ese ID."
 
-        return False, "No se encontró un producto con ese ID."
+        ok_arch, msg_arch = self.__persistir(f"D|{id_producto}")
+        if ok_arch:
+            return True, "Producto eliminado y archivo actualizado correctamente."
+        return False, f"Producto eliminado en memoria, pero falló la actualización del archivo. Detalle: {msg_arch}"
 
     def actualizar_por_id(self, id_producto: str, nueva_cantidad: int, nuevo_precio: float):
         """
@@ -227,7 +374,7 @@ class Inventario:
         p.set_cantidad(nueva_cantidad)
         p.set_precio(nuevo_precio)
 
-        ok_arch, msg_arch = self.guardar_en_archivo()
+        ok_arch, msg_arch = self.__persistir(f"U|{id_producto}|{nueva_cantidad}|{nuevo_precio}")
         if ok_arch:
             return True, "Producto actualizado (cantidad y precio) y guardado en inventario.txt."
         return False, f"Producto actualizado en memoria, pero falló el guardado en archivo. Detalle: {msg_arch}"
@@ -333,6 +480,9 @@ def main():
                     print(" -", p)
 
         elif opcion == "0":
+            ok, msg = inventario.compactar()
+            if not ok:
+                print("❌", msg)
             print("\n👋 Saliendo del sistema. Inventario guardado.")
             break
 
@@ -0,0 +1,181 @@
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from producto import (Producto, validar_cantidad, validar_id, validar_nombre,
+                      validar_precio)
+
+
+class ProductoStore:
+    """
+    Almacén "por columnas" (struct of arrays): una lista por campo de texto y
+    un array compacto para cantidad (int64) y precio (float64), en vez de un
+    objeto Producto por fila. Se usa como el dict id -> Producto de Inventario:
+
+        inv = Inventario(ProductoStore())
+
+    Al leer se entregan vistas livianas (ProductoVista) con la misma API
+    get_/set_ y las mismas validaciones que Producto. Al guardar un Producto
+    se copian sus datos: cambiar después el objeto original no afecta al almacén.
+    """
+
+    def __init__(self) -> None:
+        self._ids: List[Optional[str]] = []
+        self._nombres: List[Optional[str]] = []
+        self._cantidades = array("q")
+        self._precios = array("d")
+        self._filas: Dict[str, int] = {}      # id -> fila
+        self._libres: List[int] = []          # filas de productos eliminados, para reutilizar
+        self._al_cambiar = None               # aviso al inventario (ver Producto._al_cambiar)
+
+    # ---- Interfaz tipo dict (id -> producto) ----
+    def __len__(self) -> int:
+        return len(self._filas)
+
+    def __contains__(self, pid: str) -> bool:
+        return pid in self._filas
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._filas)
+
+    def __getitem__(self, pid: str) -> "ProductoVista":
+        return ProductoVista(self, self._filas[pid])
+
+    def get(self, pid: str, defecto=None):
+        fila = self._filas.get(pid)
+        return defecto if fila is None else ProductoVista(self, fila)
+
+    def __setitem__(self, pid: str, producto) -> None:
+        fila = self._filas.get(pid)
+        if fila is None:
+            if self._libres:
+                fila = self._libres.pop()
+            else:
+                fila = len(self._ids)
+                self._ids.append(None)
+                self._nombres.append(None)
+                self._cantidades.append(0)
+                self._precios.append(0.0)
+            self._filas[pid] = fila
+        self._ids[fila] = pid
+        self._nombres[fila] = producto.get_nombre()
+        self._cantidades[fila] = producto.get_cantidad()
+        self._precios[fila] = producto.get_precio()
+
+    def pop(self, pid: str, *defecto):
+        if pid not in self._filas and defecto:
+            return defecto[0]
+        fila = self._filas.pop(pid)
+        producto = self._materializar(fila)
+        self._ids[fila] = None
+        self._nombres[fila] = None
+        self._libres.append(fila)
+        return producto
+
+    def keys(self):
+        return self._filas.keys()
+
+    def values(self) -> Iterator["ProductoVista"]:
+        return (ProductoVista(self, fila) for fila in self._filas.values())
+
+    def items(self) -> Iterator[Tuple[str, "ProductoVista"]]:
+        return ((pid, ProductoVista(self, fila)) for pid, fila in self._filas.items())
+
+    def _materializar(self, fila: int) -> Producto:
+        return Producto(self._ids[fila], self._nombres[fila],
+                        self._cantidades[fila], self._precios[fila])
+
+    def _notificar(self, vista: "ProductoVista", campo: str, nuevo) -> None:
+        if self._al_cambiar is not None:
+            self._al_cambiar(vista, campo, nuevo)
+
+
+class ProductoVista:
+    """
+    Vista de una fila de ProductoStore con la API de Producto.
+    No guarda datos propios; no conviene conservarla después de eliminar el producto,
+    porque la fila puede reutilizarse.
+    """
+
+    __slots__ = ("_almacen", "_fila")
+
+    def __init__(self, almacen: ProductoStore, fila: int) -> None:
+        self._almacen = almacen
+        self._fila = fila
+
+    @property
+    def id(self) -> str:
+        return self._almacen._ids[self._fila]
+
+    @property
+    def nombre(self) -> str:
+        return self._almacen._nombres[self._fila]
+
+    @property
+    def cantidad(self) -> int:
+        return self._almacen._cantidades[self._fila]
+
+    @property
+    def precio(self) -> float:
+        return self._almacen._precios[self._fila]
+
+    # El aviso de cambios es del almacén completo (Inventario lo asigna al agregar)
+    @property
+    def _al_cambiar(self):
+        return self._almacen._al_cambiar
+
+    @_al_cambiar.setter
+    def _al_cambiar(self, funcion) -> None:
+        self._almacen._al_cambiar = funcion
+
+    def get_id(self) -> str:
+        return self.id
+
+    def set_id(self, nuevo_id: str) -> None:
+        nuevo_id = validar_id(nuevo_id)
+        if nuevo_id != self.id and nuevo_id in self._almacen:
+            raise ValueError(f"Ya existe un producto con ID '{nuevo_id}'.")
+        self._almacen._notificar(self, "id", nuevo_id)
+        del self._almacen._filas[self.id]
+        self._almacen._filas[nuevo_id] = self._fila
+        self._almacen._ids[self._fila] = nuevo_id
+
+    def get_nombre(self) -> str:
+        return self.nombre
+
+    def set_nombre(self, nuevo_nombre: str) -> None:
+        nuevo_nombre = validar_nombre(nuevo_nombre)
+        self._almacen._notificar(self, "nombre", nuevo_nombre)
+        self._almacen._nombres[self._fila] = nuevo_nombre
+
+    def get_cantidad(self) -> int:
+        return self.cantidad
+
+    def set_cantidad(self, nueva_cantidad: int) -> None:
+        nueva_cantidad = validar_cantidad(nueva_cantidad)
+        self._almacen._notificar(self, "cantidad", nueva_cantidad)
+        self._almacen._cantidades[self._fila] = nueva_cantidad
+
+    def get_precio(self) -> float:
+        return self.precio
+
+    def set_precio(self, nuevo_precio: float) -> None:
+        nuevo_precio = validar_precio(nuevo_precio)
+        self._almacen._notificar(self, "precio", nuevo_precio)
+        self._almacen._precios[self._fila] = nuevo_precio
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "nombre": self.nombre,
+            "cantidad": self.cantidad,
+            "precio": self.precio
+        }
+
+    def __eq__(self, otro) -> bool:
+        if not isinstance(otro, (Producto, ProductoVista)):
+            return NotImplemented
+        return self.to_dict() == otro.to_dict()
+
+    def __repr__(self) -> str:
+        return (f"ProductoVista(id={self.id!r}, nombre={self.nombre!r}, "
+                f"cantidad={self.cantidad!r}, precio={self.precio!r})")
@@ -0,0 +1,72 @@
+# Benchmark de escalado: InventarioDistribuido con 1, 2, 4, ... procesos contra
+# el Inventario de un solo proceso. Las consultas que recorren todo (buscar por
+# nombre, listar, resumen) se reparten entre las particiones; las de un solo ID
+# pagan un viaje de ida y vuelta por el Pipe.
+# Uso: python benchmark_distribuido.py [cantidad_de_productos] [procesos_maximos]
+# (por defecto 10.000.000 productos y tantos procesos como núcleos; con 10M
+# conviene tener varios GB de memoria libre)
+
+import gc
+import multiprocessing
+import random
+import sys
+import time
+
+from inventario import Inventario
+from inventario_distribuido import InventarioDistribuido
+
+PALABRAS = ["cuaderno", "lápiz", "mochila", "borrador", "regla", "carpeta", "tijera"]
+
+
+def filas(n: int):
+    azar = random.Random(1)
+    for i in range(n):
+        yield {"id": f"P{i}", "nombre": f"{azar.choice(PALABRAS)} {i % 9973}",
+               "cantidad": i % 50, "precio": round(azar.random() * 20, 2)}
+
+
+def medir(funcion, repeticiones: int = 1) -> float:
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+
+def probar(nombre: str, inv, cargar, n: int) -> None:
+    inicio = time.perf_counter()
+    cargar(inv)
+    carga = time.perf_counter() - inicio
+    assert inv.resumen()[0] == n
+
+    ids = [f"P{random.randrange(n)}" for _ in range(1000)]
+    tiempos = [
+        medir(lambda: inv.buscar_por_nombre("regla 12"), 5),
+        medir(lambda: inv.buscar_por_nombre("mochila"), 2),
+        medir(lambda: inv.listar_todos(offset=n // 2, limit=50), 5),
+        medir(inv.resumen, 20),
+        medir(lambda: [inv.obtener_producto(pid) for pid in ids]),   # 1000 consultas: ms -> µs c/u
+    ]
+    print(f"{nombre:<16} {carga:>8.1f} s " + " ".join(f"{t:>10.3f} ms" for t in tiempos[:4])
+          + f" {tiempos[4]:>8.1f} µs")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    maximo = int(sys.argv[2]) if len(sys.argv) > 2 else multiprocessing.cpu_count()
+    print(f"Productos: {n} | núcleos: {multiprocessing.cpu_count()}")
+    print(f"{'':<16} {'carga':>10} {'buscar 12':>13} {'buscar amplio':>13} "
+          f"{'listar 50':>13} {'resumen':>13} {'obtener':>11}")
+
+    # Sin particiones: el Inventario de siempre, en este mismo proceso
+    probar("sin particiones", Inventario(), lambda inv: inv.agregar_lote(filas(n)), n)
+    gc.collect()   # el inventario anterior tiene ciclos (Producto -> aviso -> Inventario)
+
+    procesos = 1
+    while procesos <= maximo:
+        with InventarioDistribuido(procesos) as inv:
+            probar(f"{procesos} particiones", inv, lambda inv: inv.cargar_items(filas(n)), n)
+        procesos *= 2
+
+
+if __name__ == "__main__":
+    main()
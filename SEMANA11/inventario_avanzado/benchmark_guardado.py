@@ -0,0 +1,42 @@
+# Benchmark del guardado diferencial: guardar el inventario entero contra guardar
+# después de pocos cambios (solo se agrega el delta) y sin cambios (no se escribe).
+# Uso: python benchmark_guardado.py [cantidad_de_productos] (por defecto 1.000.000)
+
+import os
+import sys
+import tempfile
+import time
+
+from inventario import Inventario
+from storage import cargar, guardar
+
+
+def medir(funcion) -> float:
+    inicio = time.perf_counter()
+    funcion()
+    return (time.perf_counter() - inicio) * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    inv = Inventario()
+    inv.agregar_lote({"id": f"P{i}", "nombre": f"producto {i % 997}",
+                      "cantidad": i % 50, "precio": round(i % 1000 / 7, 2)} for i in range(n))
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "inventario.json")
+        print(f"Productos: {n}")
+        print(f"guardado completo:      {medir(lambda: guardar(inv, ruta)):>10.1f} ms")
+        print(f"sin cambios:            {medir(lambda: guardar(inv, ruta)):>10.3f} ms")
+        for cambios in (1, 10, 1000):
+            for i in range(cambios):
+                inv.actualizar_producto(f"P{i * 7 % n}", nueva_cantidad=i)
+            print(f"{cambios:>5} cambios (delta):  {medir(lambda: guardar(inv, ruta)):>10.3f} ms")
+        inicio = time.perf_counter()
+        copia = cargar(ruta)
+        print(f"carga con delta:        {(time.perf_counter() - inicio) * 1000:>10.1f} ms")
+        assert copia.resumen() == inv.resumen()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Benchmark de memoria: bytes por producto según la representación.
+# Compara las clases con __dict__ (como estaban antes) con las versiones con
+# __slots__ de SEMANA9/10/11 y con ProductoStore (arrays por columna).
+# Uso: python benchmark_memoria.py [cantidad_de_productos]
+
+import importlib.util
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+
+from almacen import ProductoStore
+from producto import Producto
+
+
+@dataclass
+class ProductoConDict:
+    """Producto de SEMANA11 antes de slots=True."""
+    id: str
+    nombre: str
+    cantidad: int
+    precio: float
+
+
+class ProductoPrivadoConDict:
+    """Producto de SEMANA9/10 antes de __slots__ (atributos privados en __dict__)."""
+
+    def __init__(self, id_producto, nombre, cantidad, precio):
+        self.__id = id_producto
+        self.__nombre = nombre
+        self.__cantidad = cantidad
+        self.__precio = precio
+
+
+def _cargar_producto_semana10():
+    ruta = Path(__file__).resolve().parents[2] / "SEMANA10" / "main.py"
+    spec = importlib.util.spec_from_file_location("semana10_main", ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo.Producto
+
+
+def medir(nombre: str, construir, ids, nombres) -> None:
+    # Los textos se crean antes de medir: solo cuenta la representación.
+    # Cantidad y precio se crean dentro (como al leer un archivo).
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    contenedor = construir(ids, nombres)
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{nombre:<42} {(despues - antes) / len(ids):>10.1f}")
+    del contenedor
+
+
+def en_dict(clase):
+    def construir(ids, nombres):
+        return {pid: clase(pid, nom, 1000 + i, i * 0.25)
+                for i, (pid, nom) in enumerate(zip(ids, nombres))}
+    return construir
+
+
+def en_store(ids, nombres):
+    store = ProductoStore()
+    for i, (pid, nom) in enumerate(zip(ids, nombres)):
+        store[pid] = Producto(pid, nom, 1000 + i, i * 0.25)
+    return store
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    ids = [f"P{i}" for i in range(n)]
+    nombres = [f"producto {i}" for i in range(n)]
+
+    print(f"Productos: {n} (bytes por producto, sin contar los textos)")
+    print("-" * 54)
+    medir("SEMANA9/10 antes (__dict__, privados)", en_dict(ProductoPrivadoConDict), ids, nombres)
+    medir("SEMANA10 con __slots__", en_dict(_cargar_producto_semana10()), ids, nombres)
+    medir("SEMANA11 antes (@dataclass con __dict__)", en_dict(ProductoConDict), ids, nombres)
+    medir("SEMANA11 @dataclass(slots=True)", en_dict(Producto), ids, nombres)
+    medir("SEMANA11 ProductoStore (arrays)", en_store, ids, nombres)
+
+
+if __name__ == "__main__":
+    main()
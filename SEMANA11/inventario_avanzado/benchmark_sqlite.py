@@ -0,0 +1,50 @@
+# Benchmark: Inventario en memoria (dict + índices) contra InventarioSQLite.
+# Uso: python benchmark_sqlite.py [cantidad_de_productos]
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from inventario import Inventario
+from inventario_sqlite import InventarioSQLite
+
+
+def medir(nombre: str, funcion, repeticiones: int = 1) -> None:
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    total = time.perf_counter() - inicio
+    print(f"  {nombre:<28} {total / repeticiones * 1000:>10.3f} ms")
+
+
+def probar(nombre: str, inv, filas, ids) -> None:
+    print(nombre)
+    medir("agregar_lote", lambda: inv.agregar_lote(filas))
+    medir("obtener_producto (x1000)", lambda: [inv.obtener_producto(random.choice(ids)) for _ in range(1000)])
+    medir("buscar_por_nombre", lambda: inv.buscar_por_nombre("lápiz 12"), 20)
+    medir("listar_todos (página 50)", lambda: inv.listar_todos(offset=len(ids) // 2, limit=50), 20)
+    medir("resumen", inv.resumen, 20)
+    medir("actualizar (x1000)", lambda: [inv.actualizar_producto(random.choice(ids), nueva_cantidad=5)
+                                         for _ in range(1000)])
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    palabras = ["cuaderno", "lápiz", "mochila", "borrador", "regla", "carpeta", "tijera"]
+    filas = [{"id": f"P{i}", "nombre": f"{random.choice(palabras)} {i % 997}",
+              "cantidad": i % 50, "precio": round(random.random() * 20, 2)} for i in range(n)]
+    ids = [f["id"] for f in filas]
+    print(f"Productos: {n}")
+
+    probar("Inventario (memoria)", Inventario(), filas, ids)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        inv = InventarioSQLite(os.path.join(carpeta, "inventario.db"))
+        probar("InventarioSQLite", inv, filas, ids)
+        inv.cerrar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from producto import Producto
+
+# Formato binario por columnas del inventario (.invc)
+#
+#   cabecera:   MAGIA | versión | marca de orden de bytes | n | unidades | valor total
+#   secciones:  6 desplazamientos (uint64) hacia las columnas:
+#               offsets de ids (n+1 x uint64) | bytes de ids (utf-8)
+#               offsets de nombres (n+1 x uint64) | bytes de nombres (utf-8)
+#               cantidades (n x int64) | precios (n x float64)
+#
+# Las filas se guardan ordenadas por id para buscar con búsqueda binaria.
+# Los arreglos usan el orden de bytes de la máquina; la marca lo comprueba al abrir.
+
+MAGIA = b"INVC"
+VERSION = 1
+_CABECERA = struct.Struct("=4sHHQqd6Q")
+
+
+def _alinear(n: int) -> int:
+    return (n + 7) // 8 * 8
+
+
+def _tabla_textos(textos: List[str]) -> Tuple[array, bytes]:
+    offsets = array("Q", [0])
+    partes = []
+    total = 0
+    for t in textos:
+        b = t.encode("utf-8")
+        partes.append(b)
+        total += len(b)
+        offsets.append(total)
+    return offsets, b"".join(partes)
+
+
+def guardar_columnar(inv, ruta: str) -> None:
+    productos = sorted(inv.productos.values(), key=lambda p: p.get_id().encode("utf-8"))
+    ids_off, ids_blob = _tabla_textos([p.get_id() for p in productos])
+    nom_off, nom_blob = _tabla_textos([p.get_nombre() for p in productos])
+    cantidades = array("q", (p.get_cantidad() for p in productos))
+    precios = array("d", (p.get_precio() for p in productos))
+
+    secciones = [ids_off.tobytes(), ids_blob, nom_off.tobytes(), nom_blob,
+                 cantidades.tobytes(), precios.tobytes()]
+    desplazamientos = []
+    pos = _alinear(_CABECERA.size)
+    for sec in secciones:
+        desplazamientos.append(pos)
+        pos = _alinear(pos + len(sec))
+
+    distintos, unidades, total = inv.resumen()
+    temp = Path(str(ruta) + ".tmp")
+    with temp.open("wb") as f:
+        f.write(_CABECERA.pack(MAGIA, VERSION, 1, distintos, unidades, total, *desplazamientos))
+        for inicio, sec in zip(desplazamientos, secciones):
+            f.write(b"\0" * (inicio - f.tell()))
+            f.write(sec)
+    os.replace(temp, ruta)
+
+
+class InventarioColumnar:
+    """
+    Vista de solo lectura sobre un archivo .invc abierto con mmap.
+    No carga nada al abrir: cada Producto se crea recién cuando se pide.
+    """
+
+    def __init__(self, ruta: str) -> None:
+        self._archivo = open(ruta, "rb")
+        self._mm = None
+        try:
+            # mmap no acepta archivos vacíos: se revisa el tamaño antes
+            if os.fstat(self._archivo.fileno()).st_size < _CABECERA.size:
+                raise ValueError(f"'{ruta}' no es un inventario columnar válido.")
+            self._mm = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+            (magia, version, marca, self._n, self._unidades, self._total,
+             *desp) = _CABECERA.unpack_from(self._mm, 0)
+            if magia != MAGIA or version != VERSION:
+                raise ValueError(f"'{ruta}' no es un inventario columnar válido.")
+            if marca != 1:
+                raise ValueError(f"'{ruta}' fue escrito con otro orden de bytes.")
+
+            n = self._n
+            secciones = [(desp[0], desp[0] + 8 * (n + 1)), (desp[1], desp[2]),
+                         (desp[2], desp[2] + 8 * (n + 1)), (desp[3], desp[4]),
+                         (desp[4], desp[4] + 8 * n), (desp[5], desp[5] + 8 * n)]
+            if any(not 0 <= inicio <= fin <= len(self._mm) for inicio, fin in secciones):
+                raise ValueError(f"'{ruta}' no es un inventario columnar válido (archivo truncado).")
+
+            mv = memoryview(self._mm)
+            try:
+                self._ids_off = mv[desp[0]:desp[0] + 8 * (n + 1)].cast("Q")
+                self._ids = mv[desp[1]:desp[2]]
+                self._nom_off = mv[desp[2]:desp[2] + 8 * (n + 1)].cast("Q")
+                self._nombres = mv[desp[3]:desp[4]]
+                self._cantidades = mv[desp[4]:desp[4] + 8 * n].cast("q")
+                self._precios = mv[desp[5]:desp[5] + 8 * n].cast("d")
+            finally:
+                mv.release()
+        except Exception:
+            self.cerrar()
+            raise
+
+    def _id_bytes(self, i: int) -> bytes:
+        return bytes(self._ids[self._ids_off[i]:self._ids_off[i + 1]])
+
+    def _producto(self, i: int) -> Producto:
+        return Producto(
+            id=self._id_bytes(i).decode("utf-8"),
+            nombre=bytes(self._nombres[self._nom_off[i]:self._nom_off[i + 1]]).decode("utf-8"),
+            cantidad=self._cantidades[i],
+            precio=self._precios[i]
+        )
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __iter__(self) -> Iterator[Producto]:
+        for i in range(self._n):
+            yield self._producto(i)
+
+    def obtener_producto(self, producto_id: str) -> Optional[Producto]:
+        # Búsqueda binaria sobre los ids ordenados (O(log n), sin cargar el archivo)
+        buscado = producto_id.strip().encode("utf-8")
+        bajo, alto = 0, self._n
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if self._id_bytes(medio) < buscado:
+                bajo = medio + 1
+            else:
+                alto = medio
+        if bajo < self._n and self._id_bytes(bajo) == buscado:
+            return self._producto(bajo)
+        return None
+
+    def resumen(self) -> Tuple[int, int, float]:
+        # Los totales vienen guardados en la cabecera
+        return (self._n, self._unidades, self._total)
+
+    def to_dict(self) -> dict:
+        return {"productos": [p.to_dict() for p in self]}
+
+    def cerrar(self) -> None:
+        for nombre in ("_ids_off", "_ids", "_nom_off", "_nombres", "_cantidades", "_precios"):
+            vista = self.__dict__.pop(nombre, None)
+            if vista is not None:
+                vista.release()
+        if self._mm is not None:
+            self._mm.close()
+        self._archivo.close()
+
+    def __enter__(self) -> "InventarioColumnar":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
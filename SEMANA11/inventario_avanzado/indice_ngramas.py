@@ -0,0 +1,69 @@
+from typing import Dict, List, Set
+
+
+class IndiceNGramas:
+    """
+    Índice invertido de n-gramas (de 1 hasta N caracteres): n-grama -> ids.
+    Sirve para buscar subcadenas sin recorrer todos los nombres:
+    toda subcadena de la consulta también es subcadena del nombre.
+    """
+
+    def __init__(self, n: int = 3) -> None:
+        self.n = n
+        self._postings: Dict[str, Set[str]] = {}   # n-grama -> ids que lo contienen
+
+    def _gramas(self, texto: str) -> Set[str]:
+        return {texto[i:i + largo]
+                for largo in range(1, self.n + 1)
+                for i in range(len(texto) - largo + 1)}
+
+    def agregar(self, pid: str, texto: str) -> None:
+        for g in self._gramas(texto):
+            self._postings.setdefault(g, set()).add(pid)
+
+    def agregar_grupos(self, grupos: Dict[str, List[str]]) -> None:
+        # Carga masiva: texto -> ids que lo comparten (los n-gramas se calculan una vez)
+        postings = self._postings
+        for texto, ids in grupos.items():
+            for g in self._gramas(texto):
+                actuales = postings.get(g)
+                if actuales is None:
+                    postings[g] = set(ids)
+                else:
+                    actuales.update(ids)
+
+    def quitar(self, pid: str, texto: str) -> None:
+        for g in self._gramas(texto):
+            ids = self._postings.get(g)
+            if ids is None:
+                continue
+            ids.discard(pid)
+            if not ids:
+                del self._postings[g]
+
+    def candidatos(self, consulta: str) -> Set[str]:
+        """
+        Ids cuyo texto contiene todos los n-gramas de la consulta.
+        Si la consulta es corta (<= N) el resultado es exacto;
+        si es más larga hay que verificar los candidatos con `in`.
+        """
+        if len(consulta) <= self.n:
+            return set(self._postings.get(consulta, ()))
+
+        gramas = {consulta[i:i + self.n] for i in range(len(consulta) - self.n + 1)}
+        listas = []
+        for g in gramas:
+            ids = self._postings.get(g)
+            if not ids:
+                return set()
+            listas.append(ids)
+
+        # Se intersecta empezando por la lista más corta
+        listas.sort(key=len)
+        resultado = set(listas[0])
+        for ids in listas[1:]:
+            resultado &= ids
+            if not resultado:
+                break
+        return resultado
+
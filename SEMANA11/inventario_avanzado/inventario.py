@@ -1,32 +1,258 @@
-from typing import Dict, List, Optional, Tuple, Set
-from producto import Producto
+import math
+from bisect import bisect_left, insort
+from collections import deque
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Set
+from producto import Producto, validar_cantidad, validar_id, validar_nombre, validar_precio
+from indice_ngramas import IndiceNGramas
+
+LIMITE_DESHACER = 100   # pasos que recuerda deshacer()
+
+# Un cambio del registro de operaciones: (id, campo, antes, después).
+# campo "producto" es un alta o una baja (antes/después: el Producto o None) y
+# campo "lote" un alta o baja masiva (id None; antes/después: dict id -> Producto o None).
+# Se guarda el Producto que salió o entró, no una copia: fuera del inventario nadie
+# lo modifica, y mientras está adentro sus cambios se deshacen antes que el alta.
+Cambio = Tuple[Optional[str], str, object, object]
+
+
+class ErrorLote(ValueError):
+    """Lote rechazado: `errores` tiene (fila, mensaje) de todas las filas con problemas."""
+
+    def __init__(self, errores: List[Tuple[int, str]]) -> None:
+        self.errores = errores
+        detalle = "; ".join(f"fila {fila}: {msg}" for fila, msg in errores[:10])
+        extra = f" (y {len(errores) - 10} más)" if len(errores) > 10 else ""
+        super().__init__(f"Lote rechazado, {len(errores)} fila(s) con errores: {detalle}{extra}")
 
 
 class Inventario:
-    def __init__(self) -> None:
-        self.productos: Dict[str, Producto] = {}     # dict principal: id -> Producto
-        self._index_nombres: Set[str] = set()         # set para indexar nombres normalizados
+    def __init__(self, almacen=None, limite_deshacer: int = LIMITE_DESHACER) -> None:
+        # dict principal: id -> Producto (o un ProductoStore compacto con la misma interfaz)
+        self.productos: Dict[str, Producto] = almacen if almacen is not None else {}
+        self._index_nombres: Dict[str, Set[str]] = {} # nombre normalizado -> ids con ese nombre
+        self._index_ngramas = IndiceNGramas()         # n-grama -> ids (búsqueda por subcadena)
+        self._ordenados: List[Tuple[str, str]] = []   # (nombre normalizado, id) siempre ordenado
+        self._unidades = 0                            # totales acumulados para resumen()
+        self._valor = Decimal(0)
+        # Registro de operaciones para transaccion() y deshacer()/rehacer()
+        self._cambios: Optional[List[Cambio]] = None  # los de la transacción abierta
+        self._deshacer: Deque[List[Cambio]] = deque(maxlen=limite_deshacer)
+        self._rehacer: List[List[Cambio]] = []
+        self._reproduciendo = False                   # deshaciendo/rehaciendo: no se anota
+        # Cambios desde el último guardado, para que storage escriba solo la diferencia
+        self._sucios: Set[str] = set()                # ids agregados o modificados
+        self._borrados: Set[str] = set()              # ids eliminados
+        self._guardado_en: Optional[str] = None       # archivo con el que coincide el resto
 
     @staticmethod
     def _norm(txt: str) -> str:
         return txt.strip().lower()
 
-    def _reconstruir_index(self) -> None:
-        self._index_nombres = {self._norm(p.nombre) for p in self.productos.values()}
+    @staticmethod
+    def _valor_de(cantidad: int, precio: float) -> Decimal:
+        # Decimal exacto del precio tal como se escribe, para que los totales no se desvíen.
+        # Un precio nan/inf arruinaría el total acumulado para siempre: se rechaza.
+        if not math.isfinite(precio):
+            raise ValueError(f"Precio inválido: {precio!r}.")
+        return Decimal(str(precio)) * cantidad
+
+    def _anotar(self, pid: Optional[str], campo: str, antes, despues) -> None:
+        # Todo cambio pasa por acá (también al deshacer): se marca para el guardado diferencial
+        if campo == "lote":
+            alta = despues is not None
+            ids = (despues if alta else antes).keys()
+            quedan, salen = (self._sucios, self._borrados) if alta else (self._borrados, self._sucios)
+            salen.difference_update(ids)
+            quedan.update(ids)
+        elif campo == "producto" and despues is None:
+            self._sucios.discard(pid)
+            self._borrados.add(pid)
+        else:
+            self._borrados.discard(pid)
+            self._sucios.add(pid)
+        if self._reproduciendo:
+            return
+        if self._cambios is not None:
+            self._cambios.append((pid, campo, antes, despues))
+        else:
+            self._cerrar_grupo([(pid, campo, antes, despues)])   # fuera de una transacción: un paso
+
+    def _cerrar_grupo(self, grupo: List[Cambio]) -> None:
+        if grupo:
+            self._deshacer.append(grupo)
+            self._rehacer.clear()
+
+    def _sumar_totales(self, producto: Producto, signo: int) -> None:
+        self._unidades += signo * producto.get_cantidad()
+        self._valor += signo * self._valor_de(producto.get_cantidad(), producto.get_precio())
+
+    def _indexar_nombre(self, pid: str, nombre: str) -> None:
+        self._index_nombres.setdefault(nombre, set()).add(pid)
+        self._index_ngramas.agregar(pid, nombre)
+
+    def _desindexar_nombre(self, pid: str, nombre: str) -> None:
+        ids = self._index_nombres.get(nombre)
+        if ids is not None:
+            ids.discard(pid)
+            if not ids:
+                del self._index_nombres[nombre]
+        self._index_ngramas.quitar(pid, nombre)
+
+    def _quitar_ordenado(self, clave: Tuple[str, str]) -> None:
+        i = bisect_left(self._ordenados, clave)
+        if i < len(self._ordenados) and self._ordenados[i] == clave:
+            del self._ordenados[i]
+
+    def _indexar(self, pid: str, producto: Producto) -> None:
+        # El valor se calcula antes de tocar los índices: si el precio es inválido no queda nada a medias
+        valor = self._valor_de(producto.get_cantidad(), producto.get_precio())
+        self._anotar(pid, "producto", None, producto)
+        self.productos[pid] = producto
+        producto = self.productos[pid]    # con ProductoStore es la vista de la fila
+        nombre = self._norm(producto.get_nombre())
+        self._indexar_nombre(pid, nombre)
+        insort(self._ordenados, (nombre, pid))
+        self._unidades += producto.get_cantidad()
+        self._valor += valor
+        producto._al_cambiar = self._antes_de_cambiar
+
+    def _indexar_lote(self, productos: Dict[str, Producto], anotar: bool = True) -> None:
+        # Carga masiva: la vista ordenada se ordena una sola vez al final
+        # y los n-gramas se calculan una vez por nombre distinto.
+        # anotar=False para cargas desde archivo (no son un paso que se pueda deshacer)
+        valor = sum((self._valor_de(p.get_cantidad(), p.get_precio()) for p in productos.values()),
+                    Decimal(0))   # antes de tocar los índices, igual que _indexar
+        if anotar:
+            self._anotar(None, "lote", None, productos)
+        por_nombre: Dict[str, List[str]] = {}
+        for pid, producto in productos.items():
+            self.productos[pid] = producto
+            producto = self.productos[pid]
+            nombre = self._norm(producto.get_nombre())
+            self._index_nombres.setdefault(nombre, set()).add(pid)
+            por_nombre.setdefault(nombre, []).append(pid)
+            self._ordenados.append((nombre, pid))
+            self._unidades += producto.get_cantidad()
+            producto._al_cambiar = self._antes_de_cambiar
+        self._valor += valor
+        self._index_ngramas.agregar_grupos(por_nombre)
+        self._ordenados.sort()
+
+    def _desindexar(self, pid: str) -> Producto:
+        producto = self.productos.pop(pid)
+        nombre = self._norm(producto.get_nombre())
+        self._desindexar_nombre(pid, nombre)
+        self._quitar_ordenado((nombre, pid))
+        self._sumar_totales(producto, -1)
+        producto._al_cambiar = None
+        self._anotar(pid, "producto", producto, None)
+        return producto
+
+    def _desindexar_varios(self, pids: Iterable[str]) -> None:
+        unicos = dict.fromkeys(pids)
+        if len(unicos) * 8 < len(self._ordenados):
+            for pid in unicos:
+                self._desindexar(pid)
+            return
+
+        # Muchos IDs: se quita de la vista ordenada en una sola pasada
+        quitados: Dict[str, Producto] = {}
+        for pid in unicos:
+            producto = quitados[pid] = self.productos.pop(pid)
+            self._desindexar_nombre(pid, self._norm(producto.get_nombre()))
+            self._sumar_totales(producto, -1)
+            producto._al_cambiar = None
+        self._anotar(None, "lote", quitados, None)
+        self._ordenados = [c for c in self._ordenados if c[1] not in unicos]
+
+    def _antes_de_cambiar(self, producto: Producto, campo: str, nuevo) -> None:
+        # Se llama desde los setters de Producto, antes de asignar el valor nuevo
+        pid = producto.get_id().strip()
+        if campo == "id":
+            raise ValueError("No se puede cambiar el ID de un producto que está en el inventario.")
+        self._anotar(pid, campo, getattr(producto, "get_" + campo)(), nuevo)
+        if campo == "nombre":
+            viejo = self._norm(producto.get_nombre())
+            self._desindexar_nombre(pid, viejo)
+            self._quitar_ordenado((viejo, pid))
+            self._indexar_nombre(pid, self._norm(nuevo))
+            insort(self._ordenados, (self._norm(nuevo), pid))
+        elif campo == "cantidad":
+            self._unidades += nuevo - producto.get_cantidad()
+            self._valor += (self._valor_de(nuevo, producto.get_precio())
+                            - self._valor_de(producto.get_cantidad(), producto.get_precio()))
+        elif campo == "precio":
+            self._valor += (self._valor_de(producto.get_cantidad(), nuevo)
+                            - self._valor_de(producto.get_cantidad(), producto.get_precio()))
 
     def agregar_producto(self, producto: Producto) -> None:
         pid = producto.get_id().strip()
         if pid in self.productos:
             raise ValueError(f"Ya existe un producto con ID '{pid}'.")
-        self.productos[pid] = producto
-        self._index_nombres.add(self._norm(producto.get_nombre()))
+        self._indexar(pid, producto)
+
+    @staticmethod
+    def _producto_de_fila(fila) -> Producto:
+        datos = fila.to_dict() if hasattr(fila, "to_dict") else fila
+        try:
+            pid, nombre = datos["id"], datos["nombre"]
+            cantidad, precio = datos["cantidad"], datos["precio"]
+        except KeyError as e:
+            raise ValueError(f"Falta el campo {e}.")
+        try:
+            cantidad = int(cantidad)
+        except (TypeError, ValueError):
+            raise ValueError(f"Cantidad inválida: {cantidad!r}.")
+        try:
+            precio = float(precio)
+        except (TypeError, ValueError):
+            raise ValueError(f"Precio inválido: {precio!r}.")
+        return Producto(validar_id(str(pid)), validar_nombre(str(nombre)),
+                        validar_cantidad(cantidad), validar_precio(precio))
+
+    def agregar_lote(self, filas: Iterable, primera_fila: int = 1) -> int:
+        """
+        Agrega muchos productos (dicts o Producto) de una sola vez: todo o nada.
+        Primero valida el lote completo (campos, negativos, IDs repetidos dentro
+        del lote o ya existentes) y, si hay errores, lanza ErrorLote con todos ellos.
+        """
+        nuevos: Dict[str, Producto] = {}
+        errores: List[Tuple[int, str]] = []
+        for num, fila in enumerate(filas, start=primera_fila):
+            try:
+                prod = self._producto_de_fila(fila)
+            except ValueError as e:
+                errores.append((num, str(e)))
+                continue
+            pid = prod.get_id()
+            if pid in nuevos:
+                errores.append((num, f"ID '{pid}' repetido dentro del lote."))
+            elif pid in self.productos:
+                errores.append((num, f"Ya existe un producto con ID '{pid}'."))
+            else:
+                nuevos[pid] = prod
+        if errores:
+            raise ErrorLote(errores)
+
+        self._indexar_lote(nuevos)
+        return len(nuevos)
 
     def eliminar_producto(self, producto_id: str) -> None:
         pid = producto_id.strip()
         if pid not in self.productos:
             raise KeyError(f"No existe producto con ID '{pid}'.")
-        self.productos.pop(pid)
-        self._reconstruir_index()
+        self._desindexar(pid)
+
+    def eliminar_productos(self, producto_ids: List[str]) -> None:
+        # Borrado masivo: si falta algún ID no se elimina ninguno
+        pids = [pid.strip() for pid in producto_ids]
+        faltantes = [pid for pid in pids if pid not in self.productos]
+        if faltantes:
+            raise KeyError(f"No existen productos con ID: {', '.join(faltantes)}.")
+        with self.transaccion():   # un solo paso para deshacer()
+            self._desindexar_varios(pids)
 
     def actualizar_producto(self, producto_id: str,
                             nueva_cantidad: Optional[int] = None,
@@ -36,43 +262,167 @@ class Inventario:
             raise KeyError(f"No existe producto con ID '{pid}'.")
         p = self.productos[pid]
 
-        if nueva_cantidad is not None:
-            p.set_cantidad(nueva_cantidad)
-        if nuevo_precio is not None:
-            p.set_precio(nuevo_precio)
+        # Si el precio es inválido tampoco queda cambiada la cantidad
+        with self.transaccion():
+            if nueva_cantidad is not None:
+                p.set_cantidad(nueva_cantidad)
+            if nuevo_precio is not None:
+                p.set_precio(nuevo_precio)
+
+    # ---- Transacciones y deshacer/rehacer ----
+    @contextmanager
+    def transaccion(self) -> Iterator["Inventario"]:
+        """
+        Agrupa varios cambios. Se aplican en el momento (las consultas dentro del
+        bloque ya los ven) y se anota su inverso; si el bloque lanza una excepción
+        se revierten en orden inverso, en O(cambios), y la excepción sigue su curso.
+        Si termina bien, todo el bloque es un solo paso para deshacer().
+
+            with inv.transaccion():
+                for pid, precio in precios_nuevos.items():
+                    inv.actualizar_producto(pid, nuevo_precio=precio)
+
+        Las transacciones anidadas se suman a la de afuera; si una interna falla
+        solo se revierte lo suyo.
+        """
+        externa = self._cambios is None
+        if externa:
+            self._cambios = []
+        inicio = len(self._cambios)
+        try:
+            yield self
+        except BaseException:
+            self._reproducir(reversed(self._cambios[inicio:]), deshaciendo=True)
+            del self._cambios[inicio:]
+            raise
+        finally:
+            if externa:
+                grupo, self._cambios = self._cambios, None
+        if externa:
+            self._cerrar_grupo(grupo)
+
+    def deshacer(self) -> None:
+        """Revierte el último cambio (o la última transacción completa)."""
+        if self._cambios is not None:
+            raise ValueError("No se puede deshacer dentro de una transacción.")
+        if not self._deshacer:
+            raise ValueError("No hay cambios para deshacer.")
+        grupo = self._deshacer.pop()
+        self._reproducir(reversed(grupo), deshaciendo=True)
+        self._rehacer.append(grupo)
+
+    def rehacer(self) -> None:
+        """Vuelve a aplicar lo último que se deshizo (un cambio nuevo descarta lo deshecho)."""
+        if self._cambios is not None:
+            raise ValueError("No se puede rehacer dentro de una transacción.")
+        if not self._rehacer:
+            raise ValueError("No hay cambios para rehacer.")
+        grupo = self._rehacer.pop()
+        self._reproducir(grupo, deshaciendo=False)
+        self._deshacer.append(grupo)
+
+    def puede_deshacer(self) -> bool:
+        return bool(self._deshacer)
+
+    def puede_rehacer(self) -> bool:
+        return bool(self._rehacer)
+
+    def _reproducir(self, cambios: Iterable[Cambio], deshaciendo: bool) -> None:
+        # Deja cada cambio en su estado "antes" (deshaciendo) o "después", sin anotarlo.
+        # Las altas y bajas masivas vuelven a pasar por los caminos masivos.
+        self._reproduciendo = True
+        try:
+            for pid, campo, antes, despues in cambios:
+                valor, otro = (antes, despues) if deshaciendo else (despues, antes)
+                if campo == "lote":
+                    if valor is not None:
+                        self._indexar_lote(valor)
+                    else:
+                        self._desindexar_varios(otro)
+                elif campo == "producto":
+                    if valor is not None:
+                        self._indexar(pid, valor)
+                    else:
+                        self._desindexar(pid)
+                else:
+                    getattr(self.productos[pid], "set_" + campo)(valor)
+        finally:
+            self._reproduciendo = False
 
     def buscar_por_nombre(self, texto: str) -> List[Producto]:
         consulta = self._norm(texto)
         if not consulta:
             return []
-        resultados = [p for p in self.productos.values()
-                      if consulta in self._norm(p.get_nombre())]
-        resultados.sort(key=lambda p: self._norm(p.get_nombre()))
-        return resultados
+        # Solo se verifican los candidatos que comparten todos los n-gramas
+        candidatos = self._index_ngramas.candidatos(consulta)
+
+        # Resultados en el mismo orden que listar_todos: (nombre, id)
+        if len(candidatos) * 8 >= len(self._ordenados):
+            # Muchos candidatos: se recorre la vista ordenada (ya no hay que ordenar)
+            return [self.productos[pid] for nombre, pid in self._ordenados
+                    if pid in candidatos and consulta in nombre]
+
+        claves = sorted((self._norm(self.productos[pid].get_nombre()), pid) for pid in candidatos)
+        return [self.productos[pid] for nombre, pid in claves if consulta in nombre]
+
+    def listar_todos(self, offset: int = 0, limit: Optional[int] = None) -> List[Producto]:
+        # Ordenado por (nombre, id) sin ordenar en cada llamada; admite paginación
+        fin = None if limit is None else offset + limit
+        return [self.productos[pid] for _, pid in self._ordenados[offset:fin]]
 
-    def listar_todos(self) -> List[Producto]:
-        lista = list(self.productos.values())  # list
-        lista.sort(key=lambda p: (self._norm(p.get_nombre()), p.get_id()))
-        return lista
+    def iterar_por_prefijo(self, prefijo: str) -> Iterator[Producto]:
+        # Productos cuyo nombre empieza con el prefijo, en orden (nombre, id)
+        prefijo = self._norm(prefijo)
+        i = bisect_left(self._ordenados, (prefijo, ""))
+        while i < len(self._ordenados) and self._ordenados[i][0].startswith(prefijo):
+            yield self.productos[self._ordenados[i][1]]
+            i += 1
 
     def obtener_producto(self, producto_id: str) -> Optional[Producto]:
         return self.productos.get(producto_id.strip())
 
     def resumen(self) -> Tuple[int, int, float]:
-        # tuple (inmutable)
-        distintos = len(self.productos)
+        # tuple (inmutable); O(1) gracias a los totales acumulados
+        return (len(self.productos), self._unidades, float(round(self._valor, 2)))
+
+    def verificar_resumen(self) -> bool:
+        # Recuenta todo y compara con los totales acumulados
         unidades = sum(p.get_cantidad() for p in self.productos.values())
-        total = sum(p.get_cantidad() * p.get_precio() for p in self.productos.values())
-        return (distintos, unidades, round(total, 2))
+        valor = sum((self._valor_de(p.get_cantidad(), p.get_precio()) for p in self.productos.values()),
+                    Decimal(0))
+        return unidades == self._unidades and valor == self._valor
 
     def to_dict(self) -> dict:
         return {"productos": [p.to_dict() for p in self.productos.values()]}
 
     @staticmethod
-    def from_dict(data: dict) -> "Inventario":
-        inv = Inventario()
-        for item in data.get("productos", []):
+    def from_dict(data: dict, almacen=None) -> "Inventario":
+        return Inventario.from_items(data.get("productos", []), almacen)
+
+    # ---- Guardado diferencial ----
+    def cambios_sin_guardar(self, ruta: str) -> Optional[Tuple[Set[str], Set[str]]]:
+        """
+        (ids agregados o modificados, ids eliminados) desde que el inventario se
+        cargó o se guardó en `ruta`; None si no coincide con ese archivo (hay que
+        escribirlo entero).
+        """
+        if self._guardado_en != ruta:
+            return None
+        return self._sucios, self._borrados
+
+    def marcar_guardado(self, ruta: str) -> None:
+        # Lo llama storage después de escribir (o cargar) `ruta`
+        self._sucios = set()
+        self._borrados = set()
+        self._guardado_en = ruta
+
+    @staticmethod
+    def from_items(items: Iterable[dict], almacen=None) -> "Inventario":
+        # Acepta cualquier iterable (por ejemplo, el lector incremental de storage)
+        inv = Inventario(almacen)
+        productos: Dict[str, Producto] = {}
+        for item in items:
             prod = Producto.from_dict(item)
-            inv.productos[prod.get_id()] = prod
-        inv._reconstruir_index()
+            productos[prod.get_id()] = prod    # ID repetido: gana el último
+        inv._indexar_lote(productos, anotar=False)
         return inv
\ No newline at end of file
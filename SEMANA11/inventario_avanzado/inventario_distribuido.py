@@ -0,0 +1,414 @@
+import gc
+import heapq
+import multiprocessing
+import zlib
+from bisect import bisect_left
+from collections.abc import Mapping
+from decimal import Decimal
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from almacen import ProductoStore
+from inventario import ErrorLote, Inventario
+from producto import Producto
+
+# Inventario repartido en varios procesos (multiprocessing): cada producto vive
+# en una sola partición, elegida por un hash del ID, y cada partición es un
+# Inventario común en su propio proceso, así las consultas pesadas usan varios
+# núcleos en vez de uno solo (el GIL no se comparte entre procesos).
+# - Las operaciones sobre un ID van solo a su partición.
+# - buscar_por_nombre, listar_todos, iterar_por_prefijo y resumen se envían a
+#   todas a la vez; cada una devuelve su parte ya ordenada por (nombre, id) y se
+#   mezclan con heapq.merge (k-way merge) sin volver a ordenar.
+# Los procesos se comunican por Pipe (los datos viajan como tuplas, no como Producto).
+# Tiene los mismos métodos públicos que Inventario, así que main.py funciona igual.
+
+TAM_PARTE = 50_000   # productos por envío al cargar o recorrer
+LIMITE_OFFSET_DIRECTO = 1_000   # con offsets mayores listar_todos ubica la página antes de pedirla
+
+_Fila = Tuple[str, str, int, float]   # (id, nombre, cantidad, precio)
+
+
+def _fila(p) -> _Fila:
+    return (p.get_id(), p.get_nombre(), p.get_cantidad(), p.get_precio())
+
+
+def _con_clave(productos) -> List[Tuple[str, str, _Fila]]:
+    # (nombre normalizado, id, fila): la clave de orden de Inventario va adelante
+    return [(Inventario._norm(p.get_nombre()), p.get_id(), _fila(p)) for p in productos]
+
+
+# ---- Lado de cada partición (se ejecuta en el proceso hijo) ----
+class _Particion:
+    def __init__(self, compacto: bool) -> None:
+        self.inv = Inventario(ProductoStore() if compacto else None)
+        self.pendientes: Dict[str, Producto] = {}   # lote validado o carga en curso
+
+    def obtener(self, pid: str) -> Optional[_Fila]:
+        p = self.inv.obtener_producto(pid)
+        return None if p is None else _fila(p)
+
+    def agregar(self, fila: _Fila) -> None:
+        self.inv.agregar_producto(Producto(*fila))
+
+    def eliminar(self, pid: str) -> None:
+        self.inv.eliminar_producto(pid)
+
+    def eliminar_varios(self, pids: List[str]) -> None:
+        self.inv.eliminar_productos(pids)
+
+    def existentes(self, pids: List[str]) -> List[str]:
+        return [pid for pid in pids if pid in self.inv.productos]
+
+    def actualizar(self, pid: str, cantidad: Optional[int], precio: Optional[float]) -> None:
+        self.inv.actualizar_producto(pid, cantidad, precio)
+
+    def cambiar(self, pid: str, campo: str, nuevo) -> None:
+        producto = self.inv.productos.get(pid)
+        if producto is None:
+            raise KeyError(f"No existe producto con ID '{pid}'.")
+        getattr(producto, "set_" + campo)(nuevo)
+
+    def validar_lote(self, filas: List[Tuple[int, object]]) -> List[Tuple[int, str]]:
+        # Primera fase de agregar_lote: valida su parte y la deja pendiente
+        self.pendientes = {}
+        errores = []
+        for num, fila in filas:
+            try:
+                prod = Inventario._producto_de_fila(fila)
+            except ValueError as e:
+                errores.append((num, str(e)))
+                continue
+            pid = prod.get_id()
+            if pid in self.pendientes:
+                errores.append((num, f"ID '{pid}' repetido dentro del lote."))
+            elif pid in self.inv.productos:
+                errores.append((num, f"Ya existe un producto con ID '{pid}'."))
+            else:
+                self.pendientes[pid] = prod
+        return errores
+
+    def cargar_parte(self, filas: List[dict]) -> None:
+        for item in filas:
+            prod = Producto.from_dict(item)
+            # Un precio nan/inf haría fallar confirmar() después de que otras
+            # particiones ya confirmaron: se detecta acá, antes de confirmar ninguna
+            Inventario._valor_de(prod.get_cantidad(), prod.get_precio())
+            self.pendientes[prod.get_id()] = prod   # ID repetido: gana el último
+
+    def confirmar(self) -> int:
+        cantidad = len(self.pendientes)
+        self.inv._indexar_lote(self.pendientes, anotar=False)
+        self.pendientes = {}
+        # Lo recién cargado no vuelve a revisarlo el recolector de ciclos: con
+        # millones de objetos vivos, cada pasada suya costaba más que la consulta
+        gc.freeze()
+        return cantidad
+
+    def descartar(self) -> None:
+        self.pendientes = {}
+
+    def buscar(self, texto: str) -> list:
+        return _con_clave(self.inv.buscar_por_nombre(texto))
+
+    def listar(self, offset: int, limit: Optional[int]) -> list:
+        return _con_clave(self.inv.listar_todos(offset, limit))
+
+    def clave_en(self, posicion: int) -> Tuple[str, str]:
+        return self.inv._ordenados[posicion]
+
+    def posicion_de(self, clave: Tuple[str, str]) -> int:
+        return bisect_left(self.inv._ordenados, clave)
+
+    def prefijo(self, prefijo: str) -> list:
+        return _con_clave(self.inv.iterar_por_prefijo(prefijo))
+
+    def ids(self) -> List[str]:
+        return list(self.inv.productos.keys())
+
+    def resumen(self) -> Tuple[int, int, Decimal]:
+        return (len(self.inv.productos), self.inv._unidades, self.inv._valor)
+
+    def verificar(self) -> bool:
+        return self.inv.verificar_resumen()
+
+
+def _atender(conexion, compacto: bool) -> None:
+    # Bucle del proceso hijo: recibe (operación, argumentos) y responde (ok, resultado)
+    particion = _Particion(compacto)
+    while True:
+        pedido = conexion.recv()
+        if pedido is None:
+            break
+        operacion, argumentos = pedido
+        try:
+            conexion.send((True, getattr(particion, operacion)(*argumentos)))
+        except Exception as e:   # se relanza en el proceso principal
+            conexion.send((False, e))
+    conexion.close()
+
+
+# ---- Lado del proceso principal ----
+class _ProductosDistribuidos(Mapping):
+    """Vista id -> Producto sobre todas las particiones (lo que storage espera en inv.productos)."""
+
+    def __init__(self, inv: "InventarioDistribuido") -> None:
+        self._inv = inv
+
+    def __getitem__(self, pid: str) -> Producto:
+        p = self._inv.obtener_producto(pid)
+        if p is None:
+            raise KeyError(pid)
+        return p
+
+    def __iter__(self) -> Iterator[str]:
+        for ids in self._inv._a_todas("ids"):
+            yield from ids
+
+    def __len__(self) -> int:
+        return self._inv.resumen()[0]
+
+    def values(self) -> Iterator[Producto]:
+        # Por partes, para no traer todo el inventario en un solo mensaje
+        for i in range(len(self._inv._conexiones)):
+            offset = 0
+            while True:
+                parte = self._inv._pedir(i, "listar", offset, TAM_PARTE)
+                for _, _, fila in parte:
+                    yield self._inv._producto(fila)
+                if len(parte) < TAM_PARTE:
+                    break
+                offset += TAM_PARTE
+
+
+class InventarioDistribuido:
+    def __init__(self, procesos: Optional[int] = None, compacto: bool = False) -> None:
+        """procesos: cantidad de particiones (por defecto, una por núcleo)."""
+        procesos = procesos or multiprocessing.cpu_count()
+        self._conexiones = []
+        self._procesos = []
+        for _ in range(procesos):
+            local, remota = multiprocessing.Pipe()
+            proceso = multiprocessing.Process(target=_atender, args=(remota, compacto), daemon=True)
+            proceso.start()
+            remota.close()
+            self._conexiones.append(local)
+            self._procesos.append(proceso)
+        self.productos = _ProductosDistribuidos(self)
+
+    _norm = staticmethod(Inventario._norm)
+
+    def cerrar(self) -> None:
+        for conexion in self._conexiones:
+            conexion.send(None)
+            conexion.close()
+        for proceso in self._procesos:
+            proceso.join()
+        self._conexiones = []
+        self._procesos = []
+
+    def __enter__(self) -> "InventarioDistribuido":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.cerrar()
+
+    # ---- Comunicación con las particiones ----
+    def _particion(self, pid: str) -> int:
+        # crc32 y no hash(): da lo mismo en cada ejecución (hash de str cambia por proceso)
+        return zlib.crc32(pid.encode("utf-8")) % len(self._conexiones)
+
+    @staticmethod
+    def _resultados(respuestas: List[Tuple[bool, object]]) -> list:
+        for ok, resultado in respuestas:
+            if not ok:
+                raise resultado
+        return [resultado for _, resultado in respuestas]
+
+    @staticmethod
+    def _recibir(conexiones) -> List[Tuple[bool, object]]:
+        # Se lee la respuesta de cada conexión antes de relanzar cualquier error:
+        # una respuesta que quedara en el Pipe la recibiría el pedido siguiente
+        return [conexion.recv() for conexion in conexiones]
+
+    def _pedir(self, i: int, operacion: str, *argumentos):
+        self._conexiones[i].send((operacion, argumentos))
+        return self._resultados(self._recibir([self._conexiones[i]]))[0]
+
+    def _a_todas(self, operacion: str, *argumentos) -> list:
+        # Primero se envía a todas y después se espera: las particiones trabajan en paralelo
+        for conexion in self._conexiones:
+            conexion.send((operacion, argumentos))
+        return self._resultados(self._recibir(self._conexiones))
+
+    def _a_cada_una(self, operacion: str, argumentos_por_particion: List[tuple]) -> list:
+        for conexion, argumentos in zip(self._conexiones, argumentos_por_particion):
+            conexion.send((operacion, argumentos))
+        return self._resultados(self._recibir(self._conexiones))
+
+    def _repartir(self, pids: Iterable[str]) -> List[List[str]]:
+        partes: List[List[str]] = [[] for _ in self._conexiones]
+        for pid in pids:
+            partes[self._particion(pid)].append(pid)
+        return partes
+
+    # ---- Objetos Producto conectados a su partición ----
+    def _producto(self, fila: _Fila) -> Producto:
+        p = Producto(*fila)
+        p._al_cambiar = self._antes_de_cambiar
+        return p
+
+    def _antes_de_cambiar(self, producto: Producto, campo: str, nuevo) -> None:
+        # Los setters de Producto se aplican en la partición que tiene el producto
+        if campo == "id":
+            raise ValueError("No se puede cambiar el ID de un producto que está en el inventario.")
+        pid = producto.get_id()
+        self._pedir(self._particion(pid), "cambiar", pid, campo, nuevo)
+
+    def _mezclar(self, partes: list) -> Iterator[Producto]:
+        # Cada parte ya viene ordenada por (nombre normalizado, id)
+        return (self._producto(fila) for _, _, fila in heapq.merge(*partes))
+
+    # ---- Operaciones ----
+    def agregar_producto(self, producto: Producto) -> None:
+        pid = producto.get_id().strip()
+        self._pedir(self._particion(pid), "agregar",
+                    (pid, producto.get_nombre(), producto.get_cantidad(), producto.get_precio()))
+
+    def agregar_lote(self, filas: Iterable, primera_fila: int = 1) -> int:
+        """
+        Como Inventario.agregar_lote (todo o nada), en dos fases: cada partición
+        valida su parte en paralelo y la deja pendiente; si nadie encontró errores
+        todas la confirman, si no todas la descartan y se lanza ErrorLote.
+        """
+        partes: List[List[Tuple[int, object]]] = [[] for _ in self._conexiones]
+        errores: List[Tuple[int, str]] = []
+        for num, fila in enumerate(filas, start=primera_fila):
+            datos = fila.to_dict() if hasattr(fila, "to_dict") else fila
+            try:
+                pid = str(datos["id"]).strip()
+            except KeyError as e:
+                errores.append((num, f"Falta el campo {e}."))
+                continue
+            partes[self._particion(pid)].append((num, datos))
+
+        try:
+            for errores_particion in self._a_cada_una("validar_lote", [(parte,) for parte in partes]):
+                errores += errores_particion
+        except BaseException:
+            self._a_todas("descartar")
+            raise
+        if errores:
+            self._a_todas("descartar")
+            errores.sort()
+            raise ErrorLote(errores)
+        return sum(self._a_todas("confirmar"))
+
+    def cargar_items(self, items: Iterable[dict]) -> int:
+        """
+        Carga masiva sin validar (como Inventario.from_items), enviando por partes.
+        Si algo falla no se carga nada: todas las particiones descartan lo recibido.
+        """
+        partes: List[List[dict]] = [[] for _ in self._conexiones]
+        enviadas = []   # conexiones con una parte enviada cuya respuesta falta leer
+        try:
+            try:
+                for item in items:
+                    i = self._particion(str(item["id"]))
+                    partes[i].append(item)
+                    if len(partes[i]) >= TAM_PARTE:
+                        # Sin esperar la respuesta: la partición procesa mientras se sigue leyendo
+                        self._conexiones[i].send(("cargar_parte", (partes[i],)))
+                        enviadas.append(self._conexiones[i])
+                        partes[i] = []
+            finally:
+                respuestas = self._recibir(enviadas)   # también si falló la lectura de items
+            self._resultados(respuestas)
+            self._a_cada_una("cargar_parte", [(parte,) for parte in partes])
+        except BaseException:
+            self._a_todas("descartar")
+            raise
+        return sum(self._a_todas("confirmar"))
+
+    def eliminar_producto(self, producto_id: str) -> None:
+        pid = producto_id.strip()
+        self._pedir(self._particion(pid), "eliminar", pid)
+
+    def eliminar_productos(self, producto_ids: List[str]) -> None:
+        # Si falta algún ID no se elimina ninguno (en ninguna partición)
+        pids = list(dict.fromkeys(pid.strip() for pid in producto_ids))
+        partes = self._repartir(pids)
+        existentes = set()
+        for encontrados in self._a_cada_una("existentes", [(parte,) for parte in partes]):
+            existentes.update(encontrados)
+        faltantes = [pid for pid in pids if pid not in existentes]
+        if faltantes:
+            raise KeyError(f"No existen productos con ID: {', '.join(faltantes)}.")
+        self._a_cada_una("eliminar_varios", [(parte,) for parte in partes])
+
+    def actualizar_producto(self, producto_id: str,
+                            nueva_cantidad: Optional[int] = None,
+                            nuevo_precio: Optional[float] = None) -> None:
+        pid = producto_id.strip()
+        self._pedir(self._particion(pid), "actualizar", pid, nueva_cantidad, nuevo_precio)
+
+    def buscar_por_nombre(self, texto: str) -> List[Producto]:
+        if not self._norm(texto):
+            return []
+        return list(self._mezclar(self._a_todas("buscar", texto)))
+
+    def listar_todos(self, offset: int = 0, limit: Optional[int] = None) -> List[Producto]:
+        if offset <= LIMITE_OFFSET_DIRECTO:
+            # Cada partición manda sus primeros offset + limit; la mezcla descarta el resto
+            fin = None if limit is None else offset + limit
+            return list(islice(self._mezclar(self._a_todas("listar", 0, fin)), offset, fin))
+        # Páginas lejanas: se ubica dónde empieza la página en cada partición y
+        # cada una manda solo limit productos desde ahí
+        inicios = self._posiciones(offset)
+        partes = self._a_cada_una("listar", [(inicio, limit) for inicio in inicios])
+        return list(islice(self._mezclar(partes), limit))
+
+    def _posiciones(self, offset: int) -> List[int]:
+        """
+        Cuántos de los primeros `offset` productos (en orden global) tiene cada
+        partición. Selección sobre varias listas ordenadas: se toma como pivote la
+        clave del medio del rango más largo, se cuenta en todas cuántas claves son
+        menores y se achican los rangos; cada vuelta parte a la mitad un rango.
+        """
+        bajos = [0] * len(self._conexiones)
+        altos = [distintos for distintos, _, _ in self._a_todas("resumen")]
+        while True:
+            j = max(range(len(altos)), key=lambda i: altos[i] - bajos[i])
+            if altos[j] == bajos[j]:
+                return bajos
+            medio = (bajos[j] + altos[j]) // 2
+            pivote = self._pedir(j, "clave_en", medio)
+            rangos = [min(max(r, b), a) for r, b, a in zip(self._a_todas("posicion_de", pivote), bajos, altos)]
+            total = sum(rangos)   # posición global del pivote
+            if total == offset:
+                return rangos
+            if total < offset:
+                bajos = rangos
+                bajos[j] = medio + 1   # el pivote también queda antes de la página
+            else:
+                altos = rangos
+
+    def iterar_por_prefijo(self, prefijo: str) -> Iterator[Producto]:
+        return self._mezclar(self._a_todas("prefijo", prefijo))
+
+    def obtener_producto(self, producto_id: str) -> Optional[Producto]:
+        pid = producto_id.strip()
+        fila = self._pedir(self._particion(pid), "obtener", pid)
+        return None if fila is None else self._producto(fila)
+
+    def resumen(self) -> Tuple[int, int, float]:
+        # Los valores llegan como Decimal exacto: la suma da lo mismo que un solo Inventario
+        partes = self._a_todas("resumen")
+        valor = sum((v for _, _, v in partes), Decimal(0))
+        return (sum(d for d, _, _ in partes), sum(u for _, u, _ in partes), float(round(valor, 2)))
+
+    def verificar_resumen(self) -> bool:
+        return all(self._a_todas("verificar"))
+
+    def to_dict(self) -> dict:
+        return {"productos": [p.to_dict() for p in self.productos.values()]}
@@ -0,0 +1,208 @@
+import sqlite3
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from inventario import ErrorLote, Inventario
+from producto import Producto
+
+# Inventario guardado en SQLite (módulo estándar sqlite3): los productos viven en
+# el archivo .db y solo se crean objetos para lo que se consulta.
+# Tiene los mismos métodos públicos que Inventario, así que main.py funciona igual.
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS productos (
+    id          TEXT PRIMARY KEY,
+    nombre      TEXT NOT NULL,
+    nombre_norm TEXT NOT NULL,
+    cantidad    INTEGER NOT NULL CHECK (cantidad >= 0),
+    precio      REAL NOT NULL CHECK (precio >= 0)
+);
+CREATE INDEX IF NOT EXISTS idx_productos_nombre ON productos (nombre_norm, id);
+"""
+
+_COLUMNAS = "id, nombre, cantidad, precio"
+_TAM_LOTE_SQL = 500   # parámetros por consulta IN (...)
+
+
+class _ProductosSQLite(Mapping):
+    """Vista id -> Producto sobre la tabla (lo que storage espera en inv.productos)."""
+
+    def __init__(self, inv: "InventarioSQLite") -> None:
+        self._inv = inv
+
+    def __getitem__(self, pid: str) -> Producto:
+        p = self._inv.obtener_producto(pid)
+        if p is None:
+            raise KeyError(pid)
+        return p
+
+    def __iter__(self) -> Iterator[str]:
+        for (pid,) in self._inv._con.execute("SELECT id FROM productos"):
+            yield pid
+
+    def __len__(self) -> int:
+        return self._inv._con.execute("SELECT COUNT(*) FROM productos").fetchone()[0]
+
+    def values(self) -> Iterator[Producto]:
+        cursor = self._inv._con.execute(f"SELECT {_COLUMNAS} FROM productos")
+        return (self._inv._producto(fila) for fila in cursor)
+
+
+class InventarioSQLite:
+    def __init__(self, ruta: str = "inventario.db") -> None:
+        self.ruta = ruta
+        self._con = sqlite3.connect(ruta)
+        self._con.execute("PRAGMA journal_mode=WAL")     # lectores no bloquean al escritor
+        self._con.execute("PRAGMA synchronous=NORMAL")   # seguro con WAL y mucho más rápido
+        self._con.executescript(_ESQUEMA)
+        self.productos = _ProductosSQLite(self)
+
+    _norm = staticmethod(Inventario._norm)
+
+    def cerrar(self) -> None:
+        self._con.close()
+
+    # ---- Objetos Producto conectados a la base ----
+    def _producto(self, fila: tuple) -> Producto:
+        p = Producto(*fila)
+        p._al_cambiar = self._antes_de_cambiar
+        return p
+
+    def _antes_de_cambiar(self, producto: Producto, campo: str, nuevo) -> None:
+        # Los setters de Producto escriben directo en la base
+        pid = producto.get_id()
+        if campo == "id":
+            raise ValueError("No se puede cambiar el ID de un producto que está en el inventario.")
+        with self._con:
+            if campo == "nombre":
+                self._con.execute("UPDATE productos SET nombre = ?, nombre_norm = ? WHERE id = ?",
+                                  (nuevo, self._norm(nuevo), pid))
+            elif campo == "cantidad":
+                self._con.execute("UPDATE productos SET cantidad = ? WHERE id = ?", (nuevo, pid))
+            elif campo == "precio":
+                self._con.execute("UPDATE productos SET precio = ? WHERE id = ?", (nuevo, pid))
+
+    def _consultar(self, sql: str, parametros: tuple = ()) -> List[Producto]:
+        return [self._producto(fila) for fila in self._con.execute(sql, parametros)]
+
+    # ---- Operaciones ----
+    def agregar_producto(self, producto: Producto) -> None:
+        pid = producto.get_id().strip()
+        # El ID repetido se busca aparte: otros IntegrityError (CHECK, NOT NULL) salen tal cual
+        with self._con:
+            if self._existentes([pid]):
+                raise ValueError(f"Ya existe un producto con ID '{pid}'.")
+            self._con.execute(
+                "INSERT INTO productos (id, nombre, nombre_norm, cantidad, precio) VALUES (?, ?, ?, ?, ?)",
+                (pid, producto.get_nombre(), self._norm(producto.get_nombre()),
+                 producto.get_cantidad(), producto.get_precio()))
+
+    def agregar_lote(self, filas: Iterable, primera_fila: int = 1, reemplazar: bool = False) -> int:
+        # Mismas validaciones que Inventario.agregar_lote; todo en una sola transacción.
+        # reemplazar=True borra antes todos los productos, en esa misma transacción:
+        # si el lote falla la base queda como estaba
+        nuevos: Dict[str, Producto] = {}
+        numeros: Dict[str, int] = {}
+        errores: List[Tuple[int, str]] = []
+        for num, fila in enumerate(filas, start=primera_fila):
+            try:
+                prod = Inventario._producto_de_fila(fila)
+            except ValueError as e:
+                errores.append((num, str(e)))
+                continue
+            pid = prod.get_id()
+            if pid in nuevos:
+                errores.append((num, f"ID '{pid}' repetido dentro del lote."))
+            else:
+                nuevos[pid] = prod
+                numeros[pid] = num
+
+        if not reemplazar:
+            for pid in self._existentes(list(nuevos)):
+                errores.append((numeros[pid], f"Ya existe un producto con ID '{pid}'."))
+        if errores:
+            errores.sort()
+            raise ErrorLote(errores)
+
+        with self._con:
+            if reemplazar:
+                self._con.execute("DELETE FROM productos")
+            self._con.executemany(
+                "INSERT INTO productos (id, nombre, nombre_norm, cantidad, precio) VALUES (?, ?, ?, ?, ?)",
+                ((p.id, p.nombre, self._norm(p.nombre), p.cantidad, p.precio) for p in nuevos.values()))
+        return len(nuevos)
+
+    def _existentes(self, pids: List[str]) -> List[str]:
+        encontrados = []
+        for i in range(0, len(pids), _TAM_LOTE_SQL):
+            parte = pids[i:i + _TAM_LOTE_SQL]
+            marcas = ", ".join("?" * len(parte))
+            encontrados += [pid for (pid,) in self._con.execute(
+                f"SELECT id FROM productos WHERE id IN ({marcas})", parte)]
+        return encontrados
+
+    def eliminar_producto(self, producto_id: str) -> None:
+        pid = producto_id.strip()
+        with self._con:
+            if self._con.execute("DELETE FROM productos WHERE id = ?", (pid,)).rowcount == 0:
+                raise KeyError(f"No existe producto con ID '{pid}'.")
+
+    def eliminar_productos(self, producto_ids: List[str]) -> None:
+        pids = list(dict.fromkeys(pid.strip() for pid in producto_ids))
+        existentes = set(self._existentes(pids))
+        faltantes = [pid for pid in pids if pid not in existentes]
+        if faltantes:
+            raise KeyError(f"No existen productos con ID: {', '.join(faltantes)}.")
+        with self._con:
+            self._con.executemany("DELETE FROM productos WHERE id = ?", ((pid,) for pid in pids))
+
+    def actualizar_producto(self, producto_id: str,
+                            nueva_cantidad: Optional[int] = None,
+                            nuevo_precio: Optional[float] = None) -> None:
+        p = self.obtener_producto(producto_id)
+        if p is None:
+            raise KeyError(f"No existe producto con ID '{producto_id.strip()}'.")
+        if nueva_cantidad is not None:
+            p.set_cantidad(nueva_cantidad)
+        if nuevo_precio is not None:
+            p.set_precio(nuevo_precio)
+
+    def buscar_por_nombre(self, texto: str) -> List[Producto]:
+        consulta = self._norm(texto)
+        if not consulta:
+            return []
+        return self._consultar(
+            f"SELECT {_COLUMNAS} FROM productos WHERE instr(nombre_norm, ?) > 0 "
+            "ORDER BY nombre_norm, id", (consulta,))
+
+    def listar_todos(self, offset: int = 0, limit: Optional[int] = None) -> List[Producto]:
+        return self._consultar(
+            f"SELECT {_COLUMNAS} FROM productos ORDER BY nombre_norm, id LIMIT ? OFFSET ?",
+            (-1 if limit is None else limit, offset))
+
+    def iterar_por_prefijo(self, prefijo: str) -> Iterator[Producto]:
+        # Rango sobre el índice (nombre_norm, id): [prefijo, prefijo + U+10FFFF)
+        prefijo = self._norm(prefijo)
+        cursor = self._con.execute(
+            f"SELECT {_COLUMNAS} FROM productos WHERE nombre_norm >= ? AND nombre_norm < ? "
+            "ORDER BY nombre_norm, id", (prefijo, prefijo + "\U0010ffff"))
+        for fila in cursor:
+            yield self._producto(fila)
+
+    def obtener_producto(self, producto_id: str) -> Optional[Producto]:
+        fila = self._con.execute(f"SELECT {_COLUMNAS} FROM productos WHERE id = ?",
+                                 (producto_id.strip(),)).fetchone()
+        return None if fila is None else self._producto(fila)
+
+    def resumen(self) -> Tuple[int, int, float]:
+        distintos, unidades, total = self._con.execute(
+            "SELECT COUNT(*), COALESCE(SUM(cantidad), 0), COALESCE(SUM(cantidad * precio), 0) "
+            "FROM productos").fetchone()
+        return (distintos, unidades, round(total, 2))
+
+    def verificar_resumen(self) -> bool:
+        # Los totales se calculan en cada consulta: no hay nada acumulado que se desvíe
+        return True
+
+    def to_dict(self) -> dict:
+        return {"productos": [p.to_dict() for p in self.productos.values()]}
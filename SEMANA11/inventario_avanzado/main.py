@@ -1,4 +1,10 @@
+import math
+import sys
+
 from producto import Producto
+from inventario import Inventario
+from inventario_distribuido import InventarioDistribuido
+from inventario_sqlite import InventarioSQLite
 from storage import cargar, guardar, ARCHIVO
 
 
@@ -26,6 +32,9 @@ def leer_float(msg: str, minimo: float = 0.0) -> float:
     while True:
         try:
             v = float(input(msg).strip())
+            if not math.isfinite(v):
+                print("Error: ingrese un número finito.")
+                continue
             if v < minimo:
                 print(f"Error: debe ser >= {minimo}.")
                 continue
@@ -47,12 +56,18 @@ def menu() -> None:
     print("5) Mostrar todos")
     print("6) Resumen")
     print("7) Guardar")
+    print("8) Deshacer último cambio")
+    print("9) Rehacer")
     print("0) Salir")
 
 
 def main():
-    inv = cargar(ARCHIVO)
-    print(f"Inventario cargado desde '{ARCHIVO}'.")
+    # Archivo opcional por línea de comandos: .json, .invc o .db/.sqlite;
+    # un segundo argumento reparte el inventario en esa cantidad de procesos
+    archivo = sys.argv[1] if len(sys.argv) > 1 else ARCHIVO
+    procesos = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    inv = cargar(archivo, procesos)
+    print(f"Inventario cargado desde '{archivo}'.")
 
     while True:
         menu()
@@ -125,11 +140,23 @@ def main():
                 print(f"Valor total: ${total:.2f}")
 
             elif op == "7":
-                guardar(inv, ARCHIVO)
-                print(f"Inventario guardado en '{ARCHIVO}'.")
+                guardar(inv, archivo)
+                print(f"Inventario guardado en '{archivo}'.")
+
+            elif op in ("8", "9"):
+                if not isinstance(inv, Inventario):
+                    print("Deshacer/rehacer no está disponible para este tipo de inventario.")
+                elif op == "8":
+                    inv.deshacer()
+                    print("Cambio deshecho.")
+                else:
+                    inv.rehacer()
+                    print("Cambio rehecho.")
 
             elif op == "0":
-                guardar(inv, ARCHIVO)  # guardado automático
+                guardar(inv, archivo)  # guardado automático
+                if isinstance(inv, (InventarioSQLite, InventarioDistribuido)):
+                    inv.cerrar()
                 print("Guardado final realizado. Saliendo...")
                 break
 
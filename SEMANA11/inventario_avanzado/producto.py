@@ -1,44 +1,80 @@
-from dataclasses import dataclass
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Optional
 
 
-@dataclass
+# Validaciones compartidas por Producto y por las vistas de ProductoStore
+def validar_id(nuevo_id: str) -> str:
+    if not nuevo_id or not nuevo_id.strip():
+        raise ValueError("El ID no puede estar vacío.")
+    return nuevo_id.strip()
+
+
+def validar_nombre(nuevo_nombre: str) -> str:
+    if not nuevo_nombre or not nuevo_nombre.strip():
+        raise ValueError("El nombre no puede estar vacío.")
+    return nuevo_nombre.strip()
+
+
+def validar_cantidad(nueva_cantidad: int) -> int:
+    if int(nueva_cantidad) < 0:
+        raise ValueError("La cantidad no puede ser negativa.")
+    return int(nueva_cantidad)
+
+
+def validar_precio(nuevo_precio: float) -> float:
+    if not math.isfinite(float(nuevo_precio)):
+        raise ValueError("El precio debe ser un número finito.")
+    if float(nuevo_precio) < 0:
+        raise ValueError("El precio no puede ser negativo.")
+    return float(nuevo_precio)
+
+
+@dataclass(slots=True)   # __slots__: sin __dict__ por instancia
 class Producto:
     id: str
     nombre: str
     cantidad: int
     precio: float
+    # Aviso al inventario antes de cada cambio (no forma parte de los datos)
+    _al_cambiar: Optional[Callable[["Producto", str, object], None]] = field(
+        default=None, init=False, repr=False, compare=False)
+
+    def _notificar(self, campo: str, nuevo) -> None:
+        if self._al_cambiar is not None:
+            self._al_cambiar(self, campo, nuevo)
 
     def get_id(self) -> str:
         return self.id
 
     def set_id(self, nuevo_id: str) -> None:
-        if not nuevo_id or not nuevo_id.strip():
-            raise ValueError("El ID no puede estar vacío.")
-        self.id = nuevo_id.strip()
+        nuevo_id = validar_id(nuevo_id)
+        self._notificar("id", nuevo_id)
+        self.id = nuevo_id
 
     def get_nombre(self) -> str:
         return self.nombre
 
     def set_nombre(self, nuevo_nombre: str) -> None:
-        if not nuevo_nombre or not nuevo_nombre.strip():
-            raise ValueError("El nombre no puede estar vacío.")
-        self.nombre = nuevo_nombre.strip()
+        nuevo_nombre = validar_nombre(nuevo_nombre)
+        self._notificar("nombre", nuevo_nombre)
+        self.nombre = nuevo_nombre
 
     def get_cantidad(self) -> int:
         return self.cantidad
 
     def set_cantidad(self, nueva_cantidad: int) -> None:
-        if int(nueva_cantidad) < 0:
-            raise ValueError("La cantidad no puede ser negativa.")
-        self.cantidad = int(nueva_cantidad)
+        nueva_cantidad = validar_cantidad(nueva_cantidad)
+        self._notificar("cantidad", nueva_cantidad)
+        self.cantidad = nueva_cantidad
 
     def get_precio(self) -> float:
         return self.precio
 
     def set_precio(self, nuevo_precio: float) -> None:
-        if float(nuevo_precio) < 0:
-            raise ValueError("El precio no puede ser negativo.")
-        self.precio = float(nuevo_precio)
+        nuevo_precio = validar_precio(nuevo_precio)
+        self._notificar("precio", nuevo_precio)
+        self.precio = nuevo_precio
 
     def to_dict(self) -> dict:
         return {
@@ -55,4 +91,4 @@ class Producto:
             nombre=str(data["nombre"]),
             cantidad=int(data["cantidad"]),
             precio=float(data["precio"])
-        )
\ No newline at end of file
+        )
@@ -1,19 +1,299 @@
+import csv
 import json
+import os
 from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
 from inventario import Inventario
+from columnar import InventarioColumnar, guardar_columnar
+from inventario_distribuido import InventarioDistribuido
+from inventario_sqlite import InventarioSQLite
 
 ARCHIVO = "inventario.json"
+EXTENSION_COLUMNAR = ".invc"
+EXTENSIONES_SQLITE = (".db", ".sqlite")
+TAM_BLOQUE = 64 * 1024   # caracteres leídos por bloque en la carga incremental
+EXTENSION_DELTA = ".delta"
+FRACCION_DELTA = 0.5     # delta más grande que esta fracción del archivo: se reescribe entero
 
+# Guardado diferencial (JSON y .invc): si el inventario se cargó o se guardó en
+# el mismo archivo, guardar() no escribe nada cuando no hubo cambios y, si los
+# hubo, agrega al final de "<archivo>.delta" una línea por producto cambiado
+# ({"id": ...} completo, o {"borrar": id}). cargar() aplica el delta sobre el
+# archivo base. Cuando el delta crece demasiado se reescribe el archivo entero
+# (checkpoint) y el delta se borra. La primera línea del delta es la firma
+# (tamaño, mtime) del archivo base: un delta que quedó de otra versión del
+# archivo (guardado interrumpido entre reescribir y borrar) se ignora.
 
-def guardar(inv: Inventario, ruta: str = ARCHIVO) -> None:
-    with Path(ruta).open("w", encoding="utf-8") as f:
-        json.dump(inv.to_dict(), f, ensure_ascii=False, indent=2)
 
+def _es_columnar(ruta: str) -> bool:
+    return Path(ruta).suffix.lower() == EXTENSION_COLUMNAR
 
-def cargar(ruta: str = ARCHIVO) -> Inventario:
+
+def _es_sqlite(ruta: str) -> bool:
+    return Path(ruta).suffix.lower() in EXTENSIONES_SQLITE
+
+
+def _ruta_delta(ruta: str) -> Path:
+    return Path(str(ruta) + EXTENSION_DELTA)
+
+
+def _clave(ruta: str) -> str:
+    return str(Path(ruta).resolve())
+
+
+def _firma(ruta: str) -> List[int]:
+    st = os.stat(ruta)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def guardar(inv: Inventario, ruta: str = ARCHIVO, compacto: bool = False) -> None:
+    # El formato se elige por la extensión: .invc (binario por columnas), .db/.sqlite o JSON
+    if _es_sqlite(ruta):
+        _guardar_sqlite(inv, ruta)
+        return
+
+    cambios = inv.cambios_sin_guardar(_clave(ruta)) if isinstance(inv, Inventario) else None
+    if cambios is not None and Path(ruta).exists():
+        sucios, borrados = cambios
+        if not sucios and not borrados:
+            return   # nada cambió desde la última vez
+        if _guardar_delta(inv, ruta, sucios, borrados):
+            inv.marcar_guardado(_clave(ruta))
+            return
+
+    if _es_columnar(ruta):
+        guardar_columnar(inv, ruta)
+    else:
+        _guardar_json(inv, ruta, compacto)
+    # Primero se reemplaza el archivo y después se borra el delta, que ya está incluido
+    _ruta_delta(ruta).unlink(missing_ok=True)
+    if isinstance(inv, Inventario):
+        inv.marcar_guardado(_clave(ruta))
+
+
+def _guardar_delta(inv: Inventario, ruta: str, sucios: Set[str], borrados: Set[str]) -> bool:
+    # Agrega los cambios al delta. False si toca reescribir el archivo entero.
+    delta = _ruta_delta(ruta)
+    tam = delta.stat().st_size if delta.exists() else 0
+    if tam > os.path.getsize(ruta) * FRACCION_DELTA:
+        return False
+    lineas = []
+    if tam == 0:
+        lineas.append(json.dumps({"base": _firma(ruta)}))
+    elif _firma_delta(delta) != _firma(ruta):
+        return False   # el delta no corresponde a este archivo
+    for pid in borrados:
+        lineas.append(json.dumps({"borrar": pid}, ensure_ascii=False))
+    for pid in sucios:
+        lineas.append(json.dumps(inv.productos[pid].to_dict(), ensure_ascii=False,
+                                 separators=(",", ":")))
+    with delta.open("a", encoding="utf-8") as f:
+        f.write("\n".join(lineas) + "\n")
+    return True
+
+
+def _firma_delta(delta: Path) -> Optional[List[int]]:
+    with delta.open("r", encoding="utf-8") as f:
+        try:
+            return json.loads(f.readline()).get("base")
+        except (json.JSONDecodeError, AttributeError):
+            return None
+
+
+def _leer_delta(ruta: str) -> Dict[str, Optional[dict]]:
+    # id -> última versión del producto según el delta (None si se eliminó)
+    delta = _ruta_delta(ruta)
+    cambios: Dict[str, Optional[dict]] = {}
+    if not delta.exists() or _firma_delta(delta) != _firma(ruta):
+        return cambios
+    with delta.open("r", encoding="utf-8") as f:
+        f.readline()
+        try:
+            for linea in f:
+                item = json.loads(linea)
+                if "borrar" in item:
+                    cambios[item["borrar"]] = None
+                else:
+                    cambios[item["id"]] = item
+        except json.JSONDecodeError:
+            pass   # última línea cortada por un guardado interrumpido: vale lo anterior
+    return cambios
+
+
+def _guardar_json(inv: Inventario, ruta: str, compacto: bool) -> None:
+    # Se escribe producto por producto (sin armar la lista completa en memoria)
+    # en un archivo temporal que luego reemplaza al original.
+    # compacto=True quita espacios y saltos de línea para reducir el tamaño.
+    temp = Path(str(ruta) + ".tmp")
+    if compacto:
+        sangria, cierre, opciones = "", "", {"separators": (",", ":")}
+    else:
+        sangria, cierre, opciones = "\n    ", "\n  ", {}
+
+    with temp.open("w", encoding="utf-8") as f:
+        f.write('{"productos":[' if compacto else '{\n  "productos": [')
+        vacio = True
+        for p in inv.productos.values():
+            f.write(sangria if vacio else "," + sangria)
+            f.write(json.dumps(p.to_dict(), ensure_ascii=False, **opciones))
+            vacio = False
+        f.write(("" if vacio else cierre) + ("]}" if compacto else "]\n}\n"))
+    os.replace(temp, ruta)
+
+
+def _guardar_sqlite(inv: Inventario, ruta: str) -> None:
+    # Un InventarioSQLite ya guarda cada cambio en su base; otro inventario se copia entero
+    if isinstance(inv, InventarioSQLite) and Path(inv.ruta).resolve() == Path(ruta).resolve():
+        return
+    destino = InventarioSQLite(ruta)
+    try:
+        destino.agregar_lote(inv.productos.values(), reemplazar=True)
+    finally:
+        destino.cerrar()
+
+
+def cargar(ruta: str = ARCHIVO, procesos: int = 0) -> Inventario:
+    # Con .db/.sqlite no se carga nada en memoria: se trabaja directo sobre la base.
+    # procesos > 0 reparte el inventario en ese número de procesos (InventarioDistribuido).
+    if _es_sqlite(ruta):
+        return InventarioSQLite(ruta)
+    if procesos > 0:
+        inv = InventarioDistribuido(procesos)
+        try:
+            inv.cargar_items(_iterar_items(ruta))
+        except BaseException:
+            inv.cerrar()   # que los procesos no sobrevivan a una carga fallida
+            raise
+        return inv
+    inv = Inventario.from_items(_iterar_items(ruta))
+    if Path(ruta).exists():
+        inv.marcar_guardado(_clave(ruta))
+    return inv
+
+
+def _iterar_items(ruta: str) -> Iterator[dict]:
+    # Productos del archivo con el delta ya aplicado
+    if not Path(ruta).exists():
+        return
+    cambios = _leer_delta(ruta)
+    for item in _iterar_base(ruta):
+        if cambios:
+            item = cambios.pop(item.get("id"), item)
+            if item is None:
+                continue
+        yield item
+    yield from (item for item in cambios.values() if item is not None)
+
+
+def _iterar_base(ruta: str) -> Iterator[dict]:
     p = Path(ruta)
-    if not p.exists():
-        return Inventario()
+    if _es_columnar(ruta):
+        with InventarioColumnar(ruta) as col:
+            yield from (prod.to_dict() for prod in col)
+        return
     with p.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-        return Inventario.from_dict(data)
\ No newline at end of file
+        yield from _iterar_productos(f)
+
+
+CAMPOS_CSV = ["id", "nombre", "cantidad", "precio"]
+
+
+def exportar_csv(inv: Inventario, ruta: str) -> None:
+    temp = Path(str(ruta) + ".tmp")
+    with temp.open("w", encoding="utf-8", newline="") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(CAMPOS_CSV)
+        for p in inv.productos.values():
+            escritor.writerow([p.get_id(), p.get_nombre(), p.get_cantidad(), p.get_precio()])
+    os.replace(temp, ruta)
+
+
+def importar_csv(inv: Inventario, ruta: str) -> int:
+    # Todo o nada: si alguna fila es inválida se lanza ErrorLote y no se agrega ninguna.
+    # Los números de fila de los errores son líneas del archivo (la 1 es la cabecera).
+    with Path(ruta).open("r", encoding="utf-8", newline="") as f:
+        return inv.agregar_lote(csv.DictReader(f), primera_fila=2)
+
+
+def abrir_columnar(ruta: str) -> InventarioColumnar:
+    # Acceso de solo lectura sin cargar el inventario (resumen, consultas por ID)
+    return InventarioColumnar(ruta)
+
+
+def convertir(origen: str, destino: str, compacto: bool = False) -> None:
+    # JSON -> .invc o .invc -> JSON, según las extensiones
+    guardar(cargar(origen), destino, compacto)
+
+
+class _LectorJSON:
+    """Lee el archivo por bloques y decodifica valores JSON de a uno."""
+
+    def __init__(self, f) -> None:
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def _cargar_bloque(self) -> bool:
+        bloque = self.f.read(TAM_BLOQUE)
+        if not bloque:
+            return False
+        self.buf = self.buf[self.pos:] + bloque
+        self.pos = 0
+        return True
+
+    def siguiente_caracter(self) -> str:
+        # Salta espacios y devuelve el próximo carácter sin consumirlo ("" al final)
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._cargar_bloque():
+                return ""
+
+    def esperar(self, caracteres: str) -> str:
+        c = self.siguiente_caracter()
+        if c == "" or c not in caracteres:
+            raise json.JSONDecodeError(f"Se esperaba uno de {caracteres!r}", self.buf, self.pos)
+        self.pos += 1
+        return c
+
+    def valor(self):
+        # Si el valor quedó cortado al final del bloque, se lee otro bloque y se reintenta
+        self.siguiente_caracter()
+        while True:
+            try:
+                obj, fin = self.decoder.raw_decode(self.buf, self.pos)
+                if fin < len(self.buf) or not self._cargar_bloque():
+                    self.pos = fin
+                    return obj
+                # El valor terminaba justo en el borde (p. ej. un número): se decodifica de nuevo
+            except json.JSONDecodeError:
+                if not self._cargar_bloque():
+                    raise
+
+
+def _iterar_productos(f) -> Iterator[dict]:
+    # Recorre {"productos": [ {...}, {...} ]} entregando un producto a la vez
+    lector = _LectorJSON(f)
+    lector.esperar("{")
+    if lector.siguiente_caracter() == "}":
+        return
+
+    while True:
+        clave = lector.valor()
+        lector.esperar(":")
+        if clave != "productos":
+            lector.valor()   # otra clave: se descarta su valor
+        else:
+            lector.esperar("[")
+            if lector.siguiente_caracter() == "]":
+                lector.pos += 1
+            else:
+                while True:
+                    yield lector.valor()
+                    if lector.esperar(",]") == "]":
+                        break
+        if lector.esperar(",}") == "}":
+            return
@@ -0,0 +1,71 @@
+import unittest
+
+from almacen import ProductoStore
+from inventario import Inventario
+from producto import Producto
+
+
+def _operar(inv: Inventario) -> None:
+    for i in range(20):
+        inv.agregar_producto(Producto(f"P{i}", f"pieza {i % 7}", i, 0.5 + i))
+    inv.eliminar_producto("P3")
+    inv.eliminar_productos(["P4", "P5"])
+    inv.agregar_producto(Producto("N1", "nueva", 2, 2.0))   # reutiliza una fila libre
+    inv.actualizar_producto("P6", nueva_cantidad=60, nuevo_precio=6.5)
+    inv.obtener_producto("P7").set_nombre("Otra pieza")
+
+
+def _estado(inv: Inventario) -> tuple:
+    return ([p.to_dict() for p in inv.listar_todos()], inv.resumen(),
+            [p.get_id() for p in inv.buscar_por_nombre("pieza")])
+
+
+class ProductoStoreTest(unittest.TestCase):
+    """Un Inventario sobre ProductoStore se comporta igual que sobre un dict."""
+
+    def setUp(self) -> None:
+        self.normal = Inventario()
+        self.compacto = Inventario(ProductoStore())
+        _operar(self.normal)
+        _operar(self.compacto)
+
+    def test_mismo_estado(self) -> None:
+        self.assertEqual(_estado(self.compacto), _estado(self.normal))
+        self.assertTrue(self.compacto.verificar_resumen())
+        self.assertEqual(len(self.compacto.productos), 18)
+
+    def test_mismo_estado_al_deshacer(self) -> None:
+        for _ in range(4):
+            self.normal.deshacer()
+            self.compacto.deshacer()
+            self.assertEqual(_estado(self.compacto), _estado(self.normal))
+
+    def test_copia_los_datos_y_valida(self) -> None:
+        original = Producto("X", "equis", 1, 1.0)
+        self.compacto.agregar_producto(original)
+        original.set_cantidad(99)
+        vista = self.compacto.obtener_producto("X")
+        self.assertEqual(vista.get_cantidad(), 1)
+        with self.assertRaises(ValueError):
+            vista.set_cantidad(-1)
+        with self.assertRaises(ValueError):
+            vista.set_id("P0")
+        self.assertEqual(vista, Producto("X", "equis", 1, 1.0))
+
+    def test_eliminado_devuelve_producto_independiente(self) -> None:
+        almacen = ProductoStore()
+        almacen["A"] = Producto("A", "a", 1, 1.0)
+        quitado = almacen.pop("A")
+        almacen["B"] = Producto("B", "b", 2, 2.0)
+        self.assertEqual(quitado, Producto("A", "a", 1, 1.0))
+        self.assertEqual(almacen.pop("A", None), None)
+        self.assertEqual(list(almacen), ["B"])
+
+
+class ProductoTest(unittest.TestCase):
+    def test_sin_dict_por_instancia(self) -> None:
+        self.assertFalse(hasattr(Producto("A", "a", 1, 1.0), "__dict__"))
+
+
+if __name__ == "__main__":
+    unittest.main()
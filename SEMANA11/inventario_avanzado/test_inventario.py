@@ -0,0 +1,241 @@
+import unittest
+
+from inventario import ErrorLote, Inventario
+from producto import Producto
+
+
+def _inventario(nombres: list) -> Inventario:
+    inv = Inventario()
+    for i, nombre in enumerate(nombres):
+        inv.agregar_producto(Producto(f"P{i}", nombre, i, 1.5))
+    return inv
+
+
+def _ids(productos: list) -> list:
+    return [p.get_id() for p in productos]
+
+
+class BuscarPorNombreTest(unittest.TestCase):
+    """La búsqueda por n-gramas encuentra lo mismo que recorrer todos los nombres."""
+
+    NOMBRES = ["Tornillo", "tornillo largo", "Tuerca", "Arandela", "Destornillador", "ab", "Abrazadera"]
+
+    def setUp(self) -> None:
+        self.inv = _inventario(self.NOMBRES)
+
+    def _recorriendo(self, texto: str) -> list:
+        consulta = texto.strip().lower()
+        return sorted((p.get_nombre().lower(), p.get_id()) for p in self.inv.productos.values()
+                      if consulta in p.get_nombre().lower())
+
+    def test_igual_que_recorrer(self) -> None:
+        for texto in ("torni", "TORNILLO", "ll", "a", "ab", "zzz", "illo l", "r"):
+            esperado = [pid for _, pid in self._recorriendo(texto)]
+            self.assertEqual(_ids(self.inv.buscar_por_nombre(texto)), esperado, texto)
+
+    def test_consulta_vacia(self) -> None:
+        self.assertEqual(self.inv.buscar_por_nombre("   "), [])
+
+    def test_sigue_los_cambios_de_nombre(self) -> None:
+        self.inv.obtener_producto("P2").set_nombre("Tornillo corto")
+        self.assertEqual(_ids(self.inv.buscar_por_nombre("tuerca")), [])
+        self.assertEqual(_ids(self.inv.buscar_por_nombre("corto")), ["P2"])
+
+
+class EliminarTest(unittest.TestCase):
+    """Eliminar deja los índices como si el producto nunca hubiera estado."""
+
+    def setUp(self) -> None:
+        self.inv = _inventario(["Tornillo", "tornillo", "Tuerca", "Clavo", "Clavo"])
+
+    def test_eliminar_uno_con_nombre_repetido(self) -> None:
+        self.inv.eliminar_producto("P0")
+        self.assertEqual(_ids(self.inv.buscar_por_nombre("tornillo")), ["P1"])
+        self.inv.eliminar_producto("P1")
+        self.assertEqual(self.inv.buscar_por_nombre("torn"), [])
+        self.assertNotIn("tornillo", self.inv._index_nombres)
+        self.assertEqual(_ids(self.inv.listar_todos()), ["P3", "P4", "P2"])
+
+    def test_eliminar_varios(self) -> None:
+        self.inv.eliminar_productos(["P3", " P4", "P2"])
+        self.assertEqual(_ids(self.inv.listar_todos()), ["P0", "P1"])
+        self.assertEqual(self.inv.buscar_por_nombre("clavo"), [])
+        self.assertEqual(self.inv.resumen(), (2, 1, 1.5))
+
+    def test_eliminar_inexistente_no_toca_nada(self) -> None:
+        with self.assertRaises(KeyError):
+            self.inv.eliminar_productos(["P0", "X"])
+        with self.assertRaises(KeyError):
+            self.inv.eliminar_producto("X")
+        self.assertEqual(len(self.inv.listar_todos()), 5)
+
+    def test_volver_a_agregar(self) -> None:
+        self.inv.eliminar_producto("P2")
+        self.inv.agregar_producto(Producto("P2", "Tuerca", 1, 1.0))
+        self.assertEqual(_ids(self.inv.buscar_por_nombre("tuer")), ["P2"])
+
+
+class VistaOrdenadaTest(unittest.TestCase):
+    """listar_todos, iterar_por_prefijo y las búsquedas salen ordenados por (nombre, id)."""
+
+    def setUp(self) -> None:
+        self.inv = _inventario(["pera", "Banana", "manzana", "banana", "Mandarina"])
+
+    def _esperado(self) -> list:
+        return [pid for _, pid in sorted((p.get_nombre().lower(), p.get_id())
+                                         for p in self.inv.productos.values())]
+
+    def test_orden_y_paginas(self) -> None:
+        self.assertEqual(_ids(self.inv.listar_todos()), ["P1", "P3", "P4", "P2", "P0"])
+        self.assertEqual(_ids(self.inv.listar_todos(offset=1, limit=2)), ["P3", "P4"])
+        self.assertEqual(self.inv.listar_todos(offset=10), [])
+
+    def test_sigue_ordenado_tras_cambios(self) -> None:
+        self.inv.obtener_producto("P0").set_nombre("Anana")
+        self.inv.agregar_producto(Producto("P9", "kiwi", 1, 1.0))
+        self.inv.eliminar_producto("P3")
+        self.assertEqual(_ids(self.inv.listar_todos()), self._esperado())
+
+    def test_prefijo(self) -> None:
+        self.assertEqual(_ids(self.inv.iterar_por_prefijo("MAN")), ["P4", "P2"])
+        self.assertEqual(_ids(self.inv.iterar_por_prefijo("z")), [])
+
+    def test_busqueda_ordenada_con_pocos_y_muchos_candidatos(self) -> None:
+        for i in range(50):
+            self.inv.agregar_producto(Producto(f"Q{i:02d}", f"caja {49 - i}", 1, 1.0))
+        self.assertEqual(_ids(self.inv.buscar_por_nombre("an")), ["P1", "P3", "P4", "P2"])
+        self.assertEqual(_ids(self.inv.buscar_por_nombre("caja 4"))[:2], ["Q45", "Q09"])
+
+
+class ResumenTest(unittest.TestCase):
+    """Los totales acumulados coinciden siempre con recontar todo."""
+
+    def test_totales_exactos_tras_cambios(self) -> None:
+        inv = Inventario()
+        for i in range(100):
+            inv.agregar_producto(Producto(f"P{i}", f"p{i}", 3, 0.1))
+        self.assertEqual(inv.resumen(), (100, 300, 30.0))
+        inv.actualizar_producto("P0", nueva_cantidad=10, nuevo_precio=0.2)
+        inv.obtener_producto("P1").set_precio(0.3)
+        inv.eliminar_producto("P2")
+        self.assertEqual(inv.resumen(), (99, 304, 32.0))
+        self.assertTrue(inv.verificar_resumen())
+
+    def test_precio_no_finito_no_cambia_nada(self) -> None:
+        inv = _inventario(["a"])
+        with self.assertRaises(ValueError):
+            inv.agregar_producto(Producto("X", "x", 1, float("nan")))
+        with self.assertRaises(ValueError):
+            inv.actualizar_producto("P0", nueva_cantidad=7, nuevo_precio=float("inf"))
+        self.assertEqual(inv.resumen(), (1, 0, 0.0))
+        self.assertIsNone(inv.obtener_producto("X"))
+        self.assertTrue(inv.verificar_resumen())
+
+
+class AgregarLoteTest(unittest.TestCase):
+    """agregar_lote es todo o nada e informa todas las filas con problemas."""
+
+    def test_lote_valido(self) -> None:
+        inv = _inventario(["a"])
+        filas = [{"id": f"L{i}", "nombre": f"lote {i}", "cantidad": "2", "precio": "1.5"} for i in range(5)]
+        self.assertEqual(inv.agregar_lote(filas + [Producto("L9", "lote 9", 1, 1.0)]), 6)
+        self.assertEqual(inv.resumen(), (7, 11, 16.0))
+        self.assertEqual(len(inv.buscar_por_nombre("lote")), 6)
+        inv.deshacer()   # el lote es un solo paso
+        self.assertEqual(inv.resumen(), (1, 0, 0.0))
+
+    def test_errores_de_todas_las_filas(self) -> None:
+        inv = _inventario(["a"])
+        filas = [{"id": "A", "nombre": "ok", "cantidad": 1, "precio": 1},
+                 {"id": "B", "nombre": "b", "cantidad": -1, "precio": 1},
+                 {"id": "A", "nombre": "repetido", "cantidad": 1, "precio": 1},
+                 {"id": "P0", "nombre": "existe", "cantidad": 1, "precio": 1},
+                 {"id": "C", "nombre": "c", "cantidad": 1, "precio": "nan"},
+                 {"id": "D", "nombre": "d", "cantidad": "x", "precio": 1},
+                 {"id": "E", "cantidad": 1, "precio": 1}]
+        with self.assertRaises(ErrorLote) as ctx:
+            inv.agregar_lote(filas, primera_fila=2)
+        self.assertEqual([fila for fila, _ in ctx.exception.errores], [3, 4, 5, 6, 7, 8])
+        self.assertEqual(inv.resumen(), (1, 0, 0.0))
+        self.assertIsNone(inv.obtener_producto("A"))
+
+
+def _foto(inv: Inventario) -> tuple:
+    return ([p.to_dict() for p in inv.listar_todos()], inv.resumen(), _ids(inv.buscar_por_nombre("o")))
+
+
+class TransaccionTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.inv = _inventario(["tornillo", "tuerca", "clavo"])
+
+    def test_error_revierte_todo_el_bloque(self) -> None:
+        antes = _foto(self.inv)
+        with self.assertRaises(ValueError):
+            with self.inv.transaccion():
+                self.inv.agregar_producto(Producto("N", "nuevo", 5, 1.0))
+                self.inv.obtener_producto("P0").set_nombre("perno")
+                self.inv.eliminar_producto("P1")
+                self.assertEqual(len(self.inv.productos), 3)   # los cambios ya se ven adentro
+                self.inv.actualizar_producto("P2", nuevo_precio=-1)
+        self.assertEqual(_foto(self.inv), antes)
+        self.assertTrue(self.inv.verificar_resumen())
+
+    def test_anidada_que_falla_solo_revierte_lo_suyo(self) -> None:
+        with self.inv.transaccion():
+            self.inv.actualizar_producto("P0", nueva_cantidad=10)
+            try:
+                with self.inv.transaccion():
+                    self.inv.actualizar_producto("P1", nueva_cantidad=20)
+                    raise RuntimeError("falla")
+            except RuntimeError:
+                pass
+        self.assertEqual((self.inv.obtener_producto("P0").get_cantidad(),
+                          self.inv.obtener_producto("P1").get_cantidad()), (10, 1))
+        self.inv.deshacer()   # la transacción externa es un solo paso
+        self.assertEqual(self.inv.obtener_producto("P0").get_cantidad(), 0)
+        self.inv.deshacer()   # lo anterior: el alta de P2
+        self.assertIsNone(self.inv.obtener_producto("P2"))
+
+
+class DeshacerTest(unittest.TestCase):
+    def test_deshacer_y_rehacer_todo(self) -> None:
+        inv = _inventario([])
+        fotos = [_foto(inv)]
+        pasos = [lambda: inv.agregar_producto(Producto("A", "tornillo", 1, 1.0)),
+                 lambda: inv.agregar_lote([{"id": f"L{i}", "nombre": f"lote {i}", "cantidad": i, "precio": 2}
+                                           for i in range(20)]),
+                 lambda: inv.actualizar_producto("A", nueva_cantidad=5, nuevo_precio=3.5),
+                 lambda: inv.obtener_producto("L3").set_nombre("otro"),
+                 lambda: inv.eliminar_productos([f"L{i}" for i in range(15)]),
+                 lambda: inv.eliminar_producto("A")]
+        for paso in pasos:
+            paso()
+            fotos.append(_foto(inv))
+        for foto in reversed(fotos[:-1]):
+            inv.deshacer()
+            self.assertEqual(_foto(inv), foto)
+        with self.assertRaises(ValueError):
+            inv.deshacer()
+        for foto in fotos[1:]:
+            inv.rehacer()
+            self.assertEqual(_foto(inv), foto)
+        self.assertTrue(inv.verificar_resumen())
+
+    def test_cambio_nuevo_descarta_lo_deshecho_y_limite(self) -> None:
+        inv = Inventario(limite_deshacer=3)
+        for i in range(5):
+            inv.agregar_producto(Producto(f"P{i}", f"p{i}", 1, 1.0))
+        inv.deshacer()
+        inv.agregar_producto(Producto("X", "x", 1, 1.0))
+        self.assertFalse(inv.puede_rehacer())
+        for _ in range(3):
+            inv.deshacer()
+        self.assertFalse(inv.puede_deshacer())
+        self.assertEqual(sorted(inv.productos), ["P0", "P1"])
+        with self.assertRaises(ValueError):
+            with inv.transaccion():
+                inv.deshacer()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import json
+import os
+import tempfile
+import unittest
+
+import inventario_distribuido
+import storage
+from inventario_distribuido import InventarioDistribuido
+
+
+def _items(n: int) -> list:
+    return [{"id": f"P{i}", "nombre": f"producto {i}", "cantidad": i, "precio": 1.5}
+            for i in range(n)]
+
+
+class CargaFallidaTest(unittest.TestCase):
+    """Un error en una partición no debe dejar respuestas viejas en los Pipes."""
+
+    def setUp(self) -> None:
+        self.inv = InventarioDistribuido(3)
+
+    def tearDown(self) -> None:
+        self.inv.cerrar()
+
+    def _sigue_usable(self) -> None:
+        self.assertEqual(self.inv.resumen(), (0, 0, 0.0))
+        self.assertEqual(self.inv.listar_todos(), [])
+        self.assertEqual(self.inv.cargar_items(_items(10)), 10)
+        self.assertEqual(self.inv.resumen(), (10, 45, 67.5))
+        self.assertEqual([p.id for p in self.inv.listar_todos(limit=2)], ["P0", "P1"])
+
+    def test_item_incompleto_en_una_particion(self) -> None:
+        # Falla en el proceso hijo (Producto.from_dict) solo en la partición de X1
+        with self.assertRaises(KeyError):
+            self.inv.cargar_items(_items(20) + [{"id": "X1"}])
+        self._sigue_usable()
+
+    def test_item_sin_id_con_partes_ya_enviadas(self) -> None:
+        # Falla en el proceso principal después de enviar partes sin leer su respuesta
+        tam = inventario_distribuido.TAM_PARTE
+        inventario_distribuido.TAM_PARTE = 2
+        try:
+            with self.assertRaises(KeyError):
+                self.inv.cargar_items(_items(20) + [{"nombre": "sin id"}])
+        finally:
+            inventario_distribuido.TAM_PARTE = tam
+        self._sigue_usable()
+
+    def test_precio_no_finito_no_carga_nada(self) -> None:
+        with self.assertRaises(ValueError):
+            self.inv.cargar_items(_items(20) + [{"id": "N", "nombre": "n", "cantidad": 1,
+                                                 "precio": float("nan")}])
+        self._sigue_usable()
+
+    def test_agregar_lote_con_error_en_una_particion(self) -> None:
+        with self.assertRaises(ValueError):
+            self.inv.agregar_lote(_items(5) + [{"id": "Z", "nombre": "z", "cantidad": 1,
+                                                "precio": "inf"}])
+        self._sigue_usable()
+
+
+class CargarDesdeArchivoTest(unittest.TestCase):
+    def test_carga_fallida_cierra_los_procesos(self) -> None:
+        with tempfile.TemporaryDirectory() as carpeta:
+            ruta = os.path.join(carpeta, "inventario.json")
+            with open(ruta, "w", encoding="utf-8") as f:
+                json.dump({"productos": _items(5) + [{"id": "X1"}]}, f)
+            creados = []
+            original = storage.InventarioDistribuido
+
+            def registrar(*args, **kwargs):
+                inv = original(*args, **kwargs)
+                creados.append(inv)
+                return inv
+
+            storage.InventarioDistribuido = registrar
+            try:
+                with self.assertRaises(KeyError):
+                    storage.cargar(ruta, procesos=2)
+            finally:
+                storage.InventarioDistribuido = original
+            self.assertEqual(len(creados), 1)
+            self.assertEqual(creados[0]._procesos, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from inventario_sqlite import InventarioSQLite
+from producto import Producto
+
+
+class AgregarProductoTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.inv = InventarioSQLite(os.path.join(self.carpeta.name, "inventario.db"))
+
+    def tearDown(self) -> None:
+        self.inv.cerrar()
+        self.carpeta.cleanup()
+
+    def test_id_repetido(self) -> None:
+        self.inv.agregar_producto(Producto("P1", "tornillo", 5, 0.5))
+        with self.assertRaisesRegex(ValueError, "Ya existe un producto con ID 'P1'"):
+            self.inv.agregar_producto(Producto(" P1 ", "otro", 1, 1.0))
+        self.assertEqual(self.inv.obtener_producto("P1").get_nombre(), "tornillo")
+
+    def test_otras_restricciones_no_se_confunden_con_id_repetido(self) -> None:
+        # El constructor de Producto no valida; la restricción CHECK de la tabla sí
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.inv.agregar_producto(Producto("P2", "tuerca", -1, 1.0))
+        self.assertIsNone(self.inv.obtener_producto("P2"))
+        self.inv.agregar_producto(Producto("P2", "tuerca", 1, 1.0))
+        self.assertEqual(len(self.inv.productos), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+import json
+import os
+import tempfile
+import unittest
+
+import storage
+from inventario import ErrorLote, Inventario
+from producto import Producto
+
+
+def _inventario(n: int) -> Inventario:
+    inv = Inventario()
+    for i in range(n):
+        inv.agregar_producto(Producto(f"P{i}", f"producto ñ {i}", i, i + 0.25))
+    return inv
+
+
+def _datos(inv) -> list:
+    return sorted((p.get_id(), p.get_nombre(), p.get_cantidad(), p.get_precio())
+                  for p in inv.productos.values())
+
+
+class ArchivoTemporalTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.carpeta = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.carpeta.cleanup()
+
+    def ruta(self, nombre: str) -> str:
+        return os.path.join(self.carpeta.name, nombre)
+
+
+class JSONIncrementalTest(ArchivoTemporalTest):
+    """El lector por bloques entiende lo mismo que json.load, corte donde corte el bloque."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self._tam = storage.TAM_BLOQUE
+        storage.TAM_BLOQUE = 7   # bloques chicos: los valores quedan partidos
+
+    def tearDown(self) -> None:
+        storage.TAM_BLOQUE = self._tam
+        super().tearDown()
+
+    def test_ida_y_vuelta(self) -> None:
+        inv = _inventario(30)
+        for compacto in (False, True):
+            ruta = self.ruta(f"inv{compacto}.json")
+            storage.guardar(inv, ruta, compacto=compacto)
+            with open(ruta, encoding="utf-8") as f:
+                self.assertEqual(len(json.load(f)["productos"]), 30)
+            self.assertEqual(_datos(storage.cargar(ruta)), _datos(inv))
+
+    def test_otras_claves_y_vacios(self) -> None:
+        ruta = self.ruta("inv.json")
+        casos = {'{}': 0, '{"productos": []}': 0,
+                 '{"version": [1, {"a": "]}"}], "productos": [{"id": "A", "nombre": "a",'
+                 ' "cantidad": 12345, "precio": 1e3}], "fin": null}': 1}
+        for texto, cantidad in casos.items():
+            with open(ruta, "w", encoding="utf-8") as f:
+                f.write(texto)
+            inv = storage.cargar(ruta)
+            self.assertEqual(len(inv.productos), cantidad, texto)
+        self.assertEqual(inv.obtener_producto("A").get_precio(), 1000.0)
+
+    def test_archivo_cortado(self) -> None:
+        ruta = self.ruta("inv.json")
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write('{"productos": [{"id": "A", "nombre": "a", "cantidad": 1, "precio": 1}')
+        with self.assertRaises(json.JSONDecodeError):
+            storage.cargar(ruta)
+
+
+class ColumnarTest(ArchivoTemporalTest):
+    """Un .invc guardado y abierto con mmap devuelve los mismos productos y totales."""
+
+    def test_ida_y_vuelta(self) -> None:
+        inv = _inventario(50)
+        ruta = self.ruta("inv.invc")
+        storage.guardar(inv, ruta)
+        with storage.abrir_columnar(ruta) as col:
+            self.assertEqual(len(col), 50)
+            self.assertEqual(col.resumen(), inv.resumen())
+            self.assertEqual(_datos(Inventario.from_dict(col.to_dict())), _datos(inv))
+            self.assertEqual(col.obtener_producto(" P17 ").get_nombre(), "producto ñ 17")
+            self.assertIsNone(col.obtener_producto("P170"))
+        self.assertEqual(_datos(storage.cargar(ruta)), _datos(inv))
+
+    def test_convertir_y_vacio(self) -> None:
+        storage.guardar(_inventario(5), self.ruta("inv.json"))
+        storage.convertir(self.ruta("inv.json"), self.ruta("inv.invc"))
+        storage.convertir(self.ruta("inv.invc"), self.ruta("copia.json"))
+        self.assertEqual(_datos(storage.cargar(self.ruta("copia.json"))), _datos(_inventario(5)))
+
+        storage.guardar(Inventario(), self.ruta("vacio.invc"))
+        with storage.abrir_columnar(self.ruta("vacio.invc")) as col:
+            self.assertEqual((len(col), list(col), col.obtener_producto("x")), (0, [], None))
+
+    def test_archivo_invalido(self) -> None:
+        ruta = self.ruta("malo.invc")
+        storage.guardar(_inventario(5), ruta)
+        with open(ruta, "r+b") as f:
+            f.truncate(os.path.getsize(ruta) - 16)
+        with self.assertRaises(ValueError):
+            storage.abrir_columnar(ruta)
+        for contenido in (b"", b"no es un inventario, solo texto suelto" * 4):
+            with open(ruta, "wb") as f:
+                f.write(contenido)
+            with self.assertRaises(ValueError):
+                storage.abrir_columnar(ruta)
+
+
+class CSVTest(ArchivoTemporalTest):
+    def test_exportar_e_importar(self) -> None:
+        inv = _inventario(20)
+        ruta = self.ruta("inv.csv")
+        storage.exportar_csv(inv, ruta)
+        copia = Inventario()
+        self.assertEqual(storage.importar_csv(copia, ruta), 20)
+        self.assertEqual(_datos(copia), _datos(inv))
+
+    def test_fila_invalida_con_numero_de_linea(self) -> None:
+        ruta = self.ruta("inv.csv")
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write("id,nombre,cantidad,precio\nA,a,1,1.0\nB,b,-2,1.0\n")
+        inv = Inventario()
+        with self.assertRaises(ErrorLote) as ctx:
+            storage.importar_csv(inv, ruta)
+        self.assertEqual(ctx.exception.errores, [(3, "La cantidad no puede ser negativa.")])
+        self.assertEqual(len(inv.productos), 0)
+
+
+class GuardadoDiferencialTest(ArchivoTemporalTest):
+    """guardar() solo escribe lo que cambió y cargar() aplica el delta sobre la base."""
+
+    def _revisar(self, ruta: str) -> None:
+        storage.guardar(_inventario(200), ruta)
+        inv = storage.cargar(ruta)
+        firma = storage._firma(ruta)
+        storage.guardar(inv, ruta)   # sin cambios: no se escribe nada
+        self.assertEqual(storage._firma(ruta), firma)
+        self.assertFalse(storage._ruta_delta(ruta).exists())
+
+        inv.actualizar_producto("P1", nueva_cantidad=99)
+        inv.eliminar_producto("P2")
+        inv.agregar_producto(Producto("N", "nuevo", 1, 1.0))
+        storage.guardar(inv, ruta)
+        self.assertEqual(storage._firma(ruta), firma)   # la base no se tocó
+        self.assertTrue(storage._ruta_delta(ruta).exists())
+        inv.deshacer()   # deshacer también es un cambio a guardar
+        storage.guardar(inv, ruta)
+        self.assertEqual(_datos(storage.cargar(ruta)), _datos(inv))
+
+        # Cuando el delta crece demasiado se reescribe la base y el delta desaparece
+        fraccion = storage.FRACCION_DELTA
+        storage.FRACCION_DELTA = 0.0
+        try:
+            inv.actualizar_producto("P3", nueva_cantidad=7)
+            storage.guardar(inv, ruta)
+        finally:
+            storage.FRACCION_DELTA = fraccion
+        self.assertFalse(storage._ruta_delta(ruta).exists())
+        self.assertEqual(_datos(storage.cargar(ruta)), _datos(inv))
+
+    def test_json(self) -> None:
+        self._revisar(self.ruta("inv.json"))
+
+    def test_columnar(self) -> None:
+        self._revisar(self.ruta("inv.invc"))
+
+    def test_delta_de_otra_base_se_ignora(self) -> None:
+        ruta = self.ruta("inv.json")
+        storage.guardar(_inventario(10), ruta)
+        inv = storage.cargar(ruta)
+        inv.eliminar_producto("P0")
+        storage.guardar(inv, ruta)
+        # Otro programa reescribe la base sin borrar el delta (guardado interrumpido)
+        storage.guardar(_inventario(11), self.ruta("otro.json"))
+        os.replace(self.ruta("otro.json"), ruta)
+        with open(storage._ruta_delta(ruta), "a", encoding="utf-8") as f:
+            f.write('{"id": "cortado", "nom')
+        self.assertEqual(_datos(storage.cargar(ruta)), _datos(_inventario(11)))
+
+    def test_otro_archivo_se_escribe_entero(self) -> None:
+        inv = _inventario(5)
+        storage.guardar(inv, self.ruta("a.json"))
+        inv.eliminar_producto("P0")
+        storage.guardar(inv, self.ruta("b.json"))
+        self.assertFalse(storage._ruta_delta(self.ruta("b.json")).exists())
+        self.assertEqual(_datos(storage.cargar(self.ruta("b.json"))), _datos(inv))
+        self.assertEqual(len(storage.cargar(self.ruta("a.json")).productos), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
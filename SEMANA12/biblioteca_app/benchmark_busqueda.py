@@ -0,0 +1,53 @@
+# Benchmark de MotorBusqueda: latencia de buscar() (primera página) a medida
+# que crece el catálogo. Con los índices invertidos y el corte temprano del
+# algoritmo de umbral, el tiempo no debería crecer con el tamaño del catálogo.
+# Uso: python benchmark_busqueda.py [tamaño_maximo]
+
+import random
+import sys
+import time
+
+from servicios.biblioteca_servicio import BibliotecaServicio
+
+PALABRAS = ["canción", "noche", "río", "historia", "mar", "sol", "luna", "árbol", "ciudad",
+            "tiempo", "memoria", "viaje", "sombra", "jardín", "silencio", "fuego"]
+AUTORES = [f"{nombre} {apellido}" for nombre in ("Ana", "Luis", "Sofía", "Tomás", "Inés")
+           for apellido in ("García", "Pérez", "Núñez", "Díaz", "Ruiz", "Gómez")]
+CONSULTAS = [
+    {"titulo": "historia"},
+    {"titulo": "cancion mar"},
+    {"titulo": "mem"},
+    {"autor": "garcia", "categoria": "novela"},
+    {"titulo": "luna", "autor": "ines", "categoria": "poesía"},
+]
+
+
+def agregar_libros(servicio, desde, hasta, azar):
+    for i in range(desde, hasta):
+        titulo = " ".join(azar.choice(PALABRAS) for _ in range(azar.randint(2, 6)))
+        servicio.agregar_libro(azar.choice(AUTORES), titulo,
+                               azar.choice(["Novela", "Poesía", "Ensayo", "Cuento"]), f"isbn-{i}")
+
+
+def main():
+    maximo = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    azar = random.Random(1)
+    servicio = BibliotecaServicio()
+    tamanos = [maximo // 8, maximo // 4, maximo // 2, maximo]
+
+    print(f"{'libros':>8} " + " ".join(f"{str(list(c.values())):>28}" for c in CONSULTAS))
+    anterior = 0
+    for tamano in tamanos:
+        agregar_libros(servicio, anterior, tamano, azar)
+        anterior = tamano
+        tiempos = []
+        for consulta in CONSULTAS:
+            inicio = time.perf_counter()
+            for _ in range(20):
+                servicio.buscar(**consulta)
+            tiempos.append((time.perf_counter() - inicio) / 20 * 1000)
+        print(f"{tamano:>8} " + " ".join(f"{t:>25.3f} ms" for t in tiempos))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# Prueba de carga con varios hilos: préstamos y devoluciones al azar sobre un
+# catálogo compartido, mientras otro hilo busca sin parar. Al final se verifica
+# que cada libro esté en un solo lugar (disponible o en manos de un único usuario)
+# y que los préstamos exitosos menos las devoluciones exitosas coincidan con lo prestado.
+# Uso: python benchmark_concurrencia.py [operaciones_totales]
+
+import random
+import sys
+import threading
+import time
+
+from servicios.biblioteca_concurrente import BibliotecaConcurrente
+from servicios.biblioteca_servicio import BibliotecaServicio
+
+LIBROS = 2000
+USUARIOS = 200
+
+
+def crear(clase):
+    servicio = clase()
+    for i in range(LIBROS):
+        servicio.agregar_libro(f"Autor {i % 300}", f"Historia número {i}", f"Cat{i % 20}", f"isbn-{i}")
+    for i in range(USUARIOS):
+        servicio.registrar_usuario(f"Usuario {i}", f"u{i}")
+    return servicio
+
+
+def trabajador(servicio, operaciones, semilla, totales):
+    azar = random.Random(semilla)
+    prestados = []   # (user_id, isbn) que este hilo prestó y todavía no devolvió
+    exitos_prestamo = exitos_devolucion = 0
+    for _ in range(operaciones):
+        if prestados and azar.random() < 0.5:
+            user_id, isbn = prestados.pop(azar.randrange(len(prestados)))
+            ok, _ = servicio.devolver_libro(user_id, isbn)
+            exitos_devolucion += ok
+        else:
+            user_id = f"u{azar.randrange(USUARIOS)}"
+            isbn = f"isbn-{azar.randrange(LIBROS)}"
+            ok, _ = servicio.prestar_libro(user_id, isbn)
+            if ok:
+                exitos_prestamo += 1
+                prestados.append((user_id, isbn))
+    totales.append((exitos_prestamo, exitos_devolucion))
+
+
+def buscador(servicio, detener, contador):
+    while not detener.is_set():
+        servicio.buscar_por_titulo("historia 1")
+        servicio.buscar_por_categoria("cat7")
+        contador[0] += 1
+
+
+def verificar(servicio, totales):
+    """Devuelve la lista de invariantes rotos (vacía si todo está bien)."""
+    errores = []
+    dueno = {}
+    for usuario in servicio.listar_usuarios():
+        for libro in servicio.listar_libros_prestados_usuario(usuario.user_id):
+            if libro.isbn in dueno:
+                errores.append(f"{libro.isbn} en manos de {dueno[libro.isbn]} y de {usuario.user_id}")
+            dueno[libro.isbn] = usuario.user_id
+
+    prestados = 0
+    for i in range(LIBROS):
+        isbn = f"isbn-{i}"
+        quien = servicio.quien_tiene(isbn)
+        prestados += quien is not None
+        if quien != dueno.get(isbn):
+            errores.append(f"{isbn}: catálogo dice {quien}, usuarios dicen {dueno.get(isbn)}")
+
+    esperado = sum(p for p, _ in totales) - sum(d for _, d in totales)
+    if prestados != esperado:
+        errores.append(f"prestados={prestados}, pero préstamos - devoluciones exitosos = {esperado}")
+    return errores
+
+
+def probar(clase, hilos, operaciones):
+    servicio = crear(clase)
+    totales = []
+    detener = threading.Event()
+    busquedas = [0]
+    hilo_busqueda = threading.Thread(target=buscador, args=(servicio, detener, busquedas))
+    trabajadores = [threading.Thread(target=trabajador, args=(servicio, operaciones // hilos, i, totales))
+                    for i in range(hilos)]
+
+    hilo_busqueda.start()
+    inicio = time.perf_counter()
+    for t in trabajadores:
+        t.start()
+    for t in trabajadores:
+        t.join()
+    duracion = time.perf_counter() - inicio
+    detener.set()
+    hilo_busqueda.join()
+
+    errores = verificar(servicio, totales)
+    estado = "OK" if not errores else f"{len(errores)} INVARIANTES ROTOS (p. ej. {errores[0]})"
+    print(f"  {hilos:>2} hilos: {operaciones / duracion:>10.0f} op/s | "
+          f"{busquedas[0]:>5} búsquedas en paralelo | {estado}")
+    return not errores
+
+
+def main():
+    operaciones = int(sys.argv[1]) if len(sys.argv) > 1 else 40_000
+    # Cambios de hilo muy frecuentes para que las carreras aparezcan en pocas operaciones
+    sys.setswitchinterval(1e-5)
+    print(f"Libros: {LIBROS} | Usuarios: {USUARIOS} | Operaciones: {operaciones}")
+
+    print("BibliotecaConcurrente")
+    correcto = all([probar(BibliotecaConcurrente, hilos, operaciones) for hilos in (1, 2, 4, 8)])
+
+    print("BibliotecaServicio sin candados (referencia)")
+    for hilos in (1, 8):
+        probar(BibliotecaServicio, hilos, operaciones)
+
+    sys.exit(0 if correcto else 1)
+
+
+if __name__ == "__main__":
+    main()
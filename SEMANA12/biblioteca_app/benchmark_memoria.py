@@ -0,0 +1,71 @@
+# Benchmark de memoria: bytes por libro del catálogo según la representación.
+# Los textos se generan dentro de la medición, uno nuevo por libro (como al leer
+# un archivo), así se ve cuánto ahorra guardar una sola copia de cada autor y categoría.
+# Uso: python benchmark_memoria.py [cantidad_de_libros]
+
+import sys
+import time
+import tracemalloc
+
+from modelos.libro import Libro
+from servicios.biblioteca_servicio import RegistroCatalogo
+from servicios.catalogo_compacto import CatalogoCompacto
+
+
+class LibroConDict:
+    """Libro antes de __slots__: tupla (autor, título) + categoría + ISBN en __dict__."""
+
+    def __init__(self, autor, titulo, categoria, isbn):
+        self._autor_titulo = (autor, titulo)
+        self._categoria = categoria
+        self._isbn = isbn
+
+    @property
+    def isbn(self):
+        return self._isbn
+
+
+def filas(n):
+    for i in range(n):
+        yield f"Autor {i % 5000}", f"Historia número {i}", f"Categoría {i % 40}", f"978-{i:010d}"
+
+
+def en_dict(clase):
+    def construir(n):
+        catalogo = {}
+        for orden, (autor, titulo, categoria, isbn) in enumerate(filas(n)):
+            catalogo[isbn] = RegistroCatalogo(clase(autor, titulo, categoria, isbn), orden)
+        return catalogo
+    return construir
+
+
+def en_compacto(n):
+    catalogo = CatalogoCompacto()
+    for orden, (autor, titulo, categoria, isbn) in enumerate(filas(n)):
+        catalogo[isbn] = RegistroCatalogo(Libro(autor, titulo, categoria, isbn), orden)
+    return catalogo
+
+
+def medir(nombre, construir, n):
+    inicio = time.perf_counter()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    catalogo = construir(n)
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    segundos = time.perf_counter() - inicio
+    print(f"{nombre:<44} {(despues - antes) / n:>10.1f} {segundos:>8.1f} s")
+    del catalogo
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Libros: {n} (bytes por libro, textos incluidos; tiempo con tracemalloc activo)")
+    print("-" * 65)
+    medir("antes: Libro con __dict__ + RegistroCatalogo", en_dict(LibroConDict), n)
+    medir("Libro con __slots__ e internado", en_dict(Libro), n)
+    medir("CatalogoCompacto (arrays paralelos)", en_compacto, n)
+
+
+if __name__ == "__main__":
+    main()
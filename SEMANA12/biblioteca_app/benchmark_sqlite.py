@@ -0,0 +1,50 @@
+# Benchmark: BibliotecaServicio en memoria contra BibliotecaServicioSQLite.
+# Uso: python benchmark_sqlite.py [cantidad_de_libros]
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from servicios.biblioteca_servicio import BibliotecaServicio
+from servicios.biblioteca_sqlite import BibliotecaServicioSQLite
+
+
+def medir(nombre, funcion, repeticiones=1):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    total = time.perf_counter() - inicio
+    print(f"  {nombre:<30} {total / repeticiones * 1000:>10.3f} ms")
+
+
+def probar(nombre, servicio, libros, usuarios):
+    print(nombre)
+    medir("agregar libros", lambda: [servicio.agregar_libro(*libro) for libro in libros])
+    medir("registrar usuarios", lambda: [servicio.registrar_usuario(*u) for u in usuarios])
+
+    prestamos = [(random.choice(usuarios)[1], libro[3]) for libro in random.sample(libros, len(libros) // 10)]
+    medir("prestar (10% del catálogo)", lambda: [servicio.prestar_libro(*p) for p in prestamos])
+    medir("buscar_por_titulo", lambda: servicio.buscar_por_titulo("historia 12"), 10)
+    medir("buscar_por_autor", lambda: servicio.buscar_por_autor("autor 7"), 10)
+    medir("buscar_por_categoria", lambda: servicio.buscar_por_categoria("cat3"), 10)
+    medir("devolver (10% del catálogo)", lambda: [servicio.devolver_libro(*p) for p in prestamos])
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    libros = [(f"Autor {i % 3000}", f"Historia número {i}", f"Cat{i % 30}", f"isbn-{i}") for i in range(n)]
+    usuarios = [(f"Usuario {i}", f"u{i}") for i in range(max(1, n // 50))]
+    print(f"Libros: {n} | Usuarios: {len(usuarios)}")
+
+    probar("BibliotecaServicio (memoria)", BibliotecaServicio(), libros, usuarios)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        servicio = BibliotecaServicioSQLite(os.path.join(carpeta, "biblioteca.db"))
+        probar("BibliotecaServicioSQLite", servicio, libros, usuarios)
+        servicio.cerrar()
+
+
+if __name__ == "__main__":
+    main()
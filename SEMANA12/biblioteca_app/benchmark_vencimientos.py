@@ -0,0 +1,52 @@
+# Benchmark de AgendaVencimientos: listar los préstamos vencidos y los próximos
+# vencimientos a medida que crece la cantidad de préstamos. Con el montículo
+# solo se miran los k primeros, así que el tiempo depende de k y no del total.
+# Uso: python benchmark_vencimientos.py [prestamos_maximos]
+
+import random
+import sys
+import time
+
+from servicios.biblioteca_servicio import SEGUNDOS_POR_DIA, BibliotecaServicio
+
+K = 20
+
+
+def medir(funcion, repeticiones=50):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+
+def main():
+    maximo = int(sys.argv[1]) if len(sys.argv) > 1 else 400_000
+    azar = random.Random(1)
+    servicio = BibliotecaServicio()
+    servicio._reloj = lambda: 0.0
+    for u in range(1000):
+        servicio.registrar_usuario(f"Usuario {u}", f"u{u}")
+
+    print(f"{'préstamos':>10} {'próximos ' + str(K):>14} {'vencidos (' + str(K) + ')':>16} {'recorrido':>12}")
+    anterior = 0
+    for tamano in (maximo // 8, maximo // 4, maximo // 2, maximo):
+        for i in range(anterior, tamano):
+            servicio.agregar_libro("Autor", f"Título {i}", "Novela", f"isbn-{i}")
+            servicio.prestar_libro(f"u{i % 1000}", f"isbn-{i}", dias=azar.uniform(1, 60))
+        anterior = tamano
+        # Devoluciones intercaladas: dejan entradas obsoletas en el montículo
+        for i in range(0, tamano, 7):
+            servicio.devolver_libro(f"u{i % 1000}", f"isbn-{i}")
+            servicio.prestar_libro(f"u{i % 1000}", f"isbn-{i}", dias=azar.uniform(1, 60))
+
+        # "ahora" tal que haya unos K préstamos vencidos
+        ahora = servicio.proximos_vencimientos(K)[-1][2]
+        proximos = medir(lambda: servicio.proximos_vencimientos(K))
+        vencidos = medir(lambda: servicio.listar_vencidos(ahora))
+        recorrido = medir(lambda: sorted(r.vence for r in servicio._catalogo.values() if r.vence is not None), 3)
+        print(f"{tamano:>10} {proximos:>11.3f} ms {vencidos:>13.3f} ms {recorrido:>9.1f} ms")
+    assert servicio.listar_vencidos(60 * SEGUNDOS_POR_DIA)[0][2] <= ahora
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# Generador de carga para servidor.py: abre varias conexiones, manda peticiones
+# en pipeline (varias sin esperar respuesta) y al final informa peticiones por
+# segundo y latencias p50 / p99.
+# Uso: python cliente_carga.py [--host H] [--puerto P] [--unix RUTA]
+#                              [--conexiones C] [--pipeline N] [--peticiones T]
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import deque
+
+PUERTO = 8765
+
+
+async def conectar(args):
+    if args.unix:
+        return await asyncio.open_unix_connection(args.unix)
+    return await asyncio.open_connection(args.host, args.puerto)
+
+
+def linea(id_peticion, operacion, *argumentos):
+    return (json.dumps({"id": id_peticion, "op": operacion, "args": argumentos}) + "\n").encode("utf-8")
+
+
+async def preparar(args):
+    """Da de alta los libros y usuarios de la prueba (si ya existen, el servidor lo rechaza y listo)."""
+    lector, escritor = await conectar(args)
+    peticiones = [linea(i, "agregar_libro", f"Autor {i % 100}", f"Carga {i}", f"Cat{i % 10}", f"carga-isbn-{i}")
+                  for i in range(args.libros)]
+    peticiones += [linea(i, "registrar_usuario", f"Usuario {i}", f"carga-u{i}") for i in range(args.usuarios)]
+    for p in peticiones:
+        escritor.write(p)
+    await escritor.drain()
+    for _ in peticiones:
+        await lector.readline()
+    escritor.close()
+    await escritor.wait_closed()
+
+
+def peticion_al_azar(azar, id_peticion, args):
+    user_id = f"carga-u{azar.randrange(args.usuarios)}"
+    isbn = f"carga-isbn-{azar.randrange(args.libros)}"
+    tirada = azar.random()
+    if tirada < 0.4:
+        return linea(id_peticion, "prestar_libro", user_id, isbn)
+    if tirada < 0.7:
+        return linea(id_peticion, "devolver_libro", user_id, isbn)
+    if tirada < 0.9:
+        return linea(id_peticion, "buscar_por_titulo", f"carga {azar.randrange(100)}")
+    return linea(id_peticion, "quien_tiene", isbn)
+
+
+async def cliente(args, cantidad, semilla, latencias, errores):
+    azar = random.Random(semilla)
+    lector, escritor = await conectar(args)
+    en_vuelo = asyncio.Semaphore(args.pipeline)
+    enviadas = deque()   # momento de envío; el servidor responde en el mismo orden
+
+    async def enviar():
+        for i in range(cantidad):
+            await en_vuelo.acquire()
+            enviadas.append(time.perf_counter())
+            escritor.write(peticion_al_azar(azar, i, args))
+            await escritor.drain()
+
+    async def recibir():
+        for _ in range(cantidad):
+            respuesta = await lector.readline()
+            latencias.append(time.perf_counter() - enviadas.popleft())
+            en_vuelo.release()
+            if "error" in json.loads(respuesta):
+                errores[0] += 1
+
+    await asyncio.gather(enviar(), recibir())
+    escritor.close()
+    await escritor.wait_closed()
+
+
+def percentil(ordenados, p):
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+async def correr(args):
+    await preparar(args)
+
+    latencias = []
+    errores = [0]
+    por_cliente = args.peticiones // args.conexiones
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(args, por_cliente, i, latencias, errores) for i in range(args.conexiones)))
+    duracion = time.perf_counter() - inicio
+
+    latencias.sort()
+    print(f"Conexiones: {args.conexiones} | Pipeline: {args.pipeline} | Peticiones: {len(latencias)}")
+    print(f"  {len(latencias) / duracion:>10.0f} peticiones/s")
+    print(f"  p50 {percentil(latencias, 50) * 1000:>8.3f} ms | p99 {percentil(latencias, 99) * 1000:>8.3f} ms | "
+          f"máx {latencias[-1] * 1000:>8.3f} ms")
+    print(f"  errores de protocolo: {errores[0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generador de carga para servidor.py.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--unix", help="ruta del socket Unix del servidor")
+    parser.add_argument("--conexiones", type=int, default=16)
+    parser.add_argument("--pipeline", type=int, default=8, help="peticiones sin respuesta por conexión")
+    parser.add_argument("--peticiones", type=int, default=20_000)
+    parser.add_argument("--libros", type=int, default=1000)
+    parser.add_argument("--usuarios", type=int, default=100)
+    asyncio.run(correr(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import json
+import os
+import struct
+from pathlib import Path
+
+# Historial de circulación para estadísticas: archivo binario de solo agregado.
+# - biblioteca.json.hist: un registro de 21 bytes por préstamo o devolución
+#   (tipo, momento, ISBN, usuario, categoría, duración en segundos). Los textos
+#   van como códigos enteros, así cada evento ocupa siempre lo mismo.
+# - biblioteca.json.hist.sym: los textos de esos códigos, uno por línea (en JSON);
+#   el número de línea es el código. Cada texto se escribe una sola vez.
+# resumir() recorre el archivo por bloques y agrupa por libro, usuario o
+# categoría sin cargar todos los eventos en memoria.
+
+PRESTAMO = 1
+DEVOLUCION = 2
+DEVOLUCION_ATRASADA = 3
+
+REGISTRO = struct.Struct("<BIIIII")   # tipo, momento, isbn, usuario, categoria, duracion
+TAM_BLOQUE = REGISTRO.size * 4096
+_CAMPOS = {"isbn": 2, "usuario": 3, "categoria": 4}
+_MAXIMO = 2 ** 32 - 1   # lo más grande que entra en un campo "I"
+
+
+class Historial:
+    def __init__(self, ruta, sincronizar=True):
+        self._ruta = Path(ruta)
+        self._sincronizar = sincronizar   # fsync en cada evento, como el diario
+        self._ruta_simbolos = Path(str(ruta) + ".sym")
+        self._codigos = {}   # texto -> código
+        if self._ruta_simbolos.exists():
+            with self._ruta_simbolos.open("r", encoding="utf-8") as f:
+                for codigo, linea in enumerate(f):
+                    self._codigos[json.loads(linea)] = codigo
+        self._eventos = self._ruta.open("ab")
+        self._simbolos = self._ruta_simbolos.open("a", encoding="utf-8")
+
+    @property
+    def ruta(self):
+        return self._ruta
+
+    def _codigo(self, texto):
+        codigo = self._codigos.get(texto)
+        if codigo is None:
+            codigo = len(self._codigos)
+            self._codigos[texto] = codigo
+            self._simbolos.write(json.dumps(texto, ensure_ascii=False) + "\n")
+            self._simbolos.flush()   # el texto antes que el evento que lo usa
+            if self._sincronizar:
+                os.fsync(self._simbolos.fileno())
+        return codigo
+
+    def _escribir(self, tipo, momento, isbn, user_id, categoria, duracion):
+        # Los servicios ya rechazan fechas fuera de rango; si alguna llega igual se ajusta
+        # a los límites del registro en vez de fallar después de aplicar el préstamo.
+        momento = min(max(int(momento), 0), _MAXIMO)
+        duracion = min(max(int(duracion), 0), _MAXIMO)
+        self._eventos.write(REGISTRO.pack(tipo, momento, self._codigo(isbn), self._codigo(user_id),
+                                          self._codigo(categoria), duracion))
+        self._eventos.flush()
+        if self._sincronizar:
+            os.fsync(self._eventos.fileno())
+
+    def registrar_prestamo(self, momento, isbn, user_id, categoria):
+        self._escribir(PRESTAMO, momento, isbn, user_id, categoria, 0)
+
+    def registrar_devolucion(self, momento, isbn, user_id, categoria, desde, atrasada):
+        self._escribir(DEVOLUCION_ATRASADA if atrasada else DEVOLUCION,
+                       momento, isbn, user_id, categoria, momento - desde)
+
+    def resumir(self, por="categoria", desde=None, hasta=None):
+        self._eventos.flush()
+        return resumir(self._ruta, por, desde, hasta)
+
+    def cerrar(self):
+        self._eventos.close()
+        self._simbolos.close()
+
+
+def eventos(ruta):
+    """Genera las tuplas (tipo, momento, isbn, usuario, categoria, duracion) con códigos."""
+    with open(ruta, "rb") as f:
+        resto = b""
+        while True:
+            bloque = f.read(TAM_BLOQUE)
+            if not bloque:
+                return   # un registro a medio escribir al final se ignora
+            bloque = resto + bloque
+            completos = len(bloque) - len(bloque) % REGISTRO.size
+            yield from REGISTRO.iter_unpack(bloque[:completos])
+            resto = bloque[completos:]
+
+
+def resumir(ruta, por="categoria", desde=None, hasta=None):
+    """
+    Estadísticas de circulación agrupadas por "isbn", "usuario" o "categoria",
+    opcionalmente entre dos momentos (segundos desde 1970). Devuelve
+    {texto: {"prestamos", "devoluciones", "atrasadas", "dias_promedio"}}.
+    """
+    campo = _CAMPOS[por]
+    acumulado = {}   # código -> [préstamos, devoluciones, atrasadas, segundos prestados]
+    if Path(ruta).exists():
+        for evento in eventos(ruta):
+            momento = evento[1]
+            if (desde is not None and momento < desde) or (hasta is not None and momento > hasta):
+                continue
+            fila = acumulado.get(evento[campo])
+            if fila is None:
+                fila = acumulado[evento[campo]] = [0, 0, 0, 0]
+            if evento[0] == PRESTAMO:
+                fila[0] += 1
+            else:
+                fila[1] += 1
+                fila[2] += evento[0] == DEVOLUCION_ATRASADA
+                fila[3] += evento[5]
+
+    # Solo se decodifican los códigos que aparecen en el resultado
+    textos = {}
+    ruta_simbolos = Path(str(ruta) + ".sym")
+    if acumulado and ruta_simbolos.exists():
+        with ruta_simbolos.open("r", encoding="utf-8") as f:
+            for codigo, linea in enumerate(f):
+                if codigo in acumulado:
+                    textos[codigo] = json.loads(linea)
+
+    return {textos.get(codigo, codigo): {
+        "prestamos": prestamos,
+        "devoluciones": devoluciones,
+        "atrasadas": atrasadas,
+        "dias_promedio": segundos / devoluciones / 86400 if devoluciones else 0.0,
+    } for codigo, (prestamos, devoluciones, atrasadas, segundos) in acumulado.items()}
@@ -1,4 +1,7 @@
-from servicios.biblioteca_servicio import BibliotecaServicio
+import sys
+from datetime import datetime
+
+from storage import ARCHIVO, cargar, cerrar
 
 
 def mostrar_menu():
@@ -15,13 +18,27 @@ def mostrar_menu():
     print("10. Listar libros prestados de un usuario")
     print("11. Listar libros disponibles")
     print("12. Listar usuarios registrados")
+    print("13. Búsqueda combinada (título, autor y categoría)")
+    print("14. Préstamos vencidos y próximos vencimientos")
+    print("15. Estadísticas de circulación por categoría")
+    print("16. Reservar libro prestado")
+    print("17. Cancelar reserva")
+    print("18. Listar reservas de un usuario")
     print("0. Salir")
 
 
+def fecha(momento):
+    return datetime.fromtimestamp(momento).strftime("%Y-%m-%d")
+
+
 def main():
-    biblioteca = BibliotecaServicio()
+    # Archivo opcional por línea de comandos: biblioteca.json (memoria + diario) o .db (SQLite)
+    biblioteca = cargar(sys.argv[1] if len(sys.argv) > 1 else ARCHIVO)
 
     while True:
+        # Los libros apartados que nadie retiró a tiempo pasan al siguiente de la cola
+        for isbn, user_id in biblioteca.vencer_apartados():
+            print(f"Venció el plazo de retiro del libro {isbn} apartado para el usuario {user_id}.")
         mostrar_menu()
         opcion = input("Seleccione una opción: ")
 
@@ -54,6 +71,10 @@ def main():
             isbn = input("ISBN del libro a prestar: ")
             exito, mensaje = biblioteca.prestar_libro(user_id, isbn)
             print(mensaje)
+            if not exito and biblioteca.existe_libro(isbn) and \
+                    input("¿Desea reservarlo? (s/n): ").strip().lower() == "s":
+                exito, mensaje = biblioteca.reservar_libro(user_id, isbn)
+                print(mensaje)
 
         elif opcion == "6":
             user_id = input("ID del usuario: ")
@@ -122,8 +143,76 @@ def main():
                 for usuario in usuarios:
                     print("-", usuario)
 
+        elif opcion == "13":
+            print("Deje vacío lo que no quiera filtrar.")
+            titulo = input("Palabras del título: ")
+            autor = input("Autor: ")
+            categoria = input("Categoría: ")
+            pagina = 1
+            while True:
+                resultados = biblioteca.buscar(titulo, autor, categoria, pagina=pagina)
+                if not resultados:
+                    print("No se encontraron libros." if pagina == 1 else "No hay más resultados.")
+                    break
+                print(f"\nResultados (página {pagina}):")
+                for libro, puntaje in resultados:
+                    print(f"- {libro}  [{puntaje:.2f}]")
+                if input("Ver la página siguiente? (s/n): ").strip().lower() != "s":
+                    break
+                pagina += 1
+
+        elif opcion == "14":
+            vencidos = biblioteca.listar_vencidos()
+            if not vencidos:
+                print("No hay préstamos vencidos.")
+            else:
+                print("\nPréstamos vencidos:")
+                for libro, user_id, vence in vencidos:
+                    print(f"- {libro}  [usuario {user_id}, venció el {fecha(vence)}]")
+            proximos = biblioteca.proximos_vencimientos(10 + len(vencidos))[len(vencidos):]
+            if proximos:
+                print("\nPróximos vencimientos:")
+                for libro, user_id, vence in proximos:
+                    print(f"- {libro}  [usuario {user_id}, vence el {fecha(vence)}]")
+
+        elif opcion == "15":
+            estadisticas = biblioteca.estadisticas_circulacion("categoria")
+            if not estadisticas:
+                print("Todavía no hay préstamos registrados.")
+            else:
+                print("\nCirculación por categoría:")
+                for categoria, datos in sorted(estadisticas.items(), key=lambda t: -t[1]["prestamos"]):
+                    print(f"- {categoria}: {datos['prestamos']} préstamos, {datos['devoluciones']} devoluciones "
+                          f"({datos['atrasadas']} con atraso), {datos['dias_promedio']:.1f} días en promedio")
+
+        elif opcion == "16":
+            user_id = input("ID del usuario: ")
+            isbn = input("ISBN del libro a reservar: ")
+            exito, mensaje = biblioteca.reservar_libro(user_id, isbn)
+            print(mensaje)
+
+        elif opcion == "17":
+            user_id = input("ID del usuario: ")
+            isbn = input("ISBN del libro reservado: ")
+            exito, mensaje = biblioteca.cancelar_reserva(user_id, isbn)
+            print(mensaje)
+
+        elif opcion == "18":
+            user_id = input("ID del usuario: ")
+            reservas = biblioteca.listar_reservas_usuario(user_id)
+            if reservas is None:
+                print("El usuario no existe.")
+            elif not reservas:
+                print("El usuario no tiene reservas.")
+            else:
+                print("\nReservas:")
+                for libro, posicion in reservas:
+                    estado = "apartado, puede retirarlo" if posicion == 0 else f"posición {posicion} en la cola"
+                    print(f"- {libro}  [{estado}]")
+
         elif opcion == "0":
-            print("Saliendo del sistema...")
+            cerrar(biblioteca)
+            print("Datos guardados. Saliendo del sistema...")
             break
 
         else:
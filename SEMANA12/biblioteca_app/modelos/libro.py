@@ -1,22 +1,36 @@
+from modelos.simbolos import SIMBOLOS
+
+
 class Libro:
     """
     Representa un libro dentro del sistema de biblioteca.
-    Se utiliza una tupla para almacenar autor y título,
-    ya que estos datos no deben cambiar una vez creado el objeto.
+    Es inmutable: los datos no deben cambiar una vez creado el objeto.
+    Usa __slots__ (sin __dict__ por instancia) y el autor y la categoría pasan
+    por la tabla de símbolos compartida, así miles de libros de la misma
+    categoría apuntan a un único texto en memoria.
     """
 
+    __slots__ = ("_autor", "_titulo", "_categoria", "_isbn")
+
     def __init__(self, autor: str, titulo: str, categoria: str, isbn: str):
-        self._autor_titulo = (autor, titulo)  # Tupla inmutable
-        self._categoria = categoria
-        self._isbn = isbn
+        object.__setattr__(self, "_autor", SIMBOLOS.interno(autor))
+        object.__setattr__(self, "_titulo", titulo)
+        object.__setattr__(self, "_categoria", SIMBOLOS.interno(categoria))
+        object.__setattr__(self, "_isbn", isbn)
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("Libro es inmutable.")
+
+    def __delattr__(self, nombre):
+        raise AttributeError("Libro es inmutable.")
 
     @property
     def autor(self):
-        return self._autor_titulo[0]
+        return self._autor
 
     @property
     def titulo(self):
-        return self._autor_titulo[1]
+        return self._titulo
 
     @property
     def categoria(self):
@@ -26,5 +40,17 @@ class Libro:
     def isbn(self):
         return self._isbn
 
+    def _datos(self):
+        return (self._autor, self._titulo, self._categoria, self._isbn)
+
+    def __eq__(self, otro):
+        # Por valor: el catálogo compacto crea un Libro nuevo en cada consulta
+        if not isinstance(otro, Libro):
+            return NotImplemented
+        return self._datos() == otro._datos()
+
+    def __hash__(self):
+        return hash(self._datos())
+
     def __str__(self):
-        return f"'{self.titulo}' - {self.autor} | Categoría: {self.categoria} | ISBN: {self.isbn}"
\ No newline at end of file
+        return f"'{self.titulo}' - {self.autor} | Categoría: {self.categoria} | ISBN: {self.isbn}"
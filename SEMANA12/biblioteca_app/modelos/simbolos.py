@@ -0,0 +1,33 @@
+class TablaSimbolos:
+    """
+    Tabla de símbolos compartida para textos que se repiten mucho (autores,
+    categorías). Cada texto distinto se guarda una sola vez y recibe un código
+    entero; los libros guardan la copia única o, en el catálogo compacto, solo
+    el código.
+    """
+
+    def __init__(self):
+        self._codigos = {}   # texto -> código
+        self._textos = []    # código -> texto
+
+    def codigo(self, texto):
+        codigo = self._codigos.get(texto)
+        if codigo is None:
+            codigo = len(self._textos)
+            self._codigos[texto] = codigo
+            self._textos.append(texto)
+        return codigo
+
+    def texto(self, codigo):
+        return self._textos[codigo]
+
+    def interno(self, texto):
+        """Devuelve la copia única del texto (la misma instancia para textos iguales)."""
+        return self._textos[self.codigo(texto)]
+
+    def __len__(self):
+        return len(self._textos)
+
+
+# Tabla única para todo el programa: Libro y CatalogoCompacto usan los mismos códigos
+SIMBOLOS = TablaSimbolos()
@@ -1,14 +1,14 @@
 class Usuario:
     """
     Representa un usuario registrado en la biblioteca.
-    Se utiliza una lista para almacenar los libros prestados,
-    porque esta colección cambia dinámicamente.
+    Los libros prestados se guardan en un diccionario ISBN -> Libro
+    (mantiene el orden de préstamo y permite devolver en tiempo constante).
     """
 
     def __init__(self, nombre: str, user_id: str):
         self._nombre = nombre
         self._user_id = user_id
-        self._libros_prestados = []  # Lista dinámica
+        self._libros_prestados = {}  # ISBN -> Libro
 
     @property
     def nombre(self):
@@ -20,17 +20,17 @@ class Usuario:
 
     @property
     def libros_prestados(self):
-        return self._libros_prestados
+        # Vista de solo lectura (se actualiza sola, pero no se puede modificar desde afuera)
+        return self._libros_prestados.values()
+
+    def tiene_libro(self, isbn):
+        return isbn in self._libros_prestados
 
     def prestar_libro(self, libro):
-        self._libros_prestados.append(libro)
+        self._libros_prestados[libro.isbn] = libro
 
     def devolver_libro(self, isbn):
-        for libro in self._libros_prestados:
-            if libro.isbn == isbn:
-                self._libros_prestados.remove(libro)
-                return libro
-        return None
+        return self._libros_prestados.pop(isbn, None)
 
     def __str__(self):
         return f"{self.nombre} (ID: {self.user_id})"
\ No newline at end of file
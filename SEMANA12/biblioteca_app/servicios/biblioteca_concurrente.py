@@ -0,0 +1,250 @@
+import threading
+from contextlib import contextmanager
+
+from servicios.biblioteca_servicio import DIAS_PRESTAMO, BibliotecaServicio
+
+FRANJAS = 64   # cantidad de candados repartidos entre ISBN e IDs de usuario
+
+
+class BibliotecaConcurrente(BibliotecaServicio):
+    """
+    BibliotecaServicio que se puede compartir entre varios hilos (terminales
+    de mostrador, autopréstamo, servidor).
+
+    En vez de un candado global se usan candados por franjas: cada ISBN y cada
+    user_id cae en una de FRANJAS franjas según su hash. Prestar o devolver toma
+    solo las franjas del usuario y del libro (siempre en orden creciente, así
+    dos operaciones nunca se esperan en círculo), por lo que operaciones sobre
+    libros y usuarios distintos avanzan en paralelo y la verificación + cambio
+    de cada préstamo es atómica.
+
+    Orden de los candados: franjas -> catálogo / usuarios / circulación -> diario.
+    - _candado_catalogo protege la estructura del catálogo y los índices de
+      búsqueda (altas, bajas y búsquedas). Prestar y devolver no lo toman, así
+      que las búsquedas no esperan a los préstamos ni al revés.
+    - _candado_usuarios protege la estructura del diccionario de usuarios.
+    - _candado_circulacion protege la agenda de vencimientos, las reservas y
+      el historial, que comparten todos los préstamos. Se puede tomar con
+      _candado_usuarios ya tomado (baja de un usuario con reservas), nunca al revés.
+    - _candado_diario ordena las escrituras en el diario de cambios.
+    """
+
+    def __init__(self, catalogo=None, franjas=FRANJAS):
+        super().__init__(catalogo)
+        # RLock: la compactación toma todas las franjas y luego exportar_estado las vuelve a pedir
+        self._franjas = [threading.RLock() for _ in range(franjas)]
+        self._candado_catalogo = threading.Lock()
+        self._candado_usuarios = threading.Lock()
+        self._candado_circulacion = threading.Lock()
+        self._candado_diario = threading.Lock()
+
+    # =========================
+    # Candados
+    # =========================
+
+    @contextmanager
+    def _bloqueando(self, *claves):
+        """Toma las franjas de las claves dadas (sin repetir y en orden creciente)."""
+        indices = sorted({hash(clave) % len(self._franjas) for clave in claves})
+        for i in indices:
+            self._franjas[i].acquire()
+        try:
+            yield
+        finally:
+            for i in reversed(indices):
+                self._franjas[i].release()
+
+    @contextmanager
+    def _bloqueando_todo(self):
+        """Toma todas las franjas: ninguna operación de escritura queda a medias."""
+        for candado in self._franjas:
+            candado.acquire()
+        try:
+            yield
+        finally:
+            for candado in reversed(self._franjas):
+                candado.release()
+
+    # =========================
+    # Persistencia
+    # =========================
+
+    def _registrar(self, *registro):
+        # Se llama con las franjas de la operación tomadas, así que el diario
+        # guarda las operaciones sobre un mismo libro o usuario en el orden real.
+        # La compactación se deja para después de soltar las franjas.
+        if self._diario is not None:
+            with self._candado_diario:
+                self._diario.escribir(list(registro))
+
+    def _compactar_si_hace_falta(self):
+        diario = self._diario
+        if diario is None or not diario.excede_limite():
+            return
+        with self._bloqueando_todo(), self._candado_diario:
+            if diario.excede_limite():   # otro hilo pudo compactar mientras esperábamos
+                diario.compactar()
+
+    def exportar_estado(self):
+        with self._bloqueando_todo():
+            return super().exportar_estado()
+
+    # =========================
+    # Gestión de libros
+    # =========================
+
+    def agregar_libro(self, autor, titulo, categoria, isbn):
+        with self._bloqueando(isbn), self._candado_catalogo:
+            resultado = super().agregar_libro(autor, titulo, categoria, isbn)
+        self._compactar_si_hace_falta()
+        return resultado
+
+    def quitar_libro(self, isbn):
+        with self._bloqueando(isbn), self._candado_catalogo:
+            resultado = super().quitar_libro(isbn)
+        self._compactar_si_hace_falta()
+        return resultado
+
+    def listar_libros_disponibles(self):
+        with self._candado_catalogo:
+            return super().listar_libros_disponibles()
+
+    # =========================
+    # Gestión de usuarios
+    # =========================
+
+    def registrar_usuario(self, nombre, user_id):
+        with self._bloqueando(user_id), self._candado_usuarios:
+            resultado = super().registrar_usuario(nombre, user_id)
+        self._compactar_si_hace_falta()
+        return resultado
+
+    def dar_baja_usuario(self, user_id, ahora=None):
+        with self._bloqueando(user_id), self._candado_usuarios:
+            resultado = super().dar_baja_usuario(user_id, ahora)
+        self._compactar_si_hace_falta()
+        return resultado
+
+    def listar_usuarios(self):
+        with self._candado_usuarios:
+            return super().listar_usuarios()
+
+    # =========================
+    # Préstamos y devoluciones
+    # =========================
+
+    # Con las franjas del usuario y del libro tomadas nadie puede prestar ese
+    # libro, quitarlo del catálogo ni dar de baja al usuario en el medio.
+
+    def _aplicar_prestamo(self, user_id, isbn, desde, vence):
+        with self._candado_circulacion:
+            super()._aplicar_prestamo(user_id, isbn, desde, vence)
+
+    def _aplicar_devolucion(self, user_id, isbn, ahora):
+        with self._candado_circulacion:
+            return super()._aplicar_devolucion(user_id, isbn, ahora)
+
+    def prestar_libro(self, user_id, isbn, dias=DIAS_PRESTAMO, desde=None):
+        with self._bloqueando(user_id, isbn):
+            resultado = super().prestar_libro(user_id, isbn, dias, desde)
+        self._compactar_si_hace_falta()
+        return resultado
+
+    def devolver_libro(self, user_id, isbn, ahora=None):
+        with self._bloqueando(user_id, isbn):
+            resultado = super().devolver_libro(user_id, isbn, ahora)
+        self._compactar_si_hace_falta()
+        return resultado
+
+    def prestar_lote(self, pares, atomico=True, dias=DIAS_PRESTAMO, desde=None):
+        # Se toman a la vez las franjas de todos los usuarios y libros del lote
+        pares = [(user_id, isbn) for user_id, isbn in pares]
+        with self._bloqueando(*(clave for par in pares for clave in par)):
+            resultado = super().prestar_lote(pares, atomico, dias, desde)
+        self._compactar_si_hace_falta()
+        return resultado
+
+    def devolver_lote(self, pares, atomico=True, ahora=None):
+        pares = [(user_id, isbn) for user_id, isbn in pares]
+        with self._bloqueando(*(clave for par in pares for clave in par)):
+            resultado = super().devolver_lote(pares, atomico, ahora)
+        self._compactar_si_hace_falta()
+        return resultado
+
+    def listar_libros_prestados_usuario(self, user_id):
+        # Copia en lista: la vista del usuario cambiaría mientras otro hilo la recorre
+        with self._bloqueando(user_id):
+            libros = super().listar_libros_prestados_usuario(user_id)
+            return None if libros is None else list(libros)
+
+    # =========================
+    # Reservas
+    # =========================
+
+    # Reservar y cancelar toman las franjas del usuario y del libro, como prestar;
+    # la estructura compartida de las reservas se toca con _candado_circulacion.
+    # Un apartado solo cambia de dueño con la franja del libro tomada (devolución,
+    # cancelación) o al soltarlo, que no le quita el libro a nadie que ya lo validó.
+
+    def reservar_libro(self, user_id, isbn):
+        with self._bloqueando(user_id, isbn), self._candado_circulacion:
+            resultado = super().reservar_libro(user_id, isbn)
+        self._compactar_si_hace_falta()
+        return resultado
+
+    def cancelar_reserva(self, user_id, isbn, ahora=None):
+        with self._bloqueando(user_id, isbn), self._candado_circulacion:
+            resultado = super().cancelar_reserva(user_id, isbn, ahora)
+        self._compactar_si_hace_falta()
+        return resultado
+
+    def _cancelar_reservas_usuario(self, user_id, ahora):
+        with self._candado_circulacion:
+            super()._cancelar_reservas_usuario(user_id, ahora)
+
+    def posicion_reserva(self, user_id, isbn):
+        with self._candado_circulacion:
+            return super().posicion_reserva(user_id, isbn)
+
+    def listar_reservas_usuario(self, user_id):
+        with self._bloqueando(user_id), self._candado_circulacion:
+            return super().listar_reservas_usuario(user_id)
+
+    def vencer_apartados(self, ahora=None):
+        # Le quita el libro a quien lo tenía apartado: nadie puede estar prestándolo a la vez
+        with self._bloqueando_todo(), self._candado_circulacion:
+            resultado = super().vencer_apartados(ahora)
+        self._compactar_si_hace_falta()
+        return resultado
+
+    def listar_vencidos(self, ahora=None):
+        with self._candado_circulacion:
+            return super().listar_vencidos(ahora)
+
+    def proximos_vencimientos(self, n=10):
+        with self._candado_circulacion:
+            return super().proximos_vencimientos(n)
+
+    def estadisticas_circulacion(self, por="categoria", desde=None, hasta=None):
+        with self._candado_circulacion:
+            return super().estadisticas_circulacion(por, desde, hasta)
+
+    # =========================
+    # Búsquedas
+    # =========================
+
+    def buscar_por_titulo(self, titulo):
+        with self._candado_catalogo:
+            return super().buscar_por_titulo(titulo)
+
+    def buscar_por_autor(self, autor):
+        with self._candado_catalogo:
+            return super().buscar_por_autor(autor)
+
+    def buscar_por_categoria(self, categoria):
+        with self._candado_catalogo:
+            return super().buscar_por_categoria(categoria)
+
+    def buscar(self, titulo="", autor="", categoria="", pagina=1, por_pagina=10):
+        with self._candado_catalogo:
+            return super().buscar(titulo, autor, categoria, pagina, por_pagina)
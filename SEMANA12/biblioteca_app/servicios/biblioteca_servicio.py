@@ -1,5 +1,74 @@
+import time
+from collections import Counter
+
 from modelos.libro import Libro
 from modelos.usuario import Usuario
+from servicios.indice_texto import IndiceTexto
+from servicios.motor_busqueda import MotorBusqueda
+from servicios.reservas import Reservas
+from servicios.vencimientos import AgendaVencimientos
+
+DIAS_PRESTAMO = 14
+DIAS_RETIRO = 3   # plazo para retirar un libro reservado una vez devuelto
+SEGUNDOS_POR_DIA = 86400
+
+MENSAJE_REPETIDO = "El ISBN aparece más de una vez en el lote."
+MENSAJE_SIN_APLICAR = "No se aplicó: otro elemento del lote tiene errores."
+MENSAJE_MOMENTO = "La fecha está fuera de rango."
+MOMENTO_MAXIMO = 2 ** 32 - 1   # el historial guarda los momentos en 32 bits sin signo
+
+
+def momento_valido(momento):
+    """True si el momento (segundos desde 1970) es un número entre 0 y MOMENTO_MAXIMO."""
+    try:
+        return 0 <= momento <= MOMENTO_MAXIMO   # NaN da False
+    except TypeError:
+        return False
+
+
+def revisar_lote(pares, motivo_rechazo):
+    """
+    Validación en una pasada para prestar_lote / devolver_lote. Devuelve, para cada
+    par (user_id, isbn), el motivo de rechazo o None si se puede aplicar. Un ISBN
+    repetido dentro del lote se rechaza en todas sus apariciones (no hay forma de
+    saber cuál de los pedidos es el correcto).
+    """
+    veces = Counter(isbn for _, isbn in pares)
+    return [MENSAJE_REPETIDO if veces[isbn] > 1 else motivo_rechazo(user_id, isbn)
+            for user_id, isbn in pares]
+
+
+def resultados_lote(motivos, atomico, mensaje_exito):
+    """
+    Arma la respuesta de un lote: (exito, [(bool, mensaje) por par, en el mismo orden]).
+    exito es True solo si se aplicaron todos los pares.
+    """
+    hay_errores = any(motivo is not None for motivo in motivos)
+    if atomico and hay_errores:
+        return False, [(False, motivo or MENSAJE_SIN_APLICAR) for motivo in motivos]
+    return not hay_errores, [(False, motivo) if motivo else (True, mensaje_exito) for motivo in motivos]
+
+
+def rechazar_lote(pares, atomico, motivo):
+    """Respuesta de un lote que no se puede aplicar por completo (por ejemplo, una fecha inválida)."""
+    return resultados_lote([motivo for _ in pares], atomico, None)
+
+
+class RegistroCatalogo:
+    """
+    Entrada del catálogo: el libro, su orden de alta, quién lo tiene prestado
+    (None si está disponible) y desde cuándo y hasta cuándo (segundos desde 1970).
+    Prestar o devolver solo cambia `prestado_a`, `desde` y `vence`.
+    """
+
+    __slots__ = ("libro", "orden", "prestado_a", "desde", "vence")
+
+    def __init__(self, libro, orden):
+        self.libro = libro
+        self.orden = orden
+        self.prestado_a = None
+        self.desde = None
+        self.vence = None
 
 
 class BibliotecaServicio:
@@ -8,9 +77,13 @@ class BibliotecaServicio:
     Aquí se administran los libros, los usuarios y los préstamos.
     """
 
-    def __init__(self):
-        # Diccionario para libros disponibles: ISBN -> Libro
-        self._libros_disponibles = {}
+    def __init__(self, catalogo=None):
+        # Catálogo único: ISBN -> RegistroCatalogo (libro + estado del préstamo).
+        # Para catálogos muy grandes se puede pasar un CatalogoCompacto.
+        self._catalogo = {} if catalogo is None else catalogo
+
+        # Índice de préstamos: user_id -> conjunto de ISBN prestados
+        self._prestamos = {}
 
         # Diccionario para usuarios registrados: user_id -> Usuario
         self._usuarios = {}
@@ -18,27 +91,175 @@ class BibliotecaServicio:
         # Conjunto para garantizar IDs únicos
         self._ids_usuarios = set()
 
+        # Índices de búsqueda: ISBN de todos los libros (disponibles y prestados)
+        self._indice_titulos = IndiceTexto()
+        self._indice_autores = IndiceTexto()
+        self._indice_categorias = {}   # categoría en minúsculas -> conjunto de ISBN
+        self._motor = MotorBusqueda()  # búsqueda combinada con relevancia (buscar)
+        self._indices_listos = True    # False tras una carga masiva: se arman en la primera búsqueda
+        self._contador_libros = 0
+
+        # Préstamos por fecha de vencimiento (vencidos y próximos a vencer)
+        self._agenda = AgendaVencimientos()
+
+        # Colas de reservas por ISBN y libros apartados para quien sigue en la cola
+        self._reservas = Reservas()
+
+        # Diario de cambios (lo asigna storage.cargar); None = solo memoria
+        self._diario = None
+
+        # Historial de circulación para estadísticas (ver historial.py); None = sin historial
+        self._historial = None
+
+        # Fuente de la hora actual (se puede reemplazar en pruebas)
+        self._reloj = time.time
+
+    # =========================
+    # Persistencia
+    # =========================
+
+    @property
+    def diario(self):
+        return self._diario
+
+    def usar_diario(self, diario):
+        self._diario = diario
+
+    def _registrar(self, *registro):
+        if self._diario is not None:
+            self._diario.registrar(list(registro))
+
+    @property
+    def historial(self):
+        return self._historial
+
+    def usar_historial(self, historial):
+        self._historial = historial
+
+    def cargar_estado(self, libros, usuarios, reservas=()):
+        """
+        Carga masiva desde una copia guardada (ver storage.py), sin validar ni
+        registrar en el diario. libros: (autor, titulo, categoria, isbn, prestado_a,
+        desde, vence); usuarios: (nombre, user_id); reservas: como las devuelve
+        Reservas.exportar. Los índices de búsqueda se arman
+        recién en la primera búsqueda, así la carga no paga ese costo.
+        Las copias viejas no traen fechas: esos préstamos vencen en DIAS_PRESTAMO desde hoy.
+        """
+        for nombre, user_id in usuarios:
+            self._usuarios[user_id] = Usuario(nombre, user_id)
+            self._ids_usuarios.add(user_id)
+
+        vencimientos = []
+        ahora = self._reloj()
+        for autor, titulo, categoria, isbn, prestado_a, *fechas in libros:
+            libro = Libro(autor, titulo, categoria, isbn)
+            registro = RegistroCatalogo(libro, self._contador_libros)
+            self._contador_libros += 1
+            if prestado_a is not None:
+                desde, vence = fechas if fechas else (ahora, ahora + DIAS_PRESTAMO * SEGUNDOS_POR_DIA)
+                registro.prestado_a = prestado_a
+                registro.desde = desde
+                registro.vence = vence
+                self._prestamos.setdefault(prestado_a, set()).add(isbn)
+                self._usuarios[prestado_a].prestar_libro(libro)
+                vencimientos.append((isbn, vence))
+            # Al final: un CatalogoCompacto copia el registro al guardarlo
+            self._catalogo[isbn] = registro
+
+        self._agenda.programar_varios(vencimientos)
+        self._reservas.importar(reservas)
+        self._indices_listos = False
+
+    def exportar_estado(self):
+        """Inverso de cargar_estado: (libros, usuarios, reservas) listos para guardar."""
+        libros = [(r.libro.autor, r.libro.titulo, r.libro.categoria, r.libro.isbn,
+                   r.prestado_a, r.desde, r.vence)
+                  for r in self._catalogo.values()]
+        usuarios = [(u.nombre, u.user_id) for u in self._usuarios.values()]
+        return libros, usuarios, self._reservas.exportar()
+
     # =========================
     # Gestión de libros
     # =========================
 
     def agregar_libro(self, autor, titulo, categoria, isbn):
-        if isbn in self._libros_disponibles:
+        registro = self._catalogo.get(isbn)
+        if registro is not None:
+            if registro.prestado_a is not None:
+                return False, "Ya existe un libro con ese ISBN (actualmente prestado)."
             return False, "Ya existe un libro con ese ISBN."
 
         libro = Libro(autor, titulo, categoria, isbn)
-        self._libros_disponibles[isbn] = libro
+        self._catalogo[isbn] = RegistroCatalogo(libro, self._contador_libros)
+        self._contador_libros += 1
+        self._indexar_libro(libro)
+        self._registrar("agregar_libro", autor, titulo, categoria, isbn)
         return True, "Libro agregado correctamente."
 
     def quitar_libro(self, isbn):
-        if isbn not in self._libros_disponibles:
-            return False, "No existe un libro disponible con ese ISBN."
-
-        del self._libros_disponibles[isbn]
+        registro = self._catalogo.get(isbn)
+        if registro is None:
+            return False, "No existe un libro con ese ISBN."
+        if registro.prestado_a is not None:
+            return False, "No se puede quitar un libro que está prestado."
+        if self._reservas.tiene_reservas(isbn):
+            return False, "No se puede quitar un libro con reservas pendientes."
+
+        self._desindexar_libro(registro.libro)   # antes de borrar (CatalogoCompacto libera la fila)
+        del self._catalogo[isbn]
+        self._registrar("quitar_libro", isbn)
         return True, "Libro quitado correctamente."
 
+    def _asegurar_indices(self):
+        if self._indices_listos:
+            return
+        self._indices_listos = True
+        libros = [registro.libro for registro in self._catalogo.values()]
+        for libro in libros:
+            self._indexar_subcadenas(libro)
+        # El motor se arma de una vez: insertar de a un libro es cuadrático en palabras comunes
+        self._motor.agregar_varios(libros)
+
+    def _indexar_subcadenas(self, libro):
+        # Índices de buscar_por_*: subcadenas de título y autor, categoría exacta
+        self._indice_titulos.agregar(libro.isbn, libro.titulo)
+        self._indice_autores.agregar(libro.isbn, libro.autor)
+        self._indice_categorias.setdefault(libro.categoria.lower(), set()).add(libro.isbn)
+
+    def _indexar_libro(self, libro):
+        if not self._indices_listos:
+            return
+        self._indexar_subcadenas(libro)
+        self._motor.agregar(libro)
+
+    def _desindexar_libro(self, libro):
+        if not self._indices_listos:
+            return
+        self._indice_titulos.quitar(libro.isbn)
+        self._indice_autores.quitar(libro.isbn)
+        self._motor.quitar(libro.isbn)
+        isbns = self._indice_categorias.get(libro.categoria.lower())
+        if isbns is not None:
+            isbns.discard(libro.isbn)
+            if not isbns:
+                del self._indice_categorias[libro.categoria.lower()]
+
+    def _en_orden(self, isbns):
+        registros = sorted((self._catalogo[isbn] for isbn in isbns), key=lambda r: r.orden)
+        return [r.libro for r in registros]
+
+    def existe_libro(self, isbn):
+        return isbn in self._catalogo
+
+    def quien_tiene(self, isbn):
+        """user_id de quien tiene prestado el libro, o None si está disponible o no existe."""
+        registro = self._catalogo.get(isbn)
+        return None if registro is None else registro.prestado_a
+
     def listar_libros_disponibles(self):
-        return list(self._libros_disponibles.values())
+        # Los apartados para quien los reservó no están disponibles para los demás
+        return [r.libro for r in self._catalogo.values()
+                if r.prestado_a is None and not self._reservas.tiene_reservas(r.libro.isbn)]
 
     # =========================
     # Gestión de usuarios
@@ -51,19 +272,23 @@ class BibliotecaServicio:
         usuario = Usuario(nombre, user_id)
         self._usuarios[user_id] = usuario
         self._ids_usuarios.add(user_id)
+        self._registrar("registrar_usuario", nombre, user_id)
         return True, "Usuario registrado correctamente."
 
-    def dar_baja_usuario(self, user_id):
+    def dar_baja_usuario(self, user_id, ahora=None):
+        """Sus reservas se cancelan; lo que tenía apartado pasa al siguiente de cada cola."""
         if user_id not in self._usuarios:
             return False, "El usuario no existe."
 
-        usuario = self._usuarios[user_id]
-
-        if usuario.libros_prestados:
+        if self._prestamos.get(user_id):
             return False, "No se puede dar de baja a un usuario con libros prestados."
 
+        ahora = self._reloj() if ahora is None else ahora
         del self._usuarios[user_id]
+        self._prestamos.pop(user_id, None)
         self._ids_usuarios.remove(user_id)
+        self._cancelar_reservas_usuario(user_id, ahora)
+        self._registrar("dar_baja_usuario", user_id, ahora)
         return True, "Usuario dado de baja correctamente."
 
     def listar_usuarios(self):
@@ -73,34 +298,119 @@ class BibliotecaServicio:
     # Préstamos y devoluciones
     # =========================
 
-    def prestar_libro(self, user_id, isbn):
+    def _motivo_no_prestar(self, user_id, isbn):
         if user_id not in self._usuarios:
-            return False, "El usuario no existe."
-
-        if isbn not in self._libros_disponibles:
-            return False, "El libro no está disponible."
-
-        usuario = self._usuarios[user_id]
-        libro = self._libros_disponibles[isbn]
-
-        usuario.prestar_libro(libro)
-        del self._libros_disponibles[isbn]
-
-        return True, "Libro prestado correctamente."
-
-    def devolver_libro(self, user_id, isbn):
+            return "El usuario no existe."
+        registro = self._catalogo.get(isbn)
+        if registro is None or registro.prestado_a is not None:
+            return "El libro no está disponible."
+        apartado_para = self._reservas.apartado_para(isbn)
+        if apartado_para is not None and apartado_para != user_id:
+            return "El libro está apartado para otro usuario."
+        return None
+
+    def _motivo_no_devolver(self, user_id, isbn):
         if user_id not in self._usuarios:
-            return False, "El usuario no existe."
-
-        usuario = self._usuarios[user_id]
-        libro = usuario.devolver_libro(isbn)
-
-        if libro is None:
-            return False, "El usuario no tiene prestado ese libro."
+            return "El usuario no existe."
+        registro = self._catalogo.get(isbn)
+        if registro is None or registro.prestado_a != user_id:
+            return "El usuario no tiene prestado ese libro."
+        return None
+
+    def _aplicar_prestamo(self, user_id, isbn, desde, vence):
+        registro = self._catalogo[isbn]
+        registro.prestado_a = user_id
+        registro.desde = desde
+        registro.vence = vence
+        self._prestamos.setdefault(user_id, set()).add(isbn)
+        self._usuarios[user_id].prestar_libro(registro.libro)
+        self._agenda.programar(isbn, vence)
+        if self._reservas.apartado_para(isbn) == user_id:
+            self._reservas.retirar(user_id, isbn)
+        if self._historial is not None:
+            self._historial.registrar_prestamo(desde, isbn, user_id, registro.libro.categoria)
+
+    def _aplicar_devolucion(self, user_id, isbn, ahora):
+        """Devuelve el libro; si alguien lo reservó queda apartado para el primero de la cola."""
+        registro = self._catalogo[isbn]
+        if self._historial is not None:
+            self._historial.registrar_devolucion(ahora, isbn, user_id, registro.libro.categoria,
+                                                 registro.desde, ahora > registro.vence)
+        registro.prestado_a = None
+        registro.desde = None
+        registro.vence = None
+        self._prestamos[user_id].discard(isbn)
+        self._usuarios[user_id].devolver_libro(isbn)
+        self._agenda.cancelar(isbn)
+        return self._reservas.apartar_siguiente(isbn, ahora, DIAS_RETIRO * SEGUNDOS_POR_DIA)
+
+    def _plazo(self, dias, desde):
+        desde = self._reloj() if desde is None else desde
+        return desde, desde + dias * SEGUNDOS_POR_DIA
+
+    def prestar_libro(self, user_id, isbn, dias=DIAS_PRESTAMO, desde=None):
+        """Presta el libro por `dias` días a partir de `desde` (por defecto, ahora)."""
+        motivo = self._motivo_no_prestar(user_id, isbn)
+        if motivo:
+            return False, motivo
+
+        desde, vence = self._plazo(dias, desde)
+        if not momento_valido(desde):
+            return False, MENSAJE_MOMENTO
+        self._aplicar_prestamo(user_id, isbn, desde, vence)
+        # El diario guarda el momento del préstamo: al reproducirlo, el vencimiento es el mismo
+        self._registrar("prestar_libro", user_id, isbn, dias, desde)
+        return True, "Libro prestado correctamente."
 
-        self._libros_disponibles[isbn] = libro
+    def devolver_libro(self, user_id, isbn, ahora=None):
+        motivo = self._motivo_no_devolver(user_id, isbn)
+        if motivo:
+            return False, motivo
+
+        ahora = self._reloj() if ahora is None else ahora
+        if not momento_valido(ahora):
+            return False, MENSAJE_MOMENTO
+        siguiente = self._aplicar_devolucion(user_id, isbn, ahora)
+        self._registrar("devolver_libro", user_id, isbn, ahora)
+        if siguiente is not None:
+            return True, f"Libro devuelto correctamente. Queda apartado para el usuario {siguiente}."
         return True, "Libro devuelto correctamente."
 
+    def prestar_lote(self, pares, atomico=True, dias=DIAS_PRESTAMO, desde=None):
+        """
+        Presta muchos libros de una vez. pares: iterable de (user_id, isbn).
+        Se validan todos antes de tocar nada; con atomico=True basta un par
+        inválido para que no se preste ninguno, con atomico=False se prestan
+        los válidos. El diario recibe un solo registro con los pares aplicados.
+        Todos los préstamos del lote vencen al mismo tiempo.
+        Devuelve (exito, resultados), ver resultados_lote.
+        """
+        desde, vence = self._plazo(dias, desde)
+        if not momento_valido(desde):
+            return rechazar_lote(pares, atomico, MENSAJE_MOMENTO)
+        return self._aplicar_lote(pares, atomico, self._motivo_no_prestar,
+                                  lambda user_id, isbn: self._aplicar_prestamo(user_id, isbn, desde, vence),
+                                  "prestar_lote", "Libro prestado correctamente.", (True, dias, desde))
+
+    def devolver_lote(self, pares, atomico=True, ahora=None):
+        """Igual que prestar_lote, pero devolviendo los libros."""
+        ahora = self._reloj() if ahora is None else ahora
+        if not momento_valido(ahora):
+            return rechazar_lote(pares, atomico, MENSAJE_MOMENTO)
+        return self._aplicar_lote(pares, atomico, self._motivo_no_devolver,
+                                  lambda user_id, isbn: self._aplicar_devolucion(user_id, isbn, ahora),
+                                  "devolver_lote", "Libro devuelto correctamente.", (True, ahora))
+
+    def _aplicar_lote(self, pares, atomico, motivo_rechazo, aplicar, operacion, mensaje_exito, extra=()):
+        pares = [(user_id, isbn) for user_id, isbn in pares]
+        motivos = revisar_lote(pares, motivo_rechazo)
+        validos = [par for par, motivo in zip(pares, motivos) if motivo is None]
+        if validos and not (atomico and len(validos) < len(pares)):
+            for user_id, isbn in validos:
+                aplicar(user_id, isbn)
+            self._registrar(operacion, [list(par) for par in validos], *extra)
+        return resultados_lote(motivos, atomico, mensaje_exito)
+
     def listar_libros_prestados_usuario(self, user_id):
         if user_id not in self._usuarios:
             return None
@@ -108,49 +418,126 @@ class BibliotecaServicio:
         return self._usuarios[user_id].libros_prestados
 
     # =========================
-    # Búsquedas
+    # Reservas
     # =========================
 
-    def buscar_por_titulo(self, titulo):
-        resultados = []
+    # Un libro prestado se puede reservar; al devolverlo queda apartado DIAS_RETIRO
+    # días para el primero de la cola, que lo retira con prestar_libro. Si no lo
+    # retira a tiempo, vencer_apartados lo pasa al siguiente.
 
-        # Buscar en libros disponibles
-        for libro in self._libros_disponibles.values():
-            if titulo.lower() in libro.titulo.lower():
-                resultados.append(libro)
+    def _motivo_no_reservar(self, user_id, isbn):
+        if user_id not in self._usuarios:
+            return "El usuario no existe."
+        registro = self._catalogo.get(isbn)
+        if registro is None:
+            return "No existe un libro con ese ISBN."
+        if registro.prestado_a == user_id:
+            return "El usuario ya tiene prestado ese libro."
+        if self._reservas.reservo(user_id, isbn):
+            return "El usuario ya reservó ese libro."
+        if registro.prestado_a is None and not self._reservas.tiene_reservas(isbn):
+            return "El libro está disponible: se puede pedir prestado."
+        return None
+
+    def reservar_libro(self, user_id, isbn):
+        motivo = self._motivo_no_reservar(user_id, isbn)
+        if motivo:
+            return False, motivo
+
+        self._reservas.agregar(user_id, isbn)
+        self._registrar("reservar_libro", user_id, isbn)
+        return True, f"Reserva registrada. Posición en la cola: {self._reservas.posicion(user_id, isbn)}."
+
+    def cancelar_reserva(self, user_id, isbn, ahora=None):
+        if not self._reservas.reservo(user_id, isbn):
+            return False, "El usuario no tiene reservado ese libro."
+
+        ahora = self._reloj() if ahora is None else ahora
+        self._reservas.cancelar(user_id, isbn, ahora, DIAS_RETIRO * SEGUNDOS_POR_DIA)
+        self._registrar("cancelar_reserva", user_id, isbn, ahora)
+        return True, "Reserva cancelada correctamente."
+
+    def _cancelar_reservas_usuario(self, user_id, ahora):
+        for isbn in list(self._reservas.reservas_de(user_id)):
+            self._reservas.cancelar(user_id, isbn, ahora, DIAS_RETIRO * SEGUNDOS_POR_DIA)
+
+    def posicion_reserva(self, user_id, isbn):
+        """Lugar en la cola (1 = el siguiente), 0 si ya lo tiene apartado o None si no lo reservó."""
+        return self._reservas.posicion(user_id, isbn)
+
+    def listar_reservas_usuario(self, user_id):
+        """(libro, posición) de cada reserva del usuario, o None si el usuario no existe."""
+        if user_id not in self._usuarios:
+            return None
+        return sorted(((self._catalogo[isbn].libro, self._reservas.posicion(user_id, isbn))
+                       for isbn in self._reservas.reservas_de(user_id)),
+                      key=lambda t: (t[1], self._catalogo[t[0].isbn].orden))
+
+    def vencer_apartados(self, ahora=None):
+        """
+        Pasa al siguiente de la cola (o deja disponibles) los libros apartados que
+        nadie retiró a tiempo. Devuelve los (isbn, user_id) que perdieron el apartado.
+        """
+        ahora = self._reloj() if ahora is None else ahora
+        vencidos = self._reservas.apartados_vencidos(ahora)
+        for isbn, user_id in vencidos:
+            self._reservas.cancelar(user_id, isbn, ahora, DIAS_RETIRO * SEGUNDOS_POR_DIA)
+        if vencidos:
+            self._registrar("vencer_apartados", ahora)
+        return vencidos
 
-        # Buscar en libros prestados
-        for usuario in self._usuarios.values():
-            for libro in usuario.libros_prestados:
-                if titulo.lower() in libro.titulo.lower():
-                    resultados.append(libro)
+    # =========================
+    # Vencimientos y estadísticas
+    # =========================
 
-        return resultados
+    def fecha_vencimiento(self, isbn):
+        """Momento en que vence el préstamo del libro, o None si no está prestado."""
+        return self._agenda.vence(isbn)
 
-    def buscar_por_autor(self, autor):
-        resultados = []
+    def _con_datos(self, vencimientos):
+        return [(self._catalogo[isbn].libro, self._catalogo[isbn].prestado_a, vence)
+                for vence, isbn in vencimientos]
 
-        for libro in self._libros_disponibles.values():
-            if autor.lower() in libro.autor.lower():
-                resultados.append(libro)
+    def listar_vencidos(self, ahora=None):
+        """(libro, user_id, vence) de los préstamos vencidos, del más atrasado al más reciente."""
+        return self._con_datos(self._agenda.vencidos(self._reloj() if ahora is None else ahora))
 
-        for usuario in self._usuarios.values():
-            for libro in usuario.libros_prestados:
-                if autor.lower() in libro.autor.lower():
-                    resultados.append(libro)
+    def proximos_vencimientos(self, n=10):
+        """Los n préstamos que vencen primero (los ya vencidos aparecen antes)."""
+        return self._con_datos(self._agenda.primeros(n))
 
-        return resultados
+    def estadisticas_circulacion(self, por="categoria", desde=None, hasta=None):
+        """Préstamos, devoluciones, atrasos y días promedio por categoría, libro ("isbn") o usuario."""
+        if self._historial is None:
+            return {}
+        return self._historial.resumir(por, desde, hasta)
 
-    def buscar_por_categoria(self, categoria):
-        resultados = []
+    # =========================
+    # Búsquedas
+    # =========================
 
-        for libro in self._libros_disponibles.values():
-            if categoria.lower() == libro.categoria.lower():
-                resultados.append(libro)
+    # Los índices incluyen los libros prestados (prestar y devolver no los cambian),
+    # así que cada búsqueda depende de las coincidencias y no del tamaño del catálogo.
 
-        for usuario in self._usuarios.values():
-            for libro in usuario.libros_prestados:
-                if categoria.lower() == libro.categoria.lower():
-                    resultados.append(libro)
+    def buscar_por_titulo(self, titulo):
+        self._asegurar_indices()
+        return self._en_orden(self._indice_titulos.buscar(titulo))
 
-        return resultados
\ No newline at end of file
+    def buscar_por_autor(self, autor):
+        self._asegurar_indices()
+        return self._en_orden(self._indice_autores.buscar(autor))
+
+    def buscar_por_categoria(self, categoria):
+        self._asegurar_indices()
+        return self._en_orden(self._indice_categorias.get(categoria.lower(), ()))
+
+    def buscar(self, titulo="", autor="", categoria="", pagina=1, por_pagina=10):
+        """
+        Búsqueda combinada: todas las palabras del título Y del autor, y la
+        categoría exacta (los campos vacíos no filtran). No distingue mayúsculas
+        ni tildes y la última palabra de cada campo vale como prefijo.
+        Devuelve una página de (libro, puntaje), de más a menos relevante.
+        """
+        self._asegurar_indices()
+        return [(self._catalogo[isbn].libro, puntaje)
+                for isbn, puntaje in self._motor.buscar(titulo, autor, categoria, pagina, por_pagina)]
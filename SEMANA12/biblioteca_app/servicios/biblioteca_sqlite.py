@@ -0,0 +1,516 @@
+import sqlite3
+import time
+
+from modelos.libro import Libro
+from modelos.usuario import Usuario
+from servicios.biblioteca_servicio import (DIAS_PRESTAMO, DIAS_RETIRO, MENSAJE_MOMENTO, SEGUNDOS_POR_DIA,
+                                           momento_valido, rechazar_lote, resultados_lote, revisar_lote)
+from servicios.motor_busqueda import normalizar, palabras
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS libros (
+    orden          INTEGER PRIMARY KEY AUTOINCREMENT,
+    isbn           TEXT NOT NULL UNIQUE,
+    autor          TEXT NOT NULL,
+    titulo         TEXT NOT NULL,
+    categoria      TEXT NOT NULL,
+    autor_min      TEXT NOT NULL,
+    titulo_min     TEXT NOT NULL,
+    categoria_min  TEXT NOT NULL,
+    prestado_a     TEXT REFERENCES usuarios (user_id),
+    prestado_desde REAL,
+    vence          REAL,
+    apartado_para  TEXT REFERENCES usuarios (user_id),
+    apartado_hasta REAL
+);
+CREATE TABLE IF NOT EXISTS usuarios (
+    user_id  TEXT PRIMARY KEY,
+    nombre   TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reservas (
+    turno    INTEGER PRIMARY KEY AUTOINCREMENT,
+    isbn     TEXT NOT NULL REFERENCES libros (isbn),
+    user_id  TEXT NOT NULL REFERENCES usuarios (user_id),
+    UNIQUE (user_id, isbn)
+);
+CREATE INDEX IF NOT EXISTS idx_reservas_isbn ON reservas (isbn, turno);
+CREATE INDEX IF NOT EXISTS idx_libros_autor ON libros (autor_min);
+CREATE INDEX IF NOT EXISTS idx_libros_categoria ON libros (categoria_min);
+CREATE INDEX IF NOT EXISTS idx_libros_prestado_a ON libros (prestado_a);
+"""
+
+# Índice de texto completo para buscar(): FTS5 ordena por BM25 y no distingue tildes
+_ESQUEMA_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS libros_fts USING fts5 (
+    titulo, autor, content='libros', content_rowid='orden',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS libros_fts_alta AFTER INSERT ON libros BEGIN
+    INSERT INTO libros_fts (rowid, titulo, autor) VALUES (new.orden, new.titulo, new.autor);
+END;
+CREATE TRIGGER IF NOT EXISTS libros_fts_baja AFTER DELETE ON libros BEGIN
+    INSERT INTO libros_fts (libros_fts, rowid, titulo, autor) VALUES ('delete', old.orden, old.titulo, old.autor);
+END;
+"""
+
+_COLUMNAS = "autor, titulo, categoria, isbn"
+
+
+class BibliotecaServicioSQLite:
+    """
+    Misma interfaz que BibliotecaServicio, pero con los datos en una base SQLite
+    (módulo estándar sqlite3). Nada se carga completo en memoria: cada método
+    hace su consulta y crea solo los objetos que devuelve.
+    """
+
+    def __init__(self, ruta="biblioteca.db"):
+        self._con = sqlite3.connect(ruta)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        self._con.execute("PRAGMA foreign_keys=ON")
+        self._con.executescript(_ESQUEMA)
+        self._reloj = time.time
+        self._historial = None
+        self._migrar()
+        self._con.create_function("normalizar", 1, normalizar, deterministic=True)
+        self._fts = self._crear_indice_texto()
+
+    def _migrar(self):
+        # Bases de versiones anteriores: se agregan las columnas que falten. Los
+        # préstamos que ya había (sin fechas) vencen en DIAS_PRESTAMO desde hoy
+        columnas = {fila[1] for fila in self._con.execute("PRAGMA table_info(libros)")}
+        with self._con:
+            if "vence" not in columnas:
+                self._con.execute("ALTER TABLE libros ADD COLUMN prestado_desde REAL")
+                self._con.execute("ALTER TABLE libros ADD COLUMN vence REAL")
+                desde, vence = self._plazo(DIAS_PRESTAMO, None)
+                self._con.execute("UPDATE libros SET prestado_desde = ?, vence = ? WHERE prestado_a IS NOT NULL",
+                                  (desde, vence))
+            if "apartado_para" not in columnas:
+                self._con.execute("ALTER TABLE libros ADD COLUMN apartado_para TEXT REFERENCES usuarios (user_id)")
+                self._con.execute("ALTER TABLE libros ADD COLUMN apartado_hasta REAL")
+            self._con.execute("CREATE INDEX IF NOT EXISTS idx_libros_vence ON libros (vence)")
+            self._con.execute("CREATE INDEX IF NOT EXISTS idx_libros_apartado_hasta ON libros (apartado_hasta)")
+
+    def _crear_indice_texto(self):
+        try:
+            existia = self._con.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'libros_fts'").fetchone() is not None
+            self._con.executescript(_ESQUEMA_FTS)
+        except sqlite3.OperationalError:   # SQLite compilado sin FTS5
+            return False
+        if not existia:   # base creada antes de tener el índice: se arma con lo que ya hay
+            with self._con:
+                self._con.execute("INSERT INTO libros_fts (libros_fts) VALUES ('rebuild')")
+        return True
+
+    def cerrar(self):
+        self._con.close()
+
+    @property
+    def historial(self):
+        return self._historial
+
+    def usar_historial(self, historial):
+        self._historial = historial
+
+    def _libros(self, sql, parametros=()):
+        return [Libro(*fila) for fila in self._con.execute(sql, parametros)]
+
+    # =========================
+    # Gestión de libros
+    # =========================
+
+    def agregar_libro(self, autor, titulo, categoria, isbn):
+        fila = self._con.execute("SELECT prestado_a FROM libros WHERE isbn = ?", (isbn,)).fetchone()
+        if fila is not None:
+            if fila[0] is not None:
+                return False, "Ya existe un libro con ese ISBN (actualmente prestado)."
+            return False, "Ya existe un libro con ese ISBN."
+
+        with self._con:
+            self._con.execute(
+                "INSERT INTO libros (isbn, autor, titulo, categoria, autor_min, titulo_min, categoria_min) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (isbn, autor, titulo, categoria, autor.lower(), titulo.lower(), categoria.lower()))
+        return True, "Libro agregado correctamente."
+
+    def quitar_libro(self, isbn):
+        fila = self._con.execute("SELECT prestado_a FROM libros WHERE isbn = ?", (isbn,)).fetchone()
+        if fila is None:
+            return False, "No existe un libro con ese ISBN."
+        if fila[0] is not None:
+            return False, "No se puede quitar un libro que está prestado."
+        if self._tiene_reservas(isbn):
+            return False, "No se puede quitar un libro con reservas pendientes."
+
+        with self._con:
+            self._con.execute("DELETE FROM libros WHERE isbn = ?", (isbn,))
+        return True, "Libro quitado correctamente."
+
+    def existe_libro(self, isbn):
+        return self._con.execute("SELECT 1 FROM libros WHERE isbn = ?", (isbn,)).fetchone() is not None
+
+    def quien_tiene(self, isbn):
+        fila = self._con.execute("SELECT prestado_a FROM libros WHERE isbn = ?", (isbn,)).fetchone()
+        return None if fila is None else fila[0]
+
+    def listar_libros_disponibles(self):
+        return self._libros(f"SELECT {_COLUMNAS} FROM libros "
+                            "WHERE prestado_a IS NULL AND apartado_para IS NULL ORDER BY orden")
+
+    # =========================
+    # Gestión de usuarios
+    # =========================
+
+    def registrar_usuario(self, nombre, user_id):
+        try:
+            with self._con:
+                self._con.execute("INSERT INTO usuarios (user_id, nombre) VALUES (?, ?)", (user_id, nombre))
+        except sqlite3.IntegrityError:
+            return False, "El ID de usuario ya está registrado."
+        return True, "Usuario registrado correctamente."
+
+    def dar_baja_usuario(self, user_id, ahora=None):
+        if not self._existe_usuario(user_id):
+            return False, "El usuario no existe."
+
+        if self._con.execute("SELECT 1 FROM libros WHERE prestado_a = ? LIMIT 1", (user_id,)).fetchone():
+            return False, "No se puede dar de baja a un usuario con libros prestados."
+
+        ahora = self._reloj() if ahora is None else ahora
+        with self._con:
+            # Lo que tenía apartado pasa al siguiente de cada cola
+            apartados = self._con.execute("SELECT isbn FROM libros WHERE apartado_para = ?", (user_id,)).fetchall()
+            for (isbn,) in apartados:
+                self._apartar_siguiente(isbn, ahora)
+            self._con.execute("DELETE FROM reservas WHERE user_id = ?", (user_id,))
+            self._con.execute("DELETE FROM usuarios WHERE user_id = ?", (user_id,))
+        return True, "Usuario dado de baja correctamente."
+
+    def _existe_usuario(self, user_id):
+        return self._con.execute("SELECT 1 FROM usuarios WHERE user_id = ?", (user_id,)).fetchone() is not None
+
+    def listar_usuarios(self):
+        return [Usuario(nombre, user_id)
+                for user_id, nombre in self._con.execute("SELECT user_id, nombre FROM usuarios ORDER BY rowid")]
+
+    # =========================
+    # Préstamos y devoluciones
+    # =========================
+
+    def _plazo(self, dias, desde):
+        desde = self._reloj() if desde is None else desde
+        return desde, desde + dias * SEGUNDOS_POR_DIA
+
+    def prestar_libro(self, user_id, isbn, dias=DIAS_PRESTAMO, desde=None):
+        if not self._existe_usuario(user_id):
+            return False, "El usuario no existe."
+
+        # La condición "prestado_a IS NULL" hace la verificación y el cambio en un solo paso
+        desde, vence = self._plazo(dias, desde)
+        if not momento_valido(desde):
+            return False, MENSAJE_MOMENTO
+        with self._con:
+            cambiados = self._con.execute(
+                "UPDATE libros SET prestado_a = ?, prestado_desde = ?, vence = ?, "
+                "apartado_para = NULL, apartado_hasta = NULL "
+                "WHERE isbn = ? AND prestado_a IS NULL AND (apartado_para IS NULL OR apartado_para = ?)",
+                (user_id, desde, vence, isbn, user_id)).rowcount
+        if cambiados == 0:
+            return False, self._motivo_no_prestar(user_id, isbn) or "El libro no está disponible."
+        self._historial_prestamos([(user_id, isbn)], desde)
+        return True, "Libro prestado correctamente."
+
+    def devolver_libro(self, user_id, isbn, ahora=None):
+        if not self._existe_usuario(user_id):
+            return False, "El usuario no existe."
+
+        ahora = self._reloj() if ahora is None else ahora
+        if not momento_valido(ahora):
+            return False, MENSAJE_MOMENTO
+        siguiente = None
+        with self._con:
+            prestamos = self._datos_prestamos([(user_id, isbn)])
+            cambiados = self._con.execute(
+                "UPDATE libros SET prestado_a = NULL, prestado_desde = NULL, vence = NULL "
+                "WHERE isbn = ? AND prestado_a = ?",
+                (isbn, user_id)).rowcount
+            if cambiados:
+                siguiente = self._apartar_siguiente(isbn, ahora)
+        if cambiados == 0:
+            return False, "El usuario no tiene prestado ese libro."
+        self._historial_devoluciones(prestamos, ahora)
+        if siguiente is not None:
+            return True, f"Libro devuelto correctamente. Queda apartado para el usuario {siguiente}."
+        return True, "Libro devuelto correctamente."
+
+    def prestar_lote(self, pares, atomico=True, dias=DIAS_PRESTAMO, desde=None):
+        """Como BibliotecaServicio.prestar_lote: valida todo y aplica en una sola transacción."""
+        desde, vence = self._plazo(dias, desde)
+        if not momento_valido(desde):
+            return rechazar_lote(pares, atomico, MENSAJE_MOMENTO)
+
+        def aplicar(validos):
+            self._con.executemany("UPDATE libros SET prestado_a = ?, prestado_desde = ?, vence = ?, "
+                                  "apartado_para = NULL, apartado_hasta = NULL WHERE isbn = ?",
+                                  [(user_id, desde, vence, isbn) for user_id, isbn in validos])
+            return lambda: self._historial_prestamos(validos, desde)
+
+        return self._aplicar_lote(pares, atomico, self._motivo_no_prestar, aplicar,
+                                  "Libro prestado correctamente.")
+
+    def devolver_lote(self, pares, atomico=True, ahora=None):
+        ahora = self._reloj() if ahora is None else ahora
+        if not momento_valido(ahora):
+            return rechazar_lote(pares, atomico, MENSAJE_MOMENTO)
+
+        def aplicar(validos):
+            prestamos = self._datos_prestamos(validos)
+            self._con.executemany("UPDATE libros SET prestado_a = NULL, prestado_desde = NULL, vence = NULL "
+                                  "WHERE prestado_a = ? AND isbn = ?", validos)
+            for _, isbn in validos:
+                self._apartar_siguiente(isbn, ahora)
+            return lambda: self._historial_devoluciones(prestamos, ahora)
+
+        return self._aplicar_lote(pares, atomico, self._motivo_no_devolver, aplicar,
+                                  "Libro devuelto correctamente.")
+
+    def _motivo_no_prestar(self, user_id, isbn):
+        if not self._existe_usuario(user_id):
+            return "El usuario no existe."
+        fila = self._con.execute("SELECT prestado_a, apartado_para FROM libros WHERE isbn = ?", (isbn,)).fetchone()
+        if fila is None or fila[0] is not None:
+            return "El libro no está disponible."
+        if fila[1] is not None and fila[1] != user_id:
+            return "El libro está apartado para otro usuario."
+        return None
+
+    def _motivo_no_devolver(self, user_id, isbn):
+        if not self._existe_usuario(user_id):
+            return "El usuario no existe."
+        if self.quien_tiene(isbn) != user_id:
+            return "El usuario no tiene prestado ese libro."
+        return None
+
+    def _aplicar_lote(self, pares, atomico, motivo_rechazo, aplicar, mensaje_exito):
+        # aplicar(validos) hace los cambios y devuelve qué anotar en el historial tras confirmarlos
+        pares = [(user_id, isbn) for user_id, isbn in pares]
+        anotar = None
+        with self._con:
+            motivos = revisar_lote(pares, motivo_rechazo)
+            validos = [par for par, motivo in zip(pares, motivos) if motivo is None]
+            if validos and not (atomico and len(validos) < len(pares)):
+                anotar = aplicar(validos)
+        if anotar is not None:
+            anotar()
+        return resultados_lote(motivos, atomico, mensaje_exito)
+
+    # ---- Historial de circulación ----
+    def _datos_prestamos(self, pares):
+        """(user_id, isbn, categoria, desde, vence) de los pares que están prestados."""
+        if self._historial is None:
+            return []
+        datos = []
+        for user_id, isbn in pares:
+            fila = self._con.execute(
+                "SELECT categoria, prestado_desde, vence FROM libros WHERE isbn = ? AND prestado_a = ?",
+                (isbn, user_id)).fetchone()
+            if fila is not None:
+                datos.append((user_id, isbn) + fila)
+        return datos
+
+    def _historial_prestamos(self, pares, desde):
+        if self._historial is None:
+            return
+        for user_id, isbn in pares:
+            categoria = self._con.execute("SELECT categoria FROM libros WHERE isbn = ?", (isbn,)).fetchone()[0]
+            self._historial.registrar_prestamo(desde, isbn, user_id, categoria)
+
+    def _historial_devoluciones(self, prestamos, ahora):
+        if self._historial is None:
+            return
+        for user_id, isbn, categoria, desde, vence in prestamos:
+            self._historial.registrar_devolucion(ahora, isbn, user_id, categoria, desde, ahora > vence)
+
+    def listar_libros_prestados_usuario(self, user_id):
+        if not self._existe_usuario(user_id):
+            return None
+
+        return self._libros(f"SELECT {_COLUMNAS} FROM libros WHERE prestado_a = ? ORDER BY orden", (user_id,))
+
+    # =========================
+    # Reservas
+    # =========================
+
+    # Las colas son filas de la tabla reservas: el turno (AUTOINCREMENT) da el
+    # orden de llegada y el índice (isbn, turno) encuentra al primero sin recorrer.
+    # Lo apartado para retirar va en libros.apartado_para / apartado_hasta.
+
+    def _tiene_reservas(self, isbn):
+        return self._con.execute(
+            "SELECT 1 FROM libros WHERE isbn = ? AND apartado_para IS NOT NULL "
+            "UNION ALL SELECT 1 FROM reservas WHERE isbn = ? LIMIT 1", (isbn, isbn)).fetchone() is not None
+
+    def _apartar_siguiente(self, isbn, ahora):
+        """Aparta el libro para el primero de la cola (o lo deja libre). Devuelve su user_id o None."""
+        fila = self._con.execute("SELECT turno, user_id FROM reservas WHERE isbn = ? ORDER BY turno LIMIT 1",
+                                 (isbn,)).fetchone()
+        if fila is None:
+            self._con.execute("UPDATE libros SET apartado_para = NULL, apartado_hasta = NULL WHERE isbn = ?",
+                              (isbn,))
+            return None
+        turno, user_id = fila
+        self._con.execute("DELETE FROM reservas WHERE turno = ?", (turno,))
+        self._con.execute("UPDATE libros SET apartado_para = ?, apartado_hasta = ? WHERE isbn = ?",
+                          (user_id, ahora + DIAS_RETIRO * SEGUNDOS_POR_DIA, isbn))
+        return user_id
+
+    def _motivo_no_reservar(self, user_id, isbn):
+        if not self._existe_usuario(user_id):
+            return "El usuario no existe."
+        fila = self._con.execute("SELECT prestado_a, apartado_para FROM libros WHERE isbn = ?", (isbn,)).fetchone()
+        if fila is None:
+            return "No existe un libro con ese ISBN."
+        prestado_a, apartado_para = fila
+        if prestado_a == user_id:
+            return "El usuario ya tiene prestado ese libro."
+        if apartado_para == user_id or self._turno(user_id, isbn) is not None:
+            return "El usuario ya reservó ese libro."
+        if prestado_a is None and apartado_para is None:
+            return "El libro está disponible: se puede pedir prestado."
+        return None
+
+    def _turno(self, user_id, isbn):
+        fila = self._con.execute("SELECT turno FROM reservas WHERE user_id = ? AND isbn = ?",
+                                 (user_id, isbn)).fetchone()
+        return None if fila is None else fila[0]
+
+    def reservar_libro(self, user_id, isbn):
+        with self._con:
+            motivo = self._motivo_no_reservar(user_id, isbn)
+            if motivo:
+                return False, motivo
+            self._con.execute("INSERT INTO reservas (isbn, user_id) VALUES (?, ?)", (isbn, user_id))
+        return True, f"Reserva registrada. Posición en la cola: {self.posicion_reserva(user_id, isbn)}."
+
+    def cancelar_reserva(self, user_id, isbn, ahora=None):
+        ahora = self._reloj() if ahora is None else ahora
+        with self._con:
+            if self._con.execute("SELECT 1 FROM libros WHERE isbn = ? AND apartado_para = ?",
+                                 (isbn, user_id)).fetchone():
+                self._apartar_siguiente(isbn, ahora)
+            elif self._con.execute("DELETE FROM reservas WHERE user_id = ? AND isbn = ?",
+                                   (user_id, isbn)).rowcount == 0:
+                return False, "El usuario no tiene reservado ese libro."
+        return True, "Reserva cancelada correctamente."
+
+    def posicion_reserva(self, user_id, isbn):
+        if self._con.execute("SELECT 1 FROM libros WHERE isbn = ? AND apartado_para = ?",
+                             (isbn, user_id)).fetchone():
+            return 0
+        turno = self._turno(user_id, isbn)
+        if turno is None:
+            return None
+        return self._con.execute("SELECT COUNT(*) FROM reservas WHERE isbn = ? AND turno <= ?",
+                                 (isbn, turno)).fetchone()[0]
+
+    def listar_reservas_usuario(self, user_id):
+        if not self._existe_usuario(user_id):
+            return None
+        filas = self._con.execute(
+            f"SELECT {_COLUMNAS}, 0, orden FROM libros WHERE apartado_para = ? "
+            f"UNION ALL SELECT {_COLUMNAS}, (SELECT COUNT(*) FROM reservas AS r "
+            "WHERE r.isbn = reservas.isbn AND r.turno <= reservas.turno), orden "
+            "FROM reservas JOIN libros USING (isbn) WHERE user_id = ? ORDER BY 5, 6",
+            (user_id, user_id)).fetchall()
+        return [(Libro(*fila[:4]), fila[4]) for fila in filas]
+
+    def vencer_apartados(self, ahora=None):
+        ahora = self._reloj() if ahora is None else ahora
+        with self._con:
+            vencidos = self._con.execute(
+                "SELECT isbn, apartado_para FROM libros WHERE apartado_hasta <= ? ORDER BY apartado_hasta, isbn",
+                (ahora,)).fetchall()
+            for isbn, _ in vencidos:
+                self._apartar_siguiente(isbn, ahora)
+        return vencidos
+
+    # =========================
+    # Vencimientos y estadísticas
+    # =========================
+
+    def fecha_vencimiento(self, isbn):
+        fila = self._con.execute("SELECT vence FROM libros WHERE isbn = ?", (isbn,)).fetchone()
+        return None if fila is None else fila[0]
+
+    def _con_datos(self, sql, parametros):
+        return [(Libro(*fila[:4]), fila[4], fila[5]) for fila in self._con.execute(sql, parametros)]
+
+    def listar_vencidos(self, ahora=None):
+        ahora = self._reloj() if ahora is None else ahora
+        return self._con_datos(f"SELECT {_COLUMNAS}, prestado_a, vence FROM libros "
+                               "WHERE vence <= ? ORDER BY vence, isbn", (ahora,))
+
+    def proximos_vencimientos(self, n=10):
+        return self._con_datos(f"SELECT {_COLUMNAS}, prestado_a, vence FROM libros "
+                               "WHERE vence IS NOT NULL ORDER BY vence, isbn LIMIT ?", (n,))
+
+    def estadisticas_circulacion(self, por="categoria", desde=None, hasta=None):
+        if self._historial is None:
+            return {}
+        return self._historial.resumir(por, desde, hasta)
+
+    # =========================
+    # Búsquedas
+    # =========================
+
+    def buscar_por_titulo(self, titulo):
+        return self._libros(f"SELECT {_COLUMNAS} FROM libros WHERE instr(titulo_min, ?) > 0 ORDER BY orden",
+                            (titulo.lower(),))
+
+    def buscar_por_autor(self, autor):
+        return self._libros(f"SELECT {_COLUMNAS} FROM libros WHERE instr(autor_min, ?) > 0 ORDER BY orden",
+                            (autor.lower(),))
+
+    def buscar_por_categoria(self, categoria):
+        return self._libros(f"SELECT {_COLUMNAS} FROM libros WHERE categoria_min = ? ORDER BY orden",
+                            (categoria.lower(),))
+
+    def buscar(self, titulo="", autor="", categoria="", pagina=1, por_pagina=10):
+        """Como BibliotecaServicio.buscar, con el ranking BM25 de FTS5."""
+        condiciones, parametros = [], []
+        if categoria.strip():
+            condiciones.append("normalizar(l.categoria) = ?")
+            parametros.append(normalizar(categoria.strip()))
+
+        terminos = []
+        for columna, texto in (("titulo", titulo), ("autor", autor)):
+            lista = palabras(texto)
+            terminos += [f'{columna} : "{p}"' + ("*" if i == len(lista) - 1 else "")
+                         for i, p in enumerate(lista)]
+
+        limite = (por_pagina, (max(pagina, 1) - 1) * por_pagina)
+        if not terminos:
+            donde = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+            filas = self._con.execute(
+                f"SELECT l.autor, l.titulo, l.categoria, l.isbn, 0.0 FROM libros l {donde} "
+                "ORDER BY l.orden LIMIT ? OFFSET ?", (*parametros, *limite))
+        elif self._fts:
+            filas = self._con.execute(
+                "SELECT l.autor, l.titulo, l.categoria, l.isbn, -bm25(libros_fts) "
+                "FROM libros_fts JOIN libros l ON l.orden = libros_fts.rowid "
+                f"WHERE libros_fts MATCH ? {''.join(' AND ' + c for c in condiciones)} "
+                "ORDER BY bm25(libros_fts), l.orden LIMIT ? OFFSET ?",
+                (" AND ".join(terminos), *parametros, *limite))
+        else:
+            # Sin FTS5: cada palabra como subcadena, sin ranking (puntaje 0, por orden de alta)
+            for columna, texto in (("titulo_min", titulo), ("autor_min", autor)):
+                for p in palabras(texto):
+                    condiciones.append(f"instr(normalizar({columna}), ?) > 0")
+                    parametros.append(p)
+            filas = self._con.execute(
+                f"SELECT l.autor, l.titulo, l.categoria, l.isbn, 0.0 FROM libros l "
+                f"WHERE {' AND '.join(condiciones)} ORDER BY l.orden LIMIT ? OFFSET ?",
+                (*parametros, *limite))
+        return [(Libro(*fila[:4]), fila[4]) for fila in filas]
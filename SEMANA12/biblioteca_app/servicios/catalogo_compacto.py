@@ -0,0 +1,152 @@
+import math
+from array import array
+
+from modelos.libro import Libro
+from modelos.simbolos import SIMBOLOS
+
+
+class CatalogoCompacto:
+    """
+    Catálogo "por columnas" para bibliotecas muy grandes: en vez de un
+    RegistroCatalogo + un Libro por ejemplar, cada campo va en una lista o
+    array paralelo. Autor y categoría se guardan como códigos de la tabla de
+    símbolos (4 bytes por libro) y el orden de alta en un array de int64.
+    Se usa como el dict ISBN -> RegistroCatalogo de BibliotecaServicio:
+
+        biblioteca = BibliotecaServicio(CatalogoCompacto())
+
+    Al leer se entregan vistas livianas (RegistroCompacto) con los mismos
+    atributos que RegistroCatalogo; el Libro se arma recién cuando se pide.
+    """
+
+    def __init__(self):
+        self._isbns = []
+        self._titulos = []
+        self._autores = array("I")       # códigos de SIMBOLOS
+        self._categorias = array("I")    # códigos de SIMBOLOS
+        self._ordenes = array("q")
+        self._prestado_a = []            # user_id o None
+        self._desde = array("d")         # inicio del préstamo (NaN = sin préstamo)
+        self._vence = array("d")         # vencimiento del préstamo (NaN = sin préstamo)
+        self._filas = {}                 # ISBN -> fila
+        self._libres = []                # filas de libros quitados, para reutilizar
+
+    # =========================
+    # Interfaz tipo dict (ISBN -> registro)
+    # =========================
+
+    def __len__(self):
+        return len(self._filas)
+
+    def __contains__(self, isbn):
+        return isbn in self._filas
+
+    def __iter__(self):
+        return iter(self._filas)
+
+    def __getitem__(self, isbn):
+        return RegistroCompacto(self, self._filas[isbn])
+
+    def get(self, isbn, defecto=None):
+        fila = self._filas.get(isbn)
+        return defecto if fila is None else RegistroCompacto(self, fila)
+
+    def __setitem__(self, isbn, registro):
+        # Se copian los datos del registro: cambiarlo después no afecta al catálogo
+        fila = self._filas.get(isbn)
+        if fila is None:
+            if self._libres:
+                fila = self._libres.pop()
+            else:
+                fila = len(self._isbns)
+                self._isbns.append(None)
+                self._titulos.append(None)
+                self._autores.append(0)
+                self._categorias.append(0)
+                self._ordenes.append(0)
+                self._prestado_a.append(None)
+                self._desde.append(math.nan)
+                self._vence.append(math.nan)
+            self._filas[isbn] = fila
+        libro = registro.libro
+        self._isbns[fila] = isbn
+        self._titulos[fila] = libro.titulo
+        self._autores[fila] = SIMBOLOS.codigo(libro.autor)
+        self._categorias[fila] = SIMBOLOS.codigo(libro.categoria)
+        self._ordenes[fila] = registro.orden
+        self._prestado_a[fila] = registro.prestado_a
+        self._desde[fila] = _a_real(registro.desde)
+        self._vence[fila] = _a_real(registro.vence)
+
+    def __delitem__(self, isbn):
+        fila = self._filas.pop(isbn)
+        self._isbns[fila] = None
+        self._titulos[fila] = None
+        self._prestado_a[fila] = None
+        self._libres.append(fila)
+
+    def keys(self):
+        return self._filas.keys()
+
+    def values(self):
+        return (RegistroCompacto(self, fila) for fila in self._filas.values())
+
+    def items(self):
+        return ((isbn, RegistroCompacto(self, fila)) for isbn, fila in self._filas.items())
+
+    def _libro(self, fila):
+        return Libro(SIMBOLOS.texto(self._autores[fila]), self._titulos[fila],
+                     SIMBOLOS.texto(self._categorias[fila]), self._isbns[fila])
+
+
+def _a_real(momento):
+    return math.nan if momento is None else momento
+
+
+def _de_real(valor):
+    return None if math.isnan(valor) else valor
+
+
+class RegistroCompacto:
+    """
+    Vista de una fila de CatalogoCompacto con los atributos de RegistroCatalogo.
+    No conviene conservarla después de quitar el libro: la fila puede reutilizarse.
+    """
+
+    __slots__ = ("_catalogo", "_fila")
+
+    def __init__(self, catalogo, fila):
+        self._catalogo = catalogo
+        self._fila = fila
+
+    @property
+    def libro(self):
+        return self._catalogo._libro(self._fila)
+
+    @property
+    def orden(self):
+        return self._catalogo._ordenes[self._fila]
+
+    @property
+    def prestado_a(self):
+        return self._catalogo._prestado_a[self._fila]
+
+    @prestado_a.setter
+    def prestado_a(self, user_id):
+        self._catalogo._prestado_a[self._fila] = user_id
+
+    @property
+    def desde(self):
+        return _de_real(self._catalogo._desde[self._fila])
+
+    @desde.setter
+    def desde(self, momento):
+        self._catalogo._desde[self._fila] = _a_real(momento)
+
+    @property
+    def vence(self):
+        return _de_real(self._catalogo._vence[self._fila])
+
+    @vence.setter
+    def vence(self, momento):
+        self._catalogo._vence[self._fila] = _a_real(momento)
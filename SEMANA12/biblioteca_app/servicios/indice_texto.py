@@ -0,0 +1,58 @@
+class IndiceTexto:
+    """
+    Índice invertido de n-gramas (de 1 a 3 caracteres) para buscar subcadenas
+    sin recorrer todo el catálogo. Guarda el texto en minúsculas de cada
+    elemento para verificar los candidatos sin volver a llamar a lower().
+    """
+
+    N = 3
+
+    def __init__(self):
+        self._postings = {}   # n-grama -> conjunto de elementos
+        self._textos = {}     # elemento -> texto en minúsculas
+
+    def _gramas(self, texto):
+        return {texto[i:i + largo]
+                for largo in range(1, self.N + 1)
+                for i in range(len(texto) - largo + 1)}
+
+    def agregar(self, elemento, texto):
+        texto = texto.lower()
+        self._textos[elemento] = texto
+        for g in self._gramas(texto):
+            self._postings.setdefault(g, set()).add(elemento)
+
+    def quitar(self, elemento):
+        texto = self._textos.pop(elemento, None)
+        if texto is None:
+            return
+        for g in self._gramas(texto):
+            elementos = self._postings.get(g)
+            if elementos is not None:
+                elementos.discard(elemento)
+                if not elementos:
+                    del self._postings[g]
+
+    def buscar(self, consulta):
+        """Elementos cuyo texto contiene la consulta (sin distinguir mayúsculas)."""
+        consulta = consulta.lower()
+        if not consulta:
+            return set(self._textos)
+        if len(consulta) <= self.N:
+            return set(self._postings.get(consulta, ()))
+
+        listas = []
+        for i in range(len(consulta) - self.N + 1):
+            elementos = self._postings.get(consulta[i:i + self.N])
+            if not elementos:
+                return set()
+            listas.append(elementos)
+
+        # Se intersecta desde la lista más corta y luego se verifica la subcadena
+        listas.sort(key=len)
+        candidatos = set(listas[0])
+        for elementos in listas[1:]:
+            candidatos &= elementos
+            if not candidatos:
+                return candidatos
+        return {e for e in candidatos if consulta in self._textos[e]}
@@ -0,0 +1,319 @@
+import heapq
+import math
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from itertools import islice
+
+_PALABRA = re.compile(r"\w+")
+
+K1 = 1.2                 # saturación de la frecuencia del término (BM25)
+B = 0.75                 # peso del largo del campo (BM25)
+LIMITE_DIRECTO = 2000    # con menos candidatos se puntúan todos en vez de cortar antes
+
+
+def normalizar(texto):
+    """Minúsculas y sin tildes ni diéresis: 'Canción' y 'cancion' son la misma palabra."""
+    if texto.isascii():
+        return texto.lower()   # nada que descomponer (camino rápido de la carga masiva)
+    descompuesto = unicodedata.normalize("NFD", texto.casefold())
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def palabras(texto):
+    return _PALABRA.findall(normalizar(texto))
+
+
+class _Campo:
+    """
+    Índice invertido de un campo (título o autor) para BM25.
+
+    Además de palabra -> {isbn: frecuencia}, cada palabra guarda sus apariciones
+    agrupadas por frecuencia y ordenadas por largo del campo: dentro de un grupo
+    el aporte BM25 baja a medida que el campo es más largo, sea cual sea el largo
+    promedio. Mezclando los grupos se recorren las apariciones de mayor a menor
+    aporte sin ordenar nada en la consulta.
+    """
+
+    def __init__(self):
+        self._postings = {}      # palabra -> {isbn: frecuencia}
+        self._impactos = {}      # palabra -> {frecuencia: [(largo, orden, isbn)] ordenada}
+        self._largos = {}        # isbn -> cantidad de palabras del campo
+        self._palabras = {}      # isbn -> ((palabra, frecuencia), ...) del campo
+        self._total_largos = 0
+        self._vocabulario = []   # palabras ordenadas, para buscar por prefijo
+
+    def _frecuencias(self, isbn, texto):
+        lista = palabras(texto)
+        self._largos[isbn] = len(lista)
+        self._total_largos += len(lista)
+        frecuencias = {}
+        for palabra in lista:
+            frecuencias[palabra] = frecuencias.get(palabra, 0) + 1
+        self._palabras[isbn] = tuple(frecuencias.items())
+        return len(lista), frecuencias
+
+    def agregar(self, isbn, orden, texto):
+        largo, frecuencias = self._frecuencias(isbn, texto)
+        for palabra, tf in frecuencias.items():
+            if palabra not in self._postings:
+                self._postings[palabra] = {}
+                self._impactos[palabra] = {}
+                insort(self._vocabulario, palabra)
+            self._postings[palabra][isbn] = tf
+            insort(self._impactos[palabra].setdefault(tf, []), (largo, orden, isbn))
+
+    def agregar_varios(self, filas):
+        """
+        Carga masiva de (isbn, orden, texto): en vez de insertar en orden de a
+        uno (O(n) por palabra común) se agrega al final y cada grupo tocado y el
+        vocabulario se ordenan una sola vez.
+        """
+        tocados = set()
+        nuevas = False
+        for isbn, orden, texto in filas:
+            largo, frecuencias = self._frecuencias(isbn, texto)
+            for palabra, tf in frecuencias.items():
+                if palabra not in self._postings:
+                    self._postings[palabra] = {}
+                    self._impactos[palabra] = {}
+                    self._vocabulario.append(palabra)
+                    nuevas = True
+                self._postings[palabra][isbn] = tf
+                self._impactos[palabra].setdefault(tf, []).append((largo, orden, isbn))
+                tocados.add((palabra, tf))
+        for palabra, tf in tocados:
+            self._impactos[palabra][tf].sort()
+        if nuevas:
+            self._vocabulario.sort()
+
+    def quitar(self, isbn, orden):
+        largo = self._largos.pop(isbn)
+        self._total_largos -= largo
+        for palabra, tf in self._palabras.pop(isbn):
+            del self._postings[palabra][isbn]
+            grupo = self._impactos[palabra][tf]
+            del grupo[bisect_left(grupo, (largo, orden, isbn))]
+            if not grupo:
+                del self._impactos[palabra][tf]
+            if not self._postings[palabra]:
+                del self._postings[palabra]
+                del self._impactos[palabra]
+                del self._vocabulario[bisect_left(self._vocabulario, palabra)]
+
+    # ---- Puntajes ----
+    def _idf(self, palabra):
+        n = len(self._postings[palabra])
+        total = len(self._largos)
+        return math.log(1 + (total - n + 0.5) / (n + 0.5))
+
+    def _aporte(self, idf, tf, largo):
+        promedio = self._total_largos / len(self._largos)
+        return idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * largo / promedio))
+
+    def expandir(self, termino, prefijo):
+        """Conjunto de palabras del vocabulario que cubre el término (exacto, o todas las del prefijo)."""
+        if not prefijo:
+            return {termino} if termino in self._postings else set()
+        # Las palabras con ese prefijo son un tramo contiguo del vocabulario ordenado
+        i = bisect_left(self._vocabulario, termino)
+        j = bisect_left(self._vocabulario, termino + chr(0x10FFFF), i)
+        return set(self._vocabulario[i:j])
+
+    def cantidad(self, palabras_termino):
+        return sum(len(self._postings[p]) for p in palabras_termino)
+
+    def isbns(self, palabras_termino):
+        return {isbn for p in palabras_termino for isbn in self._postings[p]}
+
+    def aporte(self, palabras_termino, isbn):
+        """Aporte del término al libro (el mejor entre sus palabras), o None si no lo contiene."""
+        # Se recorren las pocas palabras del libro, no todas las que cubre un prefijo
+        mejor = None
+        for palabra, tf in self._palabras[isbn]:
+            if palabra in palabras_termino:
+                valor = self._aporte(self._idf(palabra), tf, self._largos[isbn])
+                if mejor is None or valor > mejor:
+                    mejor = valor
+        return mejor
+
+    def recorrer(self, palabras_termino):
+        """(aporte, orden, isbn) de mayor a menor aporte, para el corte temprano."""
+        flujos = [self._recorrer_grupo(self._idf(palabra), tf, grupo)
+                  for palabra in palabras_termino
+                  for tf, grupo in self._impactos[palabra].items()]
+        return heapq.merge(*flujos, key=lambda t: (-t[0], t[1]))
+
+    def _recorrer_grupo(self, idf, tf, grupo):
+        for largo, orden, isbn in grupo:
+            yield self._aporte(idf, tf, largo), orden, isbn
+
+
+class MotorBusqueda:
+    """
+    Búsqueda combinada sobre el catálogo: palabras del título Y del autor Y
+    categoría exacta, sin distinguir mayúsculas ni tildes, con resultados
+    ordenados por relevancia (BM25) y paginados. La última palabra de cada
+    campo también vale como prefijo ("quij" encuentra "Quijote").
+
+    Los índices se actualizan al agregar o quitar libros, así que una consulta
+    depende de cuántos libros coinciden y no del tamaño del catálogo. Para los
+    k primeros se usa el algoritmo de umbral (Fagin): se recorren las listas de
+    mayor a menor aporte y se corta en cuanto ningún libro sin ver puede superar
+    al k-ésimo ya encontrado.
+    """
+
+    def __init__(self):
+        self._titulos = _Campo()
+        self._autores = _Campo()
+        self._categorias = {}   # categoría normalizada -> conjunto de ISBN
+        self._libros = {}       # ISBN -> (orden, titulo, autor, categoria normalizada)
+        self._contador = 0
+
+    def _registrar(self, libro):
+        orden = self._contador
+        self._contador += 1
+        categoria = normalizar(libro.categoria)
+        self._libros[libro.isbn] = (orden, libro.titulo, libro.autor, categoria)
+        self._categorias.setdefault(categoria, set()).add(libro.isbn)
+        return orden
+
+    def agregar(self, libro):
+        orden = self._registrar(libro)
+        self._titulos.agregar(libro.isbn, orden, libro.titulo)
+        self._autores.agregar(libro.isbn, orden, libro.autor)
+
+    def agregar_varios(self, libros):
+        """Como agregar con muchos libros, pero ordenando cada lista del índice una sola vez."""
+        filas = [(libro.isbn, self._registrar(libro), libro.titulo, libro.autor) for libro in libros]
+        self._titulos.agregar_varios((isbn, orden, titulo) for isbn, orden, titulo, _ in filas)
+        self._autores.agregar_varios((isbn, orden, autor) for isbn, orden, _, autor in filas)
+
+    def quitar(self, isbn):
+        datos = self._libros.pop(isbn, None)
+        if datos is None:
+            return
+        orden, titulo, autor, categoria = datos
+        self._titulos.quitar(isbn, orden)
+        self._autores.quitar(isbn, orden)
+        isbns = self._categorias[categoria]
+        isbns.discard(isbn)
+        if not isbns:
+            del self._categorias[categoria]
+
+    def buscar(self, titulo="", autor="", categoria="", pagina=1, por_pagina=10):
+        """
+        Devuelve la página pedida como lista de (isbn, puntaje), de mayor a menor
+        puntaje (a igual puntaje, por orden de alta). Sin palabras de título ni de
+        autor, los libros de la categoría (o todos) salen por orden de alta con puntaje 0.
+        """
+        desde = (max(pagina, 1) - 1) * por_pagina
+        k = desde + por_pagina
+
+        terminos = self._terminos(titulo, autor)
+        filtro = self._filtro(categoria)
+        if terminos is None or filtro == set():
+            return []
+
+        if not terminos:
+            isbns = self._libros if filtro is None else sorted(filtro, key=lambda i: self._libros[i][0])
+            return [(isbn, 0.0) for isbn in islice(isbns, desde, k)]
+
+        def puntuar(isbn):
+            if filtro is not None and isbn not in filtro:
+                return None
+            total = 0.0
+            for campo, cubiertas in terminos:
+                valor = campo.aporte(cubiertas, isbn)
+                if valor is None:
+                    return None
+                total += valor
+            return total
+
+        # Si hay pocos candidatos (la lista más corta o la categoría) se puntúan todos
+        tamanos = [campo.cantidad(cubiertas) for campo, cubiertas in terminos]
+        menor = min(range(len(terminos)), key=tamanos.__getitem__)
+        if filtro is not None and len(filtro) <= tamanos[menor]:
+            candidatos = filtro
+        elif tamanos[menor] <= LIMITE_DIRECTO:
+            campo, cubiertas = terminos[menor]
+            candidatos = campo.isbns(cubiertas)
+        else:
+            candidatos = None
+
+        if candidatos is not None and len(candidatos) <= max(LIMITE_DIRECTO, k):
+            puntuados = ((puntuar(isbn), isbn) for isbn in candidatos)
+            mejores = heapq.nsmallest(k, ((-p, self._libros[isbn][0], isbn) for p, isbn in puntuados
+                                          if p is not None))
+        else:
+            mejores = self._umbral(terminos, puntuar, k)
+        return [(isbn, -negativo) for negativo, _, isbn in mejores[desde:k]]
+
+    def coincidencias(self, titulo="", autor="", categoria=""):
+        """ISBN de todos los libros que coinciden (mismas reglas que buscar), sin puntuar ni ordenar."""
+        terminos = self._terminos(titulo, autor)
+        filtro = self._filtro(categoria)
+        if terminos is None or filtro == set():
+            return set()
+        conjuntos = [campo.isbns(cubiertas) for campo, cubiertas in terminos]
+        if filtro is not None:
+            conjuntos.append(filtro)
+        if not conjuntos:
+            return set(self._libros)
+        # Se intersecta desde el conjunto más chico
+        conjuntos.sort(key=len)
+        resultado = set(conjuntos[0])
+        for otro in conjuntos[1:]:
+            resultado &= otro
+        return resultado
+
+    def _terminos(self, titulo, autor):
+        """(campo, palabras del vocabulario que cubre el término) por término; None si alguno no aparece."""
+        terminos = []
+        for campo, texto in ((self._titulos, titulo), (self._autores, autor)):
+            lista = palabras(texto)
+            for i, termino in enumerate(lista):
+                cubiertas = campo.expandir(termino, prefijo=(i == len(lista) - 1))
+                if not cubiertas:
+                    return None   # todas las palabras son obligatorias
+                terminos.append((campo, cubiertas))
+        return terminos
+
+    def _filtro(self, categoria):
+        """ISBN de la categoría (conjunto vacío si no hay ninguno), o None si no se filtra."""
+        if not categoria.strip():
+            return None
+        return self._categorias.get(normalizar(categoria.strip()), set())
+
+    def _umbral(self, terminos, puntuar, k):
+        """Algoritmo de umbral: los k mejores sin puntuar todas las coincidencias."""
+        flujos = [campo.recorrer(cubiertas) for campo, cubiertas in terminos]
+        fronteras = [math.inf] * len(flujos)
+        vistos = set()
+        peores = []   # montículo de mínimos con los k mejores: (puntaje, -orden, isbn)
+        while True:
+            for i, flujo in enumerate(flujos):
+                siguiente = next(flujo, None)
+                if siguiente is None:
+                    # Todo resultado contiene todos los términos: si una lista se
+                    # terminó, ya se vieron todos los libros que pueden coincidir
+                    return self._ordenar(peores)
+                aporte, orden, isbn = siguiente
+                fronteras[i] = aporte
+                if isbn in vistos:
+                    continue
+                vistos.add(isbn)
+                puntaje = puntuar(isbn)
+                if puntaje is None:
+                    continue
+                entrada = (puntaje, -orden, isbn)
+                if len(peores) < k:
+                    heapq.heappush(peores, entrada)
+                elif entrada > peores[0]:
+                    heapq.heapreplace(peores, entrada)
+            if len(peores) == k and peores[0][0] >= sum(fronteras):
+                return self._ordenar(peores)
+
+    @staticmethod
+    def _ordenar(peores):
+        return sorted((-puntaje, -menos_orden, isbn) for puntaje, menos_orden, isbn in peores)
@@ -0,0 +1,197 @@
+from servicios.vencimientos import AgendaVencimientos
+
+
+class ColaReservas:
+    """
+    Cola FIFO de reservas de un libro, con posición y cancelación baratas.
+
+    Cada reserva recibe un turno creciente. Un árbol de Fenwick (árbol de
+    índices binarios) sobre los turnos marca con 1 los vigentes, así la
+    posición de un usuario es una suma de prefijo en O(log n) y cancelar es
+    poner un 0 en O(log n). Atender al primero no toca el árbol: se cuenta
+    en _atendidos (todos los atendidos tienen turnos menores que cualquier
+    vigente), así que entregar el libro al siguiente es O(1) amortizado.
+    """
+
+    def __init__(self):
+        self._usuarios = []   # turno - 1 -> user_id (None si canceló o ya fue atendido)
+        self._arbol = [0]     # árbol de Fenwick, base 1
+        self._turnos = {}     # user_id -> turno vigente
+        self._cabeza = 0      # primer índice de _usuarios que puede estar vigente
+        self._atendidos = 0
+
+    def __len__(self):
+        return len(self._turnos)
+
+    def __contains__(self, user_id):
+        return user_id in self._turnos
+
+    # ---- Árbol de Fenwick ----
+    def _prefijo(self, i):
+        total = 0
+        while i > 0:
+            total += self._arbol[i]
+            i -= i & -i
+        return total
+
+    def _sumar(self, i, valor):
+        while i < len(self._arbol):
+            self._arbol[i] += valor
+            i += i & -i
+
+    def agregar(self, user_id):
+        turno = len(self._usuarios) + 1
+        self._usuarios.append(user_id)
+        # El nodo nuevo cubre (turno - lowbit, turno]: su valor sale de dos prefijos
+        self._arbol.append(1 + self._prefijo(turno - 1) - self._prefijo(turno - (turno & -turno)))
+        self._turnos[user_id] = turno
+
+    def posicion(self, user_id):
+        """1 para el primero de la cola, None si el usuario no está en ella."""
+        turno = self._turnos.get(user_id)
+        return None if turno is None else self._prefijo(turno) - self._atendidos
+
+    def quitar(self, user_id):
+        turno = self._turnos.pop(user_id)
+        self._usuarios[turno - 1] = None
+        self._sumar(turno, -1)
+        self._reordenar_si_hace_falta()
+
+    def primero(self):
+        while self._cabeza < len(self._usuarios) and self._usuarios[self._cabeza] is None:
+            self._cabeza += 1
+        return self._usuarios[self._cabeza] if self._turnos else None
+
+    def sacar_primero(self):
+        user_id = self.primero()
+        if user_id is not None:
+            del self._turnos[user_id]
+            self._usuarios[self._cabeza] = None
+            self._cabeza += 1
+            self._atendidos += 1
+            self._reordenar_si_hace_falta()
+        return user_id
+
+    def _reordenar_si_hace_falta(self):
+        # Cuando la mitad de los turnos ya no sirve se renumeran los vigentes (O(n), amortizado)
+        if len(self._usuarios) < 64 or 2 * len(self._turnos) > len(self._usuarios):
+            return
+        usuarios = self.usuarios()
+        self._usuarios = usuarios
+        self._turnos = {user_id: turno for turno, user_id in enumerate(usuarios, 1)}
+        self._cabeza = 0
+        self._atendidos = 0
+        # Construcción del árbol en O(n): cada nodo pasa su suma a su padre
+        self._arbol = [0] + [1] * len(usuarios)
+        for i in range(1, len(self._arbol)):
+            padre = i + (i & -i)
+            if padre < len(self._arbol):
+                self._arbol[padre] += self._arbol[i]
+
+    def usuarios(self):
+        """user_id en orden de llegada."""
+        return [user_id for user_id in self._usuarios[self._cabeza:] if user_id is not None]
+
+
+class Reservas:
+    """
+    Reservas de todos los libros: una ColaReservas por ISBN, los libros
+    apartados (devueltos y guardados para el primero de la cola hasta una
+    fecha límite) y un índice user_id -> ISBN reservados, para listar y
+    cancelar lo de un usuario sin recorrer todas las colas. Los plazos de
+    retiro van en una AgendaVencimientos, así vencer los apartados mira solo
+    los que ya vencieron.
+    """
+
+    def __init__(self):
+        self._colas = {}            # isbn -> ColaReservas (solo colas no vacías)
+        self._apartados = {}        # isbn -> user_id que puede retirarlo
+        self._plazos = AgendaVencimientos()
+        self._por_usuario = {}      # user_id -> conjunto de ISBN (en cola o apartados)
+
+    def tiene_reservas(self, isbn):
+        return isbn in self._colas or isbn in self._apartados
+
+    def apartado_para(self, isbn):
+        return self._apartados.get(isbn)
+
+    def plazo_retiro(self, isbn):
+        return self._plazos.vence(isbn)
+
+    def reservo(self, user_id, isbn):
+        return isbn in self._por_usuario.get(user_id, ())
+
+    def reservas_de(self, user_id):
+        return self._por_usuario.get(user_id, set())
+
+    def posicion(self, user_id, isbn):
+        """0 si el libro ya está apartado para el usuario, 1.. en la cola, None si no lo reservó."""
+        if self._apartados.get(isbn) == user_id:
+            return 0
+        cola = self._colas.get(isbn)
+        return None if cola is None else cola.posicion(user_id)
+
+    def agregar(self, user_id, isbn):
+        cola = self._colas.get(isbn)
+        if cola is None:
+            cola = self._colas[isbn] = ColaReservas()
+        cola.agregar(user_id)
+        self._por_usuario.setdefault(user_id, set()).add(isbn)
+
+    def _olvidar(self, user_id, isbn):
+        isbns = self._por_usuario[user_id]
+        isbns.discard(isbn)
+        if not isbns:
+            del self._por_usuario[user_id]
+
+    def cancelar(self, user_id, isbn, ahora, plazo):
+        """Quita la reserva. Si el libro estaba apartado para el usuario pasa al siguiente."""
+        self._olvidar(user_id, isbn)
+        if self._apartados.get(isbn) == user_id:
+            self._soltar(isbn)
+            return self.apartar_siguiente(isbn, ahora, plazo)
+        cola = self._colas[isbn]
+        cola.quitar(user_id)
+        if not cola:
+            del self._colas[isbn]
+        return None
+
+    def apartar_siguiente(self, isbn, ahora, plazo):
+        """Aparta el libro para el primero de la cola hasta ahora + plazo. Devuelve su user_id o None."""
+        cola = self._colas.get(isbn)
+        if cola is None:
+            return None
+        user_id = cola.sacar_primero()
+        if not cola:
+            del self._colas[isbn]
+        self._apartados[isbn] = user_id
+        self._plazos.programar(isbn, ahora + plazo)
+        return user_id
+
+    def retirar(self, user_id, isbn):
+        """El usuario se llevó prestado el libro que tenía apartado."""
+        self._olvidar(user_id, isbn)
+        self._soltar(isbn)
+
+    def _soltar(self, isbn):
+        del self._apartados[isbn]
+        self._plazos.cancelar(isbn)
+
+    def apartados_vencidos(self, ahora):
+        """(isbn, user_id) de los apartados cuyo plazo de retiro ya pasó."""
+        return [(isbn, self._apartados[isbn]) for _, isbn in self._plazos.vencidos(ahora)]
+
+    def exportar(self):
+        """[isbn, [user_id en la cola], apartado_para, plazo] por libro con reservas."""
+        isbns = self._colas.keys() | self._apartados.keys()
+        return [[isbn, self._colas[isbn].usuarios() if isbn in self._colas else [],
+                 self._apartados.get(isbn), self._plazos.vence(isbn)] for isbn in isbns]
+
+    def importar(self, reservas):
+        for isbn, cola, apartado_para, plazo in reservas:
+            for user_id in cola:
+                self.agregar(user_id, isbn)
+            if apartado_para is not None:
+                self._apartados[isbn] = apartado_para
+                self._plazos.programar(isbn, plazo)
+                self._por_usuario.setdefault(apartado_para, set()).add(isbn)
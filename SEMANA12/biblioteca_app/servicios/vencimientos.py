@@ -0,0 +1,82 @@
+import heapq
+
+
+class AgendaVencimientos:
+    """
+    Montículo de préstamos por fecha de vencimiento: (vence, isbn).
+
+    Devolver un libro no lo saca del montículo (sería O(n)): la entrada queda
+    obsoleta y se ignora al recorrer, porque ya no coincide con _vigentes.
+    Cuando las obsoletas superan a las vigentes se rearma el montículo.
+
+    Para listar los primeros k sin sacarlos se recorre el montículo como
+    árbol, de menor a mayor, con un segundo montículo de "fronteras": cada
+    paso cuesta O(log k), así que los k primeros salen en O(k log k) sin
+    mirar el resto de los préstamos.
+    """
+
+    def __init__(self):
+        self._monticulo = []   # (vence, isbn), puede tener entradas obsoletas
+        self._vigentes = {}    # isbn -> vence del préstamo actual
+
+    def __len__(self):
+        return len(self._vigentes)
+
+    def programar(self, isbn, vence):
+        self._vigentes[isbn] = vence
+        heapq.heappush(self._monticulo, (vence, isbn))
+        self._compactar_si_hace_falta()
+
+    def programar_varios(self, pares):
+        """Carga masiva de (isbn, vence): un solo heapify en vez de un push por préstamo."""
+        for isbn, vence in pares:
+            self._vigentes[isbn] = vence
+            self._monticulo.append((vence, isbn))
+        heapq.heapify(self._monticulo)
+
+    def cancelar(self, isbn):
+        self._vigentes.pop(isbn, None)
+        # Se limpian las obsoletas de arriba: así el mínimo casi siempre es vigente
+        while self._monticulo and self._vigentes.get(self._monticulo[0][1]) != self._monticulo[0][0]:
+            heapq.heappop(self._monticulo)
+        self._compactar_si_hace_falta()
+
+    def vence(self, isbn):
+        return self._vigentes.get(isbn)
+
+    def _compactar_si_hace_falta(self):
+        if len(self._monticulo) > 2 * len(self._vigentes) + 64:
+            self._monticulo = [(vence, isbn) for isbn, vence in self._vigentes.items()]
+            heapq.heapify(self._monticulo)
+
+    def en_orden(self):
+        """Genera (vence, isbn) vigentes de menor a mayor vencimiento, sin modificar el montículo."""
+        monticulo = self._monticulo
+        fronteras = [(monticulo[0], 0)] if monticulo else []
+        vistos = set()   # por si quedó una obsoleta idéntica a la vigente
+        while fronteras:
+            entrada, i = heapq.heappop(fronteras)
+            for hijo in (2 * i + 1, 2 * i + 2):
+                if hijo < len(monticulo):
+                    heapq.heappush(fronteras, (monticulo[hijo], hijo))
+            vence, isbn = entrada
+            if self._vigentes.get(isbn) == vence and isbn not in vistos:
+                vistos.add(isbn)
+                yield entrada
+
+    def primeros(self, n):
+        resultado = []
+        for entrada in self.en_orden():
+            if len(resultado) == n:
+                break
+            resultado.append(entrada)
+        return resultado
+
+    def vencidos(self, ahora):
+        """(vence, isbn) con vence <= ahora, del más atrasado al más reciente."""
+        resultado = []
+        for entrada in self.en_orden():
+            if entrada[0] > ahora:
+                break
+            resultado.append(entrada)
+        return resultado
@@ -0,0 +1,177 @@
+# Servidor asyncio para la biblioteca: varios clientes a la vez sobre un socket
+# TCP local o Unix, con un protocolo de líneas JSON.
+#
+# Petición (una línea):  {"id": 7, "op": "prestar_libro", "args": ["u1", "978..."]}
+# Respuesta (una línea): {"id": 7, "resultado": [true, "Libro prestado correctamente."]}
+#                        {"id": 7, "error": "Operación desconocida: ..."}
+#
+# - Cada conexión puede mandar muchas peticiones sin esperar las respuestas
+#   (pipelining); se atienden en paralelo y se responden en el mismo orden.
+# - Contrapresión: con MAX_PENDIENTES peticiones sin responder se deja de leer
+#   esa conexión (TCP frena al cliente), y cada respuesta espera a drain().
+# - El servicio corre en un grupo de hilos (run_in_executor), así el bucle de
+#   eventos nunca se bloquea; por eso se usa BibliotecaConcurrente.
+#
+# Uso: python servidor.py [archivo] [--host H] [--puerto P] [--unix RUTA] [--hilos N]
+
+import argparse
+import asyncio
+import json
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from modelos.libro import Libro
+from modelos.usuario import Usuario
+from storage import ARCHIVO, EXTENSIONES_SQLITE, cargar, cerrar
+
+PUERTO = 8765
+HILOS = 8
+MAX_PENDIENTES = 64          # peticiones sin responder por conexión
+LIMITE_LINEA = 64 * 1024     # bytes por petición
+
+# Métodos públicos de BibliotecaServicio que se pueden pedir por la red
+OPERACIONES = {
+    "agregar_libro", "quitar_libro", "existe_libro", "quien_tiene",
+    "listar_libros_disponibles", "registrar_usuario", "dar_baja_usuario",
+    "listar_usuarios", "prestar_libro", "devolver_libro", "prestar_lote", "devolver_lote",
+    "listar_libros_prestados_usuario", "buscar_por_titulo", "buscar_por_autor",
+    "buscar_por_categoria", "buscar", "fecha_vencimiento", "listar_vencidos",
+    "proximos_vencimientos", "estadisticas_circulacion", "reservar_libro", "cancelar_reserva",
+    "posicion_reserva", "listar_reservas_usuario", "vencer_apartados",
+}
+
+
+def _a_json(valor):
+    """Convierte lo que devuelve el servicio (tuplas, Libro, Usuario, vistas) a tipos JSON."""
+    if isinstance(valor, Libro):
+        return {"autor": valor.autor, "titulo": valor.titulo,
+                "categoria": valor.categoria, "isbn": valor.isbn}
+    if isinstance(valor, Usuario):
+        return {"nombre": valor.nombre, "user_id": valor.user_id}
+    if isinstance(valor, (str, int, float, bool)) or valor is None:
+        return valor
+    if isinstance(valor, dict):
+        return {str(k): _a_json(v) for k, v in valor.items()}
+    return [_a_json(v) for v in valor]
+
+
+def _respuesta(id_peticion, clave, valor):
+    return (json.dumps({"id": id_peticion, clave: valor}, ensure_ascii=False,
+                       separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def ejecutar(servicio, linea):
+    """Atiende una línea de petición y devuelve la línea de respuesta (corre en un hilo)."""
+    try:
+        peticion = json.loads(linea)
+    except ValueError:
+        return _respuesta(None, "error", "La petición no es JSON válido.")
+    if not isinstance(peticion, dict):
+        return _respuesta(None, "error", "La petición debe ser un objeto JSON.")
+
+    id_peticion = peticion.get("id")
+    operacion = peticion.get("op")
+    argumentos = peticion.get("args", [])
+    if operacion not in OPERACIONES:
+        return _respuesta(id_peticion, "error", f"Operación desconocida: {operacion!r}.")
+    if not isinstance(argumentos, list):
+        return _respuesta(id_peticion, "error", "'args' debe ser una lista.")
+
+    try:
+        resultado = getattr(servicio, operacion)(*argumentos)
+    except Exception as e:   # argumentos de más, de menos o de otro tipo
+        return _respuesta(id_peticion, "error", f"{type(e).__name__}: {e}")
+    return _respuesta(id_peticion, "resultado", _a_json(resultado))
+
+
+class Servidor:
+    def __init__(self, servicio, ejecutor, max_pendientes=MAX_PENDIENTES):
+        self._servicio = servicio
+        self._ejecutor = ejecutor
+        self._max_pendientes = max_pendientes
+
+    async def atender(self, lector, escritor):
+        loop = asyncio.get_running_loop()
+        # Cola de respuestas pendientes en orden de llegada; llena = contrapresión
+        pendientes = asyncio.Queue(self._max_pendientes)
+        tarea_escritura = asyncio.create_task(self._escribir(pendientes, escritor))
+        try:
+            while True:
+                try:
+                    linea = await lector.readline()
+                except ValueError:   # línea más larga que LIMITE_LINEA
+                    await pendientes.put(_respuesta(None, "error", "Petición demasiado larga."))
+                    break
+                if not linea:
+                    break
+                if not linea.strip():
+                    continue
+                futuro = loop.run_in_executor(self._ejecutor, ejecutar, self._servicio, linea)
+                await pendientes.put(futuro)
+        except ConnectionError:
+            pass
+        finally:
+            await pendientes.put(None)
+            await tarea_escritura
+
+    async def _escribir(self, pendientes, escritor):
+        try:
+            while True:
+                pendiente = await pendientes.get()
+                if pendiente is None:
+                    break
+                escritor.write(pendiente if isinstance(pendiente, bytes) else await pendiente)
+                await escritor.drain()
+        except ConnectionError:
+            # El cliente se fue: se descartan las respuestas hasta que el lector termine
+            # (las operaciones ya enviadas al grupo de hilos se completan igual)
+            while await pendientes.get() is not None:
+                pass
+        finally:
+            escritor.close()
+
+
+async def servir(args):
+    loop = asyncio.get_running_loop()
+    # SQLite no admite usar la conexión desde varios hilos: un solo hilo, que además la abre
+    es_sqlite = Path(args.archivo).suffix.lower() in EXTENSIONES_SQLITE
+    ejecutor = ThreadPoolExecutor(max_workers=1 if es_sqlite else args.hilos)
+    servicio = await loop.run_in_executor(
+        ejecutor, lambda: cargar(args.archivo, sincronizar=False, concurrente=True))
+
+    servidor = Servidor(servicio, ejecutor)
+    if args.unix:
+        red = await asyncio.start_unix_server(servidor.atender, path=args.unix, limit=LIMITE_LINEA)
+        print(f"Biblioteca escuchando en {args.unix}")
+    else:
+        red = await asyncio.start_server(servidor.atender, args.host, args.puerto, limit=LIMITE_LINEA)
+        print(f"Biblioteca escuchando en {args.host}:{args.puerto}")
+
+    detener = asyncio.Event()
+    for senal in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(senal, detener.set)
+        except NotImplementedError:   # Windows: Ctrl+C cancela la tarea y se cierra igual
+            pass
+    try:
+        async with red:
+            await detener.wait()
+    finally:
+        await loop.run_in_executor(ejecutor, cerrar, servicio)
+        ejecutor.shutdown()
+        print("Datos guardados. Servidor detenido.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de la biblioteca (líneas JSON).")
+    parser.add_argument("archivo", nargs="?", default=ARCHIVO)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--unix", help="ruta de un socket Unix (en vez de TCP)")
+    parser.add_argument("--hilos", type=int, default=HILOS)
+    asyncio.run(servir(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import json
+import os
+from pathlib import Path
+
+from historial import Historial
+from servicios.biblioteca_concurrente import BibliotecaConcurrente
+from servicios.biblioteca_servicio import BibliotecaServicio
+from servicios.biblioteca_sqlite import BibliotecaServicioSQLite
+from servicios.catalogo_compacto import CatalogoCompacto
+
+# Persistencia de la biblioteca:
+# - biblioteca.json: copia completa (libros con su estado de préstamo y fechas,
+#   usuarios y colas de reservas), guardada como listas en vez de objetos para que sea compacta y rápida de leer.
+# - biblioteca.json.log: diario de cambios, una línea JSON por operación
+#   (["prestar_libro", "u1", "978...", 14, 1767225600.0]; un lote es un solo registro:
+#   ["prestar_lote", [["u1", "978..."], ...], true, 14, ...]). Al cargar se aplica la copia y
+#   luego el diario; cuando el diario crece demasiado se vuelca en una copia nueva (compactación).
+# - biblioteca.json.hist: historial de circulación para estadísticas (ver historial.py);
+#   nunca se compacta, y se conecta después de reproducir el diario para no duplicar eventos.
+# - biblioteca.db / .sqlite: en vez de la copia y el diario se usa BibliotecaServicioSQLite,
+#   que guarda cada operación directamente en la base (el historial es el mismo).
+
+ARCHIVO = "biblioteca.json"
+EXTENSIONES_SQLITE = (".db", ".sqlite")
+LIMITE_DIARIO = 8 * 1024 * 1024   # bytes
+VERSION = 3   # 2: los libros prestados llevan desde y vence; 3: reservas
+
+# Operaciones que se pueden volver a aplicar desde el diario
+OPERACIONES = {"agregar_libro", "quitar_libro", "registrar_usuario",
+               "dar_baja_usuario", "prestar_libro", "devolver_libro",
+               "prestar_lote", "devolver_lote", "reservar_libro", "cancelar_reserva",
+               "vencer_apartados"}
+
+
+def guardar(servicio: BibliotecaServicio, ruta: str = ARCHIVO) -> None:
+    libros, usuarios, reservas = servicio.exportar_estado()
+    temp = Path(str(ruta) + ".tmp")
+    with temp.open("w", encoding="utf-8") as f:
+        json.dump({"version": VERSION, "usuarios": usuarios, "libros": libros, "reservas": reservas},
+                  f, ensure_ascii=False, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, ruta)
+
+
+class Diario:
+    """Diario de cambios: agrega un registro por operación al final del archivo."""
+
+    def __init__(self, servicio: BibliotecaServicio, ruta: str,
+                 limite: int = LIMITE_DIARIO, sincronizar: bool = True):
+        self._servicio = servicio
+        self._ruta = ruta
+        self._limite = limite
+        self._sincronizar = sincronizar     # fsync en cada registro (más seguro, más lento)
+        self._archivo = open(str(ruta) + ".log", "a", encoding="utf-8")
+
+    def registrar(self, registro: list) -> None:
+        self.escribir(registro)
+        if self.excede_limite():
+            self.compactar()
+
+    def escribir(self, registro: list) -> None:
+        """Agrega el registro sin compactar (BibliotecaConcurrente compacta aparte)."""
+        self._archivo.write(json.dumps(registro, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._archivo.flush()
+        if self._sincronizar:
+            os.fsync(self._archivo.fileno())
+
+    def excede_limite(self) -> bool:
+        return self._archivo.tell() > self._limite
+
+    def compactar(self) -> None:
+        # Primero la copia nueva y después vaciar el diario: si algo falla en medio,
+        # al cargar se aplica el diario sobre una copia que ya lo incluye; cada operación
+        # se valida de nuevo, así que las repetidas fallan o dejan el mismo estado.
+        guardar(self._servicio, self._ruta)
+        self._archivo.seek(0)
+        self._archivo.truncate()
+
+    def cerrar(self) -> None:
+        self._archivo.close()
+
+
+def _reproducir_diario(servicio: BibliotecaServicio, ruta_diario: Path) -> int:
+    """Aplica el diario con los métodos del servicio. Devuelve los registros ignorados."""
+    ignorados = 0
+    with ruta_diario.open("r", encoding="utf-8") as f:
+        for linea in f:
+            if not linea.strip():
+                continue
+            try:
+                operacion, *argumentos = json.loads(linea)
+            except ValueError:
+                ignorados += 1   # p. ej. la última línea quedó a medio escribir
+                continue
+            if operacion not in OPERACIONES:
+                ignorados += 1
+                continue
+            getattr(servicio, operacion)(*argumentos)
+    return ignorados
+
+
+def cargar(ruta: str = ARCHIVO, limite_diario: int = LIMITE_DIARIO,
+           sincronizar: bool = True, concurrente: bool = False,
+           compacto: bool = False) -> BibliotecaServicio:
+    """
+    Devuelve el servicio con la copia + el diario aplicados y el diario ya conectado.
+    concurrente=True devuelve un BibliotecaConcurrente, para compartirlo entre hilos;
+    compacto=True guarda el catálogo en un CatalogoCompacto (menos memoria por libro).
+    """
+    if Path(ruta).suffix.lower() in EXTENSIONES_SQLITE:
+        servicio = BibliotecaServicioSQLite(ruta)
+        servicio.usar_historial(Historial(str(ruta) + ".hist", sincronizar))
+        return servicio
+
+    catalogo = CatalogoCompacto() if compacto else None
+    servicio = BibliotecaConcurrente(catalogo) if concurrente else BibliotecaServicio(catalogo)
+
+    copia = Path(ruta)
+    if copia.exists():
+        with copia.open("r", encoding="utf-8") as f:
+            datos = json.load(f)
+        servicio.cargar_estado(datos.get("libros", []), datos.get("usuarios", []), datos.get("reservas", []))
+
+    ruta_diario = Path(str(ruta) + ".log")
+    if ruta_diario.exists():
+        _reproducir_diario(servicio, ruta_diario)
+
+    diario = Diario(servicio, ruta, limite_diario, sincronizar)
+    servicio.usar_diario(diario)
+    servicio.usar_historial(Historial(str(ruta) + ".hist", sincronizar))
+    if ruta_diario.stat().st_size > limite_diario:
+        diario.compactar()
+    return servicio
+
+
+def cerrar(servicio: BibliotecaServicio) -> None:
+    """Guarda una copia final, vacía el diario y lo desconecta del servicio."""
+    historial = servicio.historial
+    if historial is not None:
+        historial.cerrar()
+        servicio.usar_historial(None)
+    if isinstance(servicio, BibliotecaServicioSQLite):
+        servicio.cerrar()
+        return
+    diario = servicio.diario
+    if diario is None:
+        return
+    diario.compactar()
+    diario.cerrar()
+    servicio.usar_diario(None)
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import storage
+from servicios.biblioteca_concurrente import BibliotecaConcurrente
+
+HILOS = 8
+LIBROS = 40
+
+
+class ConcurrenciaTest(unittest.TestCase):
+    def _en_hilos(self, trabajo) -> None:
+        largada = threading.Barrier(HILOS)
+
+        def correr(n: int) -> None:
+            largada.wait()
+            trabajo(n)
+
+        hilos = [threading.Thread(target=correr, args=(n,)) for n in range(HILOS)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+    def _biblioteca(self, biblioteca) -> None:
+        for i in range(LIBROS):
+            biblioteca.agregar_libro("Autor", f"Libro {i}", "Novela", f"I{i}")
+        for n in range(HILOS):
+            biblioteca.registrar_usuario(f"Usuario {n}", f"U{n}")
+
+    def test_cada_libro_se_presta_una_sola_vez(self) -> None:
+        biblioteca = BibliotecaConcurrente()
+        self._biblioteca(biblioteca)
+        exitos = [[] for _ in range(HILOS)]
+
+        def trabajo(n: int) -> None:
+            for i in range(LIBROS):
+                if biblioteca.prestar_libro(f"U{n}", f"I{i}", desde=1000)[0]:
+                    exitos[n].append(f"I{i}")
+
+        self._en_hilos(trabajo)
+        prestados = [isbn for lista in exitos for isbn in lista]
+        self.assertEqual(sorted(prestados), sorted(f"I{i}" for i in range(LIBROS)))
+        for n, lista in enumerate(exitos):
+            self.assertEqual(sorted(libro.isbn for libro in biblioteca.listar_libros_prestados_usuario(f"U{n}")),
+                             sorted(lista))
+        self.assertEqual(len(biblioteca.proximos_vencimientos(LIBROS + 1)), LIBROS)
+
+    def test_diario_reproduce_el_estado(self) -> None:
+        with tempfile.TemporaryDirectory() as carpeta:
+            ruta = os.path.join(carpeta, "biblioteca.json")
+            biblioteca = storage.cargar(ruta, limite_diario=4096, sincronizar=False, concurrente=True)
+            self._biblioteca(biblioteca)
+
+            def trabajo(n: int) -> None:
+                for vuelta in range(5):
+                    for i in range(n, LIBROS, HILOS):
+                        biblioteca.prestar_libro(f"U{n}", f"I{i}", desde=1000 + vuelta)
+                        biblioteca.buscar(titulo="libro")
+                        if vuelta < 4:
+                            biblioteca.devolver_libro(f"U{n}", f"I{i}", ahora=2000 + vuelta)
+
+            self._en_hilos(trabajo)
+            estado = biblioteca.exportar_estado()
+            biblioteca.diario.cerrar()
+            biblioteca.historial.cerrar()
+            copia = storage.cargar(ruta, sincronizar=False)
+            self.assertEqual(copia.exportar_estado(), estado)
+            self.assertEqual(sum(len(copia.listar_libros_prestados_usuario(f"U{n}")) for n in range(HILOS)),
+                             LIBROS)
+            self.assertEqual(copia.estadisticas_circulacion(por="categoria")["Novela"]["prestamos"],
+                             5 * LIBROS)
+            storage.cerrar(copia)
+
+
+if __name__ == "__main__":
+    unittest.main()
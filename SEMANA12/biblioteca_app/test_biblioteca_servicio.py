@@ -0,0 +1,187 @@
+import os
+import tempfile
+import unittest
+
+from modelos.libro import Libro
+from modelos.usuario import Usuario
+from servicios.biblioteca_servicio import MENSAJE_REPETIDO, MENSAJE_SIN_APLICAR, BibliotecaServicio
+from servicios.biblioteca_sqlite import BibliotecaServicioSQLite
+
+LIBROS = [("García Márquez", "Cien años de soledad", "Novela", "1"),
+          ("Borges", "Ficciones", "Cuento", "2"),
+          ("Cortázar", "Rayuela", "novela", "3"),
+          ("Borges", "El Aleph", "Cuento", "4"),
+          ("Rulfo", "Pedro Páramo", "Novela", "5")]
+
+
+def _isbns(libros) -> list:
+    return [libro.isbn for libro in libros]
+
+
+class IndicesTest(unittest.TestCase):
+    """buscar_por_* dan lo mismo que recorrer el catálogo, en orden de alta."""
+
+    def setUp(self) -> None:
+        self.biblioteca = BibliotecaServicio()
+        for datos in LIBROS:
+            self.biblioteca.agregar_libro(*datos)
+
+    def _recorriendo(self, campo: str, texto: str) -> list:
+        return [isbn for *datos, isbn in LIBROS if isbn in self.vigentes
+                and texto.lower() in dict(zip(("autor", "titulo", "categoria"), datos))[campo].lower()]
+
+    def test_buscar_por_campo(self) -> None:
+        self.vigentes = {"1", "2", "3", "4", "5"}
+        self.assertEqual(_isbns(self.biblioteca.buscar_por_titulo("ED")), ["1", "5"])
+        self.assertEqual(_isbns(self.biblioteca.buscar_por_autor("borg")), ["2", "4"])
+        self.assertEqual(_isbns(self.biblioteca.buscar_por_categoria("NOVELA")), ["1", "3", "5"])
+        self.assertEqual(self.biblioteca.buscar_por_categoria("nove"), [])
+        for texto in ("a", "e", "xyz", " "):
+            self.assertEqual(_isbns(self.biblioteca.buscar_por_titulo(texto)),
+                             self._recorriendo("titulo", texto), texto)
+
+    def test_sigue_altas_bajas_y_prestamos(self) -> None:
+        self.biblioteca.registrar_usuario("Ana", "U1")
+        self.biblioteca.prestar_libro("U1", "2")
+        self.biblioteca.quitar_libro("4")
+        self.biblioteca.agregar_libro("Borges", "El libro de arena", "Cuento", "6")
+        self.assertEqual(_isbns(self.biblioteca.buscar_por_autor("Borges")), ["2", "6"])
+        self.assertEqual(_isbns(self.biblioteca.buscar_por_titulo("aleph")), [])
+        self.assertEqual(_isbns(self.biblioteca.buscar_por_categoria("cuento")), ["2", "6"])
+
+    def test_indices_armados_despues_de_cargar(self) -> None:
+        copia = BibliotecaServicio()
+        copia.cargar_estado(*self.biblioteca.exportar_estado())
+        copia.quitar_libro("1")   # antes de la primera búsqueda
+        self.assertEqual(_isbns(copia.buscar_por_categoria("novela")), ["3", "5"])
+        copia.agregar_libro("Onetti", "El astillero", "Novela", "7")
+        self.assertEqual(_isbns(copia.buscar_por_titulo("el ")), ["4", "7"])
+
+
+class CatalogoTest(unittest.TestCase):
+    """Un solo catálogo: prestar y devolver cambian el estado, no mueven el libro."""
+
+    def setUp(self) -> None:
+        self.biblioteca = BibliotecaServicio()
+        for datos in LIBROS:
+            self.biblioteca.agregar_libro(*datos)
+        self.biblioteca.registrar_usuario("Ana", "U1")
+
+    def test_estado_de_prestamo(self) -> None:
+        self.assertEqual(self.biblioteca.prestar_libro("U1", "3"), (True, "Libro prestado correctamente."))
+        self.assertEqual(self.biblioteca.quien_tiene("3"), "U1")
+        self.assertTrue(self.biblioteca.existe_libro("3"))
+        self.assertEqual(_isbns(self.biblioteca.listar_libros_disponibles()), ["1", "2", "4", "5"])
+        self.assertFalse(self.biblioteca.prestar_libro("U1", "3")[0])
+        self.assertEqual(self.biblioteca.devolver_libro("U1", "3"), (True, "Libro devuelto correctamente."))
+        self.assertIsNone(self.biblioteca.quien_tiene("3"))
+        self.assertEqual(_isbns(self.biblioteca.listar_libros_disponibles()), ["1", "2", "3", "4", "5"])
+
+    def test_isbn_repetido_aunque_este_prestado(self) -> None:
+        self.biblioteca.prestar_libro("U1", "1")
+        self.assertEqual(self.biblioteca.agregar_libro("X", "Y", "Z", "1"),
+                         (False, "Ya existe un libro con ese ISBN (actualmente prestado)."))
+        self.assertEqual(self.biblioteca.quitar_libro("1"),
+                         (False, "No se puede quitar un libro que está prestado."))
+        self.assertEqual(self.biblioteca.agregar_libro("X", "Y", "Z", "2"),
+                         (False, "Ya existe un libro con ese ISBN."))
+
+    def test_exportar_y_cargar(self) -> None:
+        self.biblioteca.prestar_libro("U1", "5", desde=1000)
+        copia = BibliotecaServicio()
+        copia.cargar_estado(*self.biblioteca.exportar_estado())
+        self.assertEqual(copia.exportar_estado(), self.biblioteca.exportar_estado())
+        self.assertEqual(copia.quien_tiene("5"), "U1")
+        self.assertTrue(copia.devolver_libro("U1", "5", ahora=2000)[0])
+
+
+class UsuarioTest(unittest.TestCase):
+    def test_prestamos_por_isbn_en_orden(self) -> None:
+        usuario = Usuario("Ana", "U1")
+        libros = [Libro("A", f"T{i}", "C", f"I{i}") for i in range(5)]
+        for libro in libros:
+            usuario.prestar_libro(libro)
+        self.assertEqual(usuario.devolver_libro("I2"), libros[2])
+        self.assertIsNone(usuario.devolver_libro("I2"))
+        self.assertFalse(usuario.tiene_libro("I2"))
+        self.assertTrue(usuario.tiene_libro("I3"))
+        self.assertEqual(_isbns(usuario.libros_prestados), ["I0", "I1", "I3", "I4"])
+
+    def test_vista_de_solo_lectura_que_se_actualiza(self) -> None:
+        biblioteca = BibliotecaServicio()
+        biblioteca.registrar_usuario("Ana", "U1")
+        for datos in LIBROS:
+            biblioteca.agregar_libro(*datos)
+        vista = biblioteca.listar_libros_prestados_usuario("U1")
+        biblioteca.prestar_libro("U1", "4")
+        biblioteca.prestar_libro("U1", "1")
+        self.assertEqual(_isbns(vista), ["4", "1"])
+        biblioteca.devolver_libro("U1", "4")
+        self.assertEqual(_isbns(vista), ["1"])
+        self.assertFalse(hasattr(vista, "append") or hasattr(vista, "pop"))
+        self.assertIsNone(biblioteca.listar_libros_prestados_usuario("nadie"))
+
+
+class DiarioEnMemoria:
+    def __init__(self) -> None:
+        self.registros = []
+
+    def registrar(self, registro: list) -> None:
+        self.registros.append(registro)
+
+
+class LotesTest(unittest.TestCase):
+    """prestar_lote / devolver_lote: validan todo antes de aplicar, en ambos backends."""
+
+    def setUp(self) -> None:
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.sqlite = BibliotecaServicioSQLite(os.path.join(self.carpeta.name, "biblioteca.db"))
+        self.bibliotecas = [BibliotecaServicio(), self.sqlite]
+        for biblioteca in self.bibliotecas:
+            for datos in LIBROS:
+                biblioteca.agregar_libro(*datos)
+            biblioteca.registrar_usuario("Ana", "U1")
+            biblioteca.registrar_usuario("Beto", "U2")
+
+    def tearDown(self) -> None:
+        self.sqlite.cerrar()
+        self.carpeta.cleanup()
+
+    def test_atomico_no_aplica_nada_si_hay_errores(self) -> None:
+        for biblioteca in self.bibliotecas:
+            exito, resultados = biblioteca.prestar_lote([("U1", "1"), ("U2", "2"), ("U1", "2"), ("U9", "3")])
+            self.assertFalse(exito)
+            self.assertEqual(resultados, [(False, MENSAJE_SIN_APLICAR), (False, MENSAJE_REPETIDO),
+                                          (False, MENSAJE_REPETIDO), (False, "El usuario no existe.")])
+            self.assertEqual([biblioteca.quien_tiene(isbn) for isbn in "123"], [None, None, None])
+
+    def test_no_atomico_aplica_los_validos(self) -> None:
+        for biblioteca in self.bibliotecas:
+            exito, resultados = biblioteca.prestar_lote([("U1", "1"), ("U2", "9"), ("U2", "3")],
+                                                        atomico=False, desde=1000)
+            self.assertFalse(exito)
+            self.assertEqual([ok for ok, _ in resultados], [True, False, True])
+            self.assertEqual(biblioteca.fecha_vencimiento("1"), biblioteca.fecha_vencimiento("3"))
+            exito, resultados = biblioteca.devolver_lote([("U1", "1"), ("U2", "3")], ahora=2000)
+            self.assertTrue(exito)
+            self.assertEqual([biblioteca.quien_tiene(isbn) for isbn in "13"], [None, None])
+
+    def test_un_registro_por_lote_en_el_diario(self) -> None:
+        biblioteca = self.bibliotecas[0]
+        diario = DiarioEnMemoria()
+        biblioteca.usar_diario(diario)
+        biblioteca.prestar_lote([("U1", "1"), ("U1", "2")], desde=1000)
+        biblioteca.prestar_lote([("U1", "3"), ("U1", "9")], desde=1000)   # atómico y con error: nada
+        biblioteca.devolver_lote([("U1", "1"), ("U1", "3")], atomico=False, ahora=2000)
+        self.assertEqual(diario.registros, [["prestar_lote", [["U1", "1"], ["U1", "2"]], True, 14, 1000],
+                                            ["devolver_lote", [["U1", "1"]], True, 2000]])
+
+        copia = BibliotecaServicio()
+        copia.cargar_estado([d + (None,) for d in LIBROS], [("Ana", "U1"), ("Beto", "U2")])
+        for operacion, *argumentos in diario.registros:
+            getattr(copia, operacion)(*argumentos)
+        self.assertEqual(copia.exportar_estado(), biblioteca.exportar_estado())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+from servicios.biblioteca_servicio import BibliotecaServicio
+from servicios.biblioteca_sqlite import BibliotecaServicioSQLite
+
+OPERACIONES = [
+    ("agregar_libro", "Borges", "Ficciones", "Cuento", "1"),
+    ("agregar_libro", "Cortázar", "Rayuela", "Novela", "2"),
+    ("agregar_libro", "Rulfo", "Pedro Páramo", "Novela", "3"),
+    ("agregar_libro", "Otro", "Repetido", "Novela", "3"),
+    ("registrar_usuario", "Ana", "U1"),
+    ("registrar_usuario", "Beto", "U2"),
+    ("registrar_usuario", "Otra Ana", "U1"),
+    ("prestar_libro", "U1", "1", 14, 1000),
+    ("prestar_libro", "U2", "1", 14, 1000),
+    ("prestar_libro", "U3", "2", 14, 1000),
+    ("reservar_libro", "U2", "1"),
+    ("reservar_libro", "U2", "2"),
+    ("prestar_lote", [("U1", "2"), ("U2", "2")], True, 14, 2000),
+    ("prestar_lote", [("U1", "2"), ("U2", "9")], False, 14, 2000),
+    ("quitar_libro", "2"),
+    ("dar_baja_usuario", "U1", 3000),
+    ("devolver_libro", "U2", "1", 3000),
+    ("devolver_libro", "U1", "1", 3000),
+    ("prestar_libro", "U1", "1", 14, 3000),
+    ("devolver_lote", [("U1", "2"), ("U1", "3")], False, 4000),
+    ("prestar_libro", "U2", "1", 14, 4000),
+    ("quitar_libro", "3"),
+    ("dar_baja_usuario", "U1", 5000),
+]
+
+
+class MismoComportamientoTest(unittest.TestCase):
+    """BibliotecaServicioSQLite responde igual que BibliotecaServicio y persiste al reabrir."""
+
+    def setUp(self) -> None:
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.carpeta.name, "biblioteca.db")
+
+    def tearDown(self) -> None:
+        self.carpeta.cleanup()
+
+    @staticmethod
+    def _estado(biblioteca) -> tuple:
+        return ([(libro.isbn, biblioteca.quien_tiene(libro.isbn), biblioteca.fecha_vencimiento(libro.isbn))
+                 for libro in biblioteca.buscar_por_titulo("")],
+                [libro.isbn for libro in biblioteca.listar_libros_disponibles()],
+                sorted(u.user_id for u in biblioteca.listar_usuarios()),
+                biblioteca.posicion_reserva("U2", "1"))
+
+    def test_mismas_respuestas(self) -> None:
+        memoria = BibliotecaServicio()
+        sqlite = BibliotecaServicioSQLite(self.ruta)
+        try:
+            for operacion, *argumentos in OPERACIONES:
+                self.assertEqual(getattr(sqlite, operacion)(*argumentos),
+                                 getattr(memoria, operacion)(*argumentos), operacion)
+                self.assertEqual(self._estado(sqlite), self._estado(memoria), operacion)
+            estado = self._estado(sqlite)
+        finally:
+            sqlite.cerrar()
+
+        reabierta = BibliotecaServicioSQLite(self.ruta)
+        try:
+            self.assertEqual(self._estado(reabierta), estado)
+        finally:
+            reabierta.cerrar()
+
+
+if __name__ == "__main__":
+    unittest.main()
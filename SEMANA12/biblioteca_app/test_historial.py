@@ -0,0 +1,122 @@
+import os
+import random
+import tempfile
+import unittest
+
+import historial
+from historial import Historial
+from servicios.biblioteca_servicio import MENSAJE_MOMENTO, BibliotecaServicio
+from servicios.biblioteca_sqlite import BibliotecaServicioSQLite
+from servicios.vencimientos import AgendaVencimientos
+
+DIA = 86400
+
+
+class AgendaTest(unittest.TestCase):
+    """El montículo con entradas obsoletas da lo mismo que ordenar los préstamos vigentes."""
+
+    def test_igual_que_ordenar(self) -> None:
+        azar = random.Random(3)
+        agenda = AgendaVencimientos()
+        vigentes = {}
+        agenda.programar_varios([(f"I{i}", azar.randint(0, 50)) for i in range(40)])
+        vigentes.update({isbn: vence for vence, isbn in agenda.en_orden()})
+        for _ in range(2000):
+            isbn = f"I{azar.randint(0, 99)}"
+            if isbn in vigentes and azar.random() < 0.6:
+                agenda.cancelar(isbn)
+                del vigentes[isbn]
+            else:
+                vigentes[isbn] = azar.randint(0, 50)
+                agenda.programar(isbn, vigentes[isbn])
+            esperado = sorted((vence, isbn) for isbn, vence in vigentes.items())
+            self.assertEqual(agenda.primeros(5), esperado[:5])
+            self.assertEqual(agenda.vencidos(10), [e for e in esperado if e[0] <= 10])
+        self.assertEqual(len(agenda), len(vigentes))
+        self.assertLessEqual(len(agenda._monticulo), 2 * len(vigentes) + 64)
+
+
+class VencimientosTest(unittest.TestCase):
+    def test_vencidos_y_estadisticas(self) -> None:
+        with tempfile.TemporaryDirectory() as carpeta:
+            biblioteca = BibliotecaServicio()
+            biblioteca.usar_historial(Historial(os.path.join(carpeta, "b.hist"), sincronizar=False))
+            biblioteca.registrar_usuario("Ana", "U1")
+            for isbn, categoria in (("A", "novela"), ("B", "novela"), ("C", "cuento")):
+                biblioteca.agregar_libro("Autor", f"Libro {isbn}", categoria, isbn)
+            biblioteca.prestar_libro("U1", "A", dias=7, desde=0)
+            biblioteca.prestar_libro("U1", "B", dias=14, desde=0)
+            biblioteca.prestar_libro("U1", "C", dias=3, desde=DIA)
+            self.assertEqual(biblioteca.fecha_vencimiento("A"), 7 * DIA)
+            self.assertEqual([(l.isbn, u, v) for l, u, v in biblioteca.listar_vencidos(ahora=8 * DIA)],
+                             [("C", "U1", 4 * DIA), ("A", "U1", 7 * DIA)])
+            self.assertEqual([l.isbn for l, _, _ in biblioteca.proximos_vencimientos(2)], ["C", "A"])
+
+            biblioteca.devolver_libro("U1", "A", ahora=10 * DIA)   # atrasada
+            biblioteca.devolver_libro("U1", "B", ahora=4 * DIA)
+            self.assertIsNone(biblioteca.fecha_vencimiento("A"))
+            self.assertEqual([l.isbn for l, _, _ in biblioteca.listar_vencidos(ahora=8 * DIA)], ["C"])
+            resumen = biblioteca.estadisticas_circulacion()
+            self.assertEqual(resumen["novela"], {"prestamos": 2, "devoluciones": 2, "atrasadas": 1,
+                                                 "dias_promedio": 7.0})
+            self.assertEqual(resumen["cuento"]["prestamos"], 1)
+            self.assertEqual(biblioteca.estadisticas_circulacion(por="usuario", desde=5 * DIA),
+                             {"U1": {"prestamos": 0, "devoluciones": 1, "atrasadas": 1, "dias_promedio": 10.0}})
+            biblioteca.historial.cerrar()
+
+
+class FechaFueraDeRangoTest(unittest.TestCase):
+    """Una fecha que no entra en el historial se rechaza antes de tocar el préstamo."""
+
+    def setUp(self) -> None:
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.carpeta.name, "biblioteca.hist")
+
+    def tearDown(self) -> None:
+        self.carpeta.cleanup()
+
+    def _cargar(self, biblioteca) -> None:
+        biblioteca.usar_historial(Historial(self.ruta, sincronizar=False))
+        biblioteca.registrar_usuario("Ana", "U1")
+        for isbn in ("A", "B"):
+            biblioteca.agregar_libro("Autor", f"Libro {isbn}", "novela", isbn)
+
+    def _revisar(self, biblioteca) -> None:
+        self._cargar(biblioteca)
+        for desde in (-1, 2 ** 32, float("nan"), float("inf")):
+            self.assertEqual(biblioteca.prestar_libro("U1", "A", desde=desde), (False, MENSAJE_MOMENTO))
+            self.assertEqual(biblioteca.prestar_lote([("U1", "A"), ("U1", "B")], desde=desde),
+                             (False, [(False, MENSAJE_MOMENTO), (False, MENSAJE_MOMENTO)]))
+        self.assertIsNone(biblioteca.quien_tiene("A"))
+
+        self.assertTrue(biblioteca.prestar_libro("U1", "A", desde=DIA)[0])
+        self.assertEqual(biblioteca.devolver_libro("U1", "A", ahora=-5), (False, MENSAJE_MOMENTO))
+        self.assertEqual(biblioteca.devolver_lote([("U1", "A")], ahora=2 ** 40)[0], False)
+        self.assertEqual(biblioteca.quien_tiene("A"), "U1")
+
+        self.assertTrue(biblioteca.devolver_libro("U1", "A", ahora=3 * DIA)[0])
+        resumen = biblioteca.estadisticas_circulacion(por="isbn")
+        self.assertEqual(resumen["A"]["prestamos"], 1)
+        self.assertEqual(resumen["A"]["dias_promedio"], 2.0)
+
+    def test_memoria(self) -> None:
+        self._revisar(BibliotecaServicio())
+
+    def test_sqlite(self) -> None:
+        biblioteca = BibliotecaServicioSQLite(os.path.join(self.carpeta.name, "biblioteca.db"))
+        try:
+            self._revisar(biblioteca)
+        finally:
+            biblioteca.cerrar()
+
+    def test_historial_ajusta_en_vez_de_fallar(self) -> None:
+        registro = Historial(self.ruta, sincronizar=False)
+        registro.registrar_prestamo(-10, "A", "U1", "novela")
+        registro.registrar_devolucion(2 ** 33, "A", "U1", "novela", 0, True)
+        registro.cerrar()
+        momentos = [(evento[1], evento[5]) for evento in historial.eventos(self.ruta)]
+        self.assertEqual(momentos, [(0, 0), (2 ** 32 - 1, 2 ** 32 - 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
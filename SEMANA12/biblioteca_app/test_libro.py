@@ -0,0 +1,54 @@
+import unittest
+
+from modelos.libro import Libro
+from servicios.biblioteca_servicio import BibliotecaServicio
+from servicios.catalogo_compacto import CatalogoCompacto
+from test_biblioteca_sqlite import OPERACIONES
+
+
+class LibroTest(unittest.TestCase):
+    def test_inmutable_y_sin_dict(self) -> None:
+        libro = Libro("Borges", "Ficciones", "Cuento", "1")
+        self.assertFalse(hasattr(libro, "__dict__"))
+        with self.assertRaises(AttributeError):
+            libro.titulo = "Otro"
+        with self.assertRaises(AttributeError):
+            libro.isbn2 = "2"
+        with self.assertRaises(AttributeError):
+            del libro._isbn
+
+    def test_textos_internados_e_igualdad_por_valor(self) -> None:
+        a = Libro("".join(["Bor", "ges"]), "Ficciones", "".join(["Cu", "ento"]), "1")
+        b = Libro("Borges", "El Aleph", "Cuento", "2")
+        self.assertIs(a.autor, b.autor)
+        self.assertIs(a.categoria, b.categoria)
+        self.assertEqual(a, Libro("Borges", "Ficciones", "Cuento", "1"))
+        self.assertEqual(len({a, Libro("Borges", "Ficciones", "Cuento", "1"), b}), 2)
+        self.assertNotEqual(a, b)
+
+
+class CatalogoCompactoTest(unittest.TestCase):
+    """BibliotecaServicio sobre CatalogoCompacto responde igual que sobre un dict."""
+
+    def test_mismas_respuestas_y_estado(self) -> None:
+        normal = BibliotecaServicio()
+        compacta = BibliotecaServicio(CatalogoCompacto())
+        for operacion, *argumentos in OPERACIONES + [("agregar_libro", "Onetti", "El pozo", "Novela", "7")]:
+            self.assertEqual(getattr(compacta, operacion)(*argumentos),
+                             getattr(normal, operacion)(*argumentos), operacion)
+            self.assertEqual(compacta.exportar_estado(), normal.exportar_estado(), operacion)
+        self.assertEqual([l.isbn for l in compacta.buscar_por_categoria("novela")],
+                         [l.isbn for l in normal.buscar_por_categoria("novela")])
+        self.assertEqual(compacta.proximos_vencimientos(), normal.proximos_vencimientos())
+
+    def test_cargar_estado(self) -> None:
+        normal = BibliotecaServicio()
+        for operacion, *argumentos in OPERACIONES:
+            getattr(normal, operacion)(*argumentos)
+        compacta = BibliotecaServicio(CatalogoCompacto())
+        compacta.cargar_estado(*normal.exportar_estado())
+        self.assertEqual(compacta.exportar_estado(), normal.exportar_estado())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import os
+import random
+import tempfile
+import unittest
+
+from modelos.libro import Libro
+from servicios import motor_busqueda
+from servicios.biblioteca_servicio import BibliotecaServicio
+from servicios.biblioteca_sqlite import BibliotecaServicioSQLite
+from servicios.motor_busqueda import MotorBusqueda
+
+
+class PrefijoTest(unittest.TestCase):
+    """Un prefijo abarca todas las palabras que empiezan así, no solo las primeras."""
+
+    def setUp(self) -> None:
+        self.biblioteca = BibliotecaServicio()
+        for i in range(100):
+            self.biblioteca.agregar_libro("Autor", f"Cuento{i:03d} largo", "cuentos", f"I{i}")
+
+    def test_buscar_pagina_sobre_todas_las_coincidencias(self) -> None:
+        self.assertEqual(len(self.biblioteca.buscar(titulo="cuento", por_pagina=200)), 100)
+        self.assertEqual(len(self.biblioteca.buscar(titulo="Cuent", pagina=3, por_pagina=40)), 20)
+
+    def test_paginas_sin_repetidos(self) -> None:
+        vistos = [libro.isbn for pagina in range(1, 6)
+                  for libro, _ in self.biblioteca.buscar(titulo="cuento", pagina=pagina, por_pagina=25)]
+        self.assertEqual(len(vistos), 100)
+        self.assertEqual(len(set(vistos)), 100)
+
+    def test_coincidencias_del_motor(self) -> None:
+        motor = MotorBusqueda()
+        motor.agregar_varios(Libro("Autor", f"Cuento{i:03d}", "c", f"I{i}") for i in range(100))
+        self.assertEqual(len(motor.coincidencias(titulo="cuent")), 100)
+        motor.quitar("I0")
+        self.assertEqual(len(motor.coincidencias(titulo="cuent")), 99)
+
+
+class RelevanciaTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.motor = MotorBusqueda()
+        self.motor.agregar_varios([
+            Libro("Miguel de Cervantes", "Don Quijote de la Mancha", "Novela", "1"),
+            Libro("Avellaneda", "El Quijote apócrifo: segundo tomo del ingenioso hidalgo", "Novela", "2"),
+            Libro("Borges", "Pierre Menard, autor del Quijote", "Cuento", "3"),
+            Libro("García Márquez", "Canción de la soledad", "Poesía", "4"),
+        ])
+
+    def _isbns(self, **consulta) -> list:
+        return [isbn for isbn, _ in self.motor.buscar(**consulta)]
+
+    def test_todas_las_palabras_sin_tildes_ni_mayusculas(self) -> None:
+        self.assertEqual(self._isbns(titulo="QUIJOTE"), ["1", "3", "2"])   # título más corto primero
+        self.assertEqual(self._isbns(titulo="quijote mancha"), ["1"])
+        self.assertEqual(self._isbns(titulo="quijote", autor="borg"), ["3"])
+        self.assertEqual(self._isbns(titulo="cancion", autor="garcia marquez"), ["4"])
+        self.assertEqual(self._isbns(titulo="quijote inexistente"), [])
+
+    def test_categoria_y_sin_palabras(self) -> None:
+        self.assertEqual(self._isbns(titulo="quij", categoria="novela"), ["1", "2"])
+        self.assertEqual(self._isbns(categoria="NOVELA"), ["1", "2"])
+        self.assertEqual(self.motor.buscar(categoria="cuento"), [("3", 0.0)])
+        self.assertEqual(self._isbns(titulo="quijote", categoria="ensayo"), [])
+        self.assertEqual(self._isbns(), ["1", "2", "3", "4"])
+
+    def test_puntajes_de_mayor_a_menor(self) -> None:
+        puntajes = [p for _, p in self.motor.buscar(titulo="quijote")]
+        self.assertEqual(puntajes, sorted(puntajes, reverse=True))
+        self.assertGreater(puntajes[0], 0)
+
+
+class UmbralTest(unittest.TestCase):
+    """El corte anticipado (algoritmo de umbral) da lo mismo que puntuar todo."""
+
+    def test_igual_que_puntuar_todos(self) -> None:
+        azar = random.Random(7)
+        vocabulario = ["rio", "mar", "sol", "luna", "casa", "camino", "cielo", "noche", "dia", "viento"]
+        motor = MotorBusqueda()
+        motor.agregar_varios(
+            Libro(" ".join(azar.choices(vocabulario, k=2)), " ".join(azar.choices(vocabulario, k=azar.randint(1, 6))),
+                  azar.choice(["a", "b"]), f"I{i}")
+            for i in range(3000))
+        for i in range(0, 3000, 7):
+            motor.quitar(f"I{i}")
+
+        limite = motor_busqueda.LIMITE_DIRECTO
+        try:
+            for consulta in ({"titulo": "sol"}, {"titulo": "mar ca"}, {"titulo": "noche", "autor": "luna"},
+                             {"titulo": "cielo", "categoria": "b"}, {"titulo": "rio rio"}):
+                for pagina in (1, 4):
+                    motor_busqueda.LIMITE_DIRECTO = 10 ** 9
+                    todos = motor.buscar(pagina=pagina, por_pagina=25, **consulta)
+                    motor_busqueda.LIMITE_DIRECTO = 0
+                    cortando = motor.buscar(pagina=pagina, por_pagina=25, **consulta)
+                    self.assertEqual([i for i, _ in cortando], [i for i, _ in todos], consulta)
+                    for (_, a), (_, b) in zip(cortando, todos):
+                        self.assertAlmostEqual(a, b)
+        finally:
+            motor_busqueda.LIMITE_DIRECTO = limite
+
+
+class BuscarPorCampoTest(unittest.TestCase):
+    """buscar_por_* siguen buscando subcadenas (buscar() es el que usa palabras)."""
+
+    def _cargar(self, biblioteca) -> None:
+        for i in range(100):
+            biblioteca.agregar_libro(f"Autora {i % 3}", f"Cuento{i:03d} largo", f"cat{i % 2}", f"I{i}")
+
+    def _consultas(self, biblioteca) -> list:
+        return [[libro.isbn for libro in resultado] for resultado in (
+            biblioteca.buscar_por_titulo("uento"), biblioteca.buscar_por_titulo("O05"),
+            biblioteca.buscar_por_titulo("to01"), biblioteca.buscar_por_autor("ora 2"),
+            biblioteca.buscar_por_categoria("CAT1"), biblioteca.buscar_por_categoria(""))]
+
+    def test_subcadenas_y_mismo_resultado_en_ambos_backends(self) -> None:
+        memoria = BibliotecaServicio()
+        self._cargar(memoria)
+        resultados = self._consultas(memoria)
+        self.assertEqual(len(resultados[0]), 100)
+        self.assertEqual(resultados[1], [f"I{i}" for i in range(50, 60)])
+        self.assertEqual(resultados[2], [f"I{i}" for i in range(10, 20)])
+        self.assertEqual(len(resultados[3]), 33)
+        self.assertEqual(len(resultados[4]), 50)
+        self.assertEqual(resultados[5], [])
+
+        with tempfile.TemporaryDirectory() as carpeta:
+            sqlite = BibliotecaServicioSQLite(os.path.join(carpeta, "biblioteca.db"))
+            try:
+                self._cargar(sqlite)
+                self.assertEqual(self._consultas(sqlite), resultados)
+            finally:
+                sqlite.cerrar()
+
+    def test_despues_de_carga_masiva(self) -> None:
+        origen = BibliotecaServicio()
+        self._cargar(origen)
+        copia = BibliotecaServicio()
+        copia.cargar_estado(*origen.exportar_estado())
+        self.assertEqual(self._consultas(copia), self._consultas(origen))
+
+
+if __name__ == "__main__":
+    unittest.main()
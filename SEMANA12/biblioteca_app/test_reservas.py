@@ -0,0 +1,89 @@
+import random
+import unittest
+
+from servicios.biblioteca_servicio import DIAS_RETIRO, SEGUNDOS_POR_DIA, BibliotecaServicio
+from servicios.reservas import ColaReservas
+
+
+class ColaReservasTest(unittest.TestCase):
+    """Posiciones del árbol de Fenwick iguales a las de una lista, también tras renumerar."""
+
+    def test_igual_que_una_lista(self) -> None:
+        azar = random.Random(5)
+        cola = ColaReservas()
+        lista = []
+        siguiente = 0
+        for _ in range(3000):
+            accion = azar.random()
+            if accion < 0.45 or not lista:
+                cola.agregar(f"U{siguiente}")
+                lista.append(f"U{siguiente}")
+                siguiente += 1
+            elif accion < 0.75:
+                usuario = azar.choice(lista)
+                cola.quitar(usuario)
+                lista.remove(usuario)
+            else:
+                self.assertEqual(cola.sacar_primero(), lista.pop(0))
+            self.assertEqual(len(cola), len(lista))
+            self.assertEqual(cola.primero(), lista[0] if lista else None)
+            for usuario in azar.sample(lista, min(3, len(lista))):
+                self.assertEqual(cola.posicion(usuario), lista.index(usuario) + 1)
+        self.assertEqual(cola.usuarios(), lista)
+        self.assertIsNone(cola.posicion("nadie"))
+        self.assertIsNone(ColaReservas().sacar_primero())
+
+
+class ReservasTest(unittest.TestCase):
+    """Al devolver, el libro queda apartado para el primero de la cola, en orden de llegada."""
+
+    PLAZO = DIAS_RETIRO * SEGUNDOS_POR_DIA
+
+    def setUp(self) -> None:
+        self.biblioteca = BibliotecaServicio()
+        self.biblioteca.agregar_libro("Borges", "Ficciones", "Cuento", "1")
+        for user_id in ("U1", "U2", "U3", "U4"):
+            self.biblioteca.registrar_usuario(user_id, user_id)
+        self.biblioteca.prestar_libro("U1", "1", desde=0)
+
+    def test_fifo_y_retiro(self) -> None:
+        self.assertEqual(self.biblioteca.reservar_libro("U1", "1"),
+                         (False, "El usuario ya tiene prestado ese libro."))
+        for user_id in ("U2", "U3", "U4"):
+            self.assertTrue(self.biblioteca.reservar_libro(user_id, "1")[0])
+        self.assertEqual(self.biblioteca.reservar_libro("U3", "1"), (False, "El usuario ya reservó ese libro."))
+        self.biblioteca.cancelar_reserva("U3", "1", ahora=10)
+        self.assertEqual(self.biblioteca.posicion_reserva("U4", "1"), 2)
+
+        mensaje = self.biblioteca.devolver_libro("U1", "1", ahora=100)[1]
+        self.assertIn("apartado para el usuario U2", mensaje)
+        self.assertEqual(self.biblioteca.posicion_reserva("U2", "1"), 0)
+        self.assertEqual(self.biblioteca.prestar_libro("U4", "1", desde=200),
+                         (False, "El libro está apartado para otro usuario."))
+        self.assertNotIn("1", [l.isbn for l in self.biblioteca.listar_libros_disponibles()])
+        self.assertTrue(self.biblioteca.prestar_libro("U2", "1", desde=200)[0])
+        self.assertIsNone(self.biblioteca.posicion_reserva("U2", "1"))
+        self.assertEqual(self.biblioteca.posicion_reserva("U4", "1"), 1)
+
+    def test_apartado_vencido_pasa_al_siguiente(self) -> None:
+        self.biblioteca.reservar_libro("U2", "1")
+        self.biblioteca.reservar_libro("U3", "1")
+        self.biblioteca.devolver_libro("U1", "1", ahora=100)
+        self.assertEqual(self.biblioteca.vencer_apartados(ahora=100 + self.PLAZO - 1), [])
+        self.assertEqual(self.biblioteca.vencer_apartados(ahora=100 + self.PLAZO), [("1", "U2")])
+        self.assertEqual(self.biblioteca.posicion_reserva("U3", "1"), 0)
+        self.biblioteca.dar_baja_usuario("U3", ahora=200 + self.PLAZO)   # suelta lo apartado
+        self.assertEqual([l.isbn for l in self.biblioteca.listar_libros_disponibles()], ["1"])
+
+    def test_exportar_y_cargar_conserva_las_colas(self) -> None:
+        for user_id in ("U2", "U3", "U4"):
+            self.biblioteca.reservar_libro(user_id, "1")
+        self.biblioteca.devolver_libro("U1", "1", ahora=100)
+        copia = BibliotecaServicio()
+        copia.cargar_estado(*self.biblioteca.exportar_estado())
+        self.assertEqual([copia.posicion_reserva(u, "1") for u in ("U2", "U3", "U4")], [0, 1, 2])
+        self.assertEqual(copia.vencer_apartados(ahora=100 + self.PLAZO), [("1", "U2")])
+
+
+if __name__ == "__main__":
+    unittest.main()
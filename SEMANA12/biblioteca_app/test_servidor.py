@@ -0,0 +1,66 @@
+import asyncio
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from servicios.biblioteca_concurrente import BibliotecaConcurrente
+from servidor import LIMITE_LINEA, Servidor, ejecutar
+
+
+class EjecutarTest(unittest.TestCase):
+    def _pedir(self, servicio, peticion) -> dict:
+        linea = peticion if isinstance(peticion, str) else json.dumps(peticion)
+        return json.loads(ejecutar(servicio, linea.encode("utf-8")))
+
+    def test_respuestas_y_errores(self) -> None:
+        servicio = BibliotecaConcurrente()
+        self.assertEqual(self._pedir(servicio, {"id": 1, "op": "agregar_libro", "args": ["A", "T", "C", "1"]}),
+                         {"id": 1, "resultado": [True, "Libro agregado correctamente."]})
+        self.assertEqual(self._pedir(servicio, {"id": 2, "op": "buscar_por_autor", "args": ["a"]}),
+                         {"id": 2, "resultado": [{"autor": "A", "titulo": "T", "categoria": "C", "isbn": "1"}]})
+        self.assertIn("error", self._pedir(servicio, {"id": 3, "op": "_registrar", "args": []}))
+        self.assertIn("TypeError", self._pedir(servicio, {"id": 4, "op": "quien_tiene", "args": []})["error"])
+        self.assertEqual(self._pedir(servicio, "no es json"), {"id": None, "error": "La petición no es JSON válido."})
+        self.assertIn("error", self._pedir(servicio, {"id": 5, "op": "existe_libro", "args": "1"}))
+
+
+class ServidorTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.ejecutor = ThreadPoolExecutor(4)
+        self.servicio = BibliotecaConcurrente()
+        self.servicio.registrar_usuario("Ana", "U1")
+        servidor = Servidor(self.servicio, self.ejecutor, max_pendientes=4)
+        self.servidor = await asyncio.start_server(servidor.atender, "127.0.0.1", 0, limit=LIMITE_LINEA)
+        self.puerto = self.servidor.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self) -> None:
+        self.servidor.close()
+        await self.servidor.wait_closed()
+        self.ejecutor.shutdown()
+
+    async def test_pipelining_responde_en_orden(self) -> None:
+        lector, escritor = await asyncio.open_connection("127.0.0.1", self.puerto, limit=LIMITE_LINEA)
+        peticiones = []
+        for i in range(50):
+            peticiones.append({"id": 2 * i, "op": "agregar_libro", "args": ["A", f"T{i}", "C", f"I{i}"]})
+            peticiones.append({"id": 2 * i + 1, "op": "prestar_libro", "args": ["U1", f"I{i}"]})
+        escritor.write("".join(json.dumps(p) + "\n" for p in peticiones).encode("utf-8"))
+        await escritor.drain()
+        respuestas = [json.loads(await lector.readline()) for _ in peticiones]
+        self.assertEqual([r["id"] for r in respuestas], list(range(100)))
+        self.assertTrue(all(r["resultado"][0] for r in respuestas))
+        escritor.close()
+        await escritor.wait_closed()
+        self.assertEqual(len(self.servicio.listar_libros_prestados_usuario("U1")), 50)
+
+    async def test_linea_demasiado_larga(self) -> None:
+        lector, escritor = await asyncio.open_connection("127.0.0.1", self.puerto)
+        escritor.write(b"x" * (LIMITE_LINEA + 10) + b"\n")
+        await escritor.drain()
+        self.assertEqual(json.loads(await lector.readline()), {"id": None, "error": "Petición demasiado larga."})
+        self.assertEqual(await lector.readline(), b"")   # el servidor cerró la conexión
+        escritor.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+import storage
+
+LIBROS = [("Borges", "Ficciones", "Cuento", "1"), ("Cortázar", "Rayuela", "Novela", "2"),
+          ("Rulfo", "Pedro Páramo", "Novela", "3")]
+
+
+class PersistenciaTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.carpeta.name, "biblioteca.json")
+
+    def tearDown(self) -> None:
+        self.carpeta.cleanup()
+
+    def _cargar(self, **opciones):
+        return storage.cargar(self.ruta, sincronizar=False, **opciones)
+
+    def _operar(self, servicio) -> None:
+        for datos in LIBROS:
+            servicio.agregar_libro(*datos)
+        servicio.registrar_usuario("Ana", "U1")
+        servicio.registrar_usuario("Beto", "U2")
+        servicio.prestar_libro("U1", "1", desde=1000)
+        servicio.prestar_lote([("U1", "2"), ("U2", "3")], desde=2000)
+        servicio.reservar_libro("U2", "1")
+        servicio.devolver_libro("U1", "1", ahora=5000)
+        servicio.quitar_libro("no existe")   # las fallidas no van al diario
+
+    def _sin_cerrar(self, servicio) -> None:
+        # Como si el programa terminara de golpe: sin copia final
+        servicio.diario.cerrar()
+        servicio.historial.cerrar()
+
+    def test_reproducir_diario(self) -> None:
+        servicio = self._cargar()
+        self._operar(servicio)
+        estado = servicio.exportar_estado()
+        self._sin_cerrar(servicio)
+        self.assertFalse(os.path.exists(self.ruta))   # todavía solo el diario
+
+        with open(self.ruta + ".log", "a", encoding="utf-8") as f:
+            f.write('["registrar_usuario", "Cor')   # última línea a medio escribir
+        copia = self._cargar()
+        self.assertEqual(copia.exportar_estado(), estado)
+        self.assertEqual(copia.posicion_reserva("U2", "1"), 0)   # quedó apartado
+        storage.cerrar(copia)
+
+        self.assertEqual(os.path.getsize(self.ruta + ".log"), 0)
+        final = self._cargar()
+        self.assertEqual(final.exportar_estado(), estado)
+        storage.cerrar(final)
+
+    def test_compactar_al_pasar_el_limite(self) -> None:
+        servicio = self._cargar(limite_diario=200)
+        self._operar(servicio)
+        self.assertTrue(os.path.exists(self.ruta))
+        self.assertLess(os.path.getsize(self.ruta + ".log"), 200 + 100)
+        estado = servicio.exportar_estado()
+        self._sin_cerrar(servicio)
+        copia = self._cargar()
+        self.assertEqual(copia.exportar_estado(), estado)
+        storage.cerrar(copia)
+
+    def test_copia_compacta(self) -> None:
+        servicio = self._cargar()
+        self._operar(servicio)
+        estado = servicio.exportar_estado()
+        storage.cerrar(servicio)
+        copia = self._cargar(compacto=True)
+        self.assertEqual(copia.exportar_estado(), estado)
+        storage.cerrar(copia)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,9 @@
 # ------------------------------------------
 
 class Producto:
+    # __slots__ evita el __dict__ por instancia (menos memoria con muchos productos)
+    __slots__ = ("__id", "__nombre", "__cantidad", "__precio")
+
     def __init__(self, id_producto: int, nombre: str, cantidad: int, precio: float):
         self.__id = id_producto
         self.__nombre = nombre
@@ -46,38 +49,60 @@ class Producto:
 
 class Inventario:
     def __init__(self):
-        self.productos = []
+        self._productos = []      # orden de inserción (None = hueco de un eliminado)
+        self._indice = {}         # id -> Producto
+        self._posiciones = {}     # id -> posición en self._productos
+        self._huecos = 0
+
+    def obtener_producto(self, id_producto):
+        return self._indice.get(id_producto)
+
+    def listar_productos(self):
+        return [p for p in self._productos if p is not None]
+
+    @property
+    def productos(self):
+        # Solo lectura y sin huecos: la lista interna puede tener None
+        return self.listar_productos()
 
     def agregar_producto(self, producto):
-        for p in self.productos:
-            if p.get_id() == producto.get_id():
-                print("❌ Error: Ya existe un producto con ese ID.")
-                return
-        self.productos.append(producto)
+        if producto.get_id() in self._indice:
+            print("❌ Error: Ya existe un producto con ese ID.")
+            return
+        self._posiciones[producto.get_id()] = len(self._productos)
+        self._productos.append(producto)
+        self._indice[producto.get_id()] = producto
         print("✅ Producto agregado correctamente.")
 
     def eliminar_producto(self, id_producto):
-        for p in self.productos:
-            if p.get_id() == id_producto:
-                self.productos.remove(p)
-                print("✅ Producto eliminado.")
-                return
-        print("❌ Producto no encontrado.")
+        pos = self._posiciones.pop(id_producto, None)
+        if pos is None:
+            print("❌ Producto no encontrado.")
+            return
+        del self._indice[id_producto]
+        # Se deja un hueco para no desplazar la lista; se compacta cuando hay muchos
+        self._productos[pos] = None
+        self._huecos += 1
+        if self._huecos * 2 > len(self._productos):
+            self._productos = self.listar_productos()
+            self._posiciones = {p.get_id(): i for i, p in enumerate(self._productos)}
+            self._huecos = 0
+        print("✅ Producto eliminado.")
 
     def actualizar_producto(self, id_producto, nueva_cantidad=None, nuevo_precio=None):
-        for p in self.productos:
-            if p.get_id() == id_producto:
-                if nueva_cantidad is not None:
-                    p.set_cantidad(nueva_cantidad)
-                if nuevo_precio is not None:
-                    p.set_precio(nuevo_precio)
-                print("✅ Producto actualizado.")
-                return
-        print("❌ Producto no encontrado.")
+        p = self._indice.get(id_producto)
+        if p is None:
+            print("❌ Producto no encontrado.")
+            return
+        if nueva_cantidad is not None:
+            p.set_cantidad(nueva_cantidad)
+        if nuevo_precio is not None:
+            p.set_precio(nuevo_precio)
+        print("✅ Producto actualizado.")
 
     def buscar_por_nombre(self, nombre):
         encontrados = []
-        for p in self.productos:
+        for p in self.listar_productos():
             if nombre.lower() in p.get_nombre().lower():
                 encontrados.append(p)
 
@@ -89,11 +114,12 @@ class Inventario:
             print("❌ No se encontraron productos con ese nombre.")
 
     def mostrar_inventario(self):
-        if not self.productos:
+        productos = self.listar_productos()
+        if not productos:
             print("📦 El inventario está vacío.")
         else:
             print("📋 Inventario actual:")
-            for p in self.productos:
+            for p in productos:
                 print(p)
 
 
@@ -0,0 +1,58 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from main import Inventario, Producto
+
+
+class InventarioTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.inventario = Inventario()
+        with redirect_stdout(io.StringIO()):
+            for i in range(10):
+                self.inventario.agregar_producto(Producto(i, f"producto {i}", i, 1.5))
+
+    def _ids(self) -> list:
+        return [p.get_id() for p in self.inventario.productos]
+
+    def test_eliminar_no_deja_huecos_visibles(self) -> None:
+        with redirect_stdout(io.StringIO()):
+            self.inventario.eliminar_producto(3)
+        self.assertNotIn(None, self.inventario.productos)
+        self.assertEqual(self._ids(), [0, 1, 2, 4, 5, 6, 7, 8, 9])
+        self.assertEqual(self.inventario.listar_productos(), self.inventario.productos)
+
+    def test_orden_e_indices_despues_de_compactar(self) -> None:
+        with redirect_stdout(io.StringIO()):
+            for i in (0, 2, 4, 6, 8, 9):   # más de la mitad: se compacta
+                self.inventario.eliminar_producto(i)
+            self.inventario.agregar_producto(Producto(20, "nuevo", 1, 1.0))
+            self.inventario.eliminar_producto(5)
+        self.assertEqual(self._ids(), [1, 3, 7, 20])
+        self.assertIsNone(self.inventario.obtener_producto(5))
+        self.assertEqual(self.inventario.obtener_producto(7).get_nombre(), "producto 7")
+
+    def test_eliminar_inexistente_y_duplicado(self) -> None:
+        salida = io.StringIO()
+        with redirect_stdout(salida):
+            self.inventario.eliminar_producto(99)
+            self.inventario.agregar_producto(Producto(1, "repetido", 1, 1.0))
+        self.assertIn("no encontrado", salida.getvalue())
+        self.assertIn("Ya existe", salida.getvalue())
+        self.assertEqual(len(self.inventario.productos), 10)
+        self.assertEqual(self.inventario.obtener_producto(1).get_nombre(), "producto 1")
+
+
+class ProductoTest(unittest.TestCase):
+    def test_slots_con_getters_y_setters(self) -> None:
+        producto = Producto(1, "lápiz", 3, 0.5)
+        self.assertFalse(hasattr(producto, "__dict__"))
+        with self.assertRaises(AttributeError):
+            producto.color = "rojo"
+        producto.set_cantidad(4)
+        producto.set_precio(0.75)
+        self.assertEqual(str(producto), "ID: 1 | Nombre: lápiz | Cantidad: 4 | Precio: $0.75")
+
+
+if __name__ == "__main__":
+    unittest.main()